@@ -0,0 +1,179 @@
+import hashlib
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, date_diff, getdate
+from frappe.utils.background_jobs import is_job_enqueued
+
+from custom_app.utils.perf import instrumented
+from custom_app.utils.working_calendar import (
+    applies_saturday_rule,
+    get_company_holiday_list,
+    get_day_type,
+    get_holiday_list_calendar,
+)
+
+WEEKLY_OFF_MARKER = "Weekly Off (Auto)"
+MAX_BULK_ATTENDANCE_DAYS = 62
+BULK_ATTENDANCE_CHUNK_SIZE = 200
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bulk attendance marking (month-end finalization, biometric imports)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@frappe.whitelist(methods=["POST"])
+def mark_attendance_in_bulk(company, from_date, to_date, employees=None, status="Present", skip_holidays=1):
+    """
+    Queue a bulk attendance run for *company* between *from_date* and
+    *to_date*, optionally limited to a list (or JSON string) of *employees*.
+    """
+    frappe.has_permission("Attendance", "create", throw=True)
+
+    if isinstance(employees, str):
+        employees = json.loads(employees) if employees else None
+
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    if from_date > to_date:
+        frappe.throw(_("From Date cannot be after To Date."))
+    if date_diff(to_date, from_date) + 1 > MAX_BULK_ATTENDANCE_DAYS:
+        frappe.throw(_("At most {0} days can be marked in one run.").format(MAX_BULK_ATTENDANCE_DAYS))
+
+    # Runs for different employee lists over the same range are separate jobs
+    scope = hashlib.md5(json.dumps(sorted(set(employees))).encode()).hexdigest()[:12] if employees else "all"
+    job_id = f"custom_app:bulk_attendance:{company}:{from_date}:{to_date}:{scope}"
+    if is_job_enqueued(job_id):
+        return _("Attendance marking for these employees and dates is already queued or running.")
+
+    frappe.enqueue(
+        "custom_app.api.attendance.run_bulk_attendance",
+        queue="long",
+        timeout=3600,
+        job_id=job_id,
+        deduplicate=True,
+        company=company,
+        from_date=from_date,
+        to_date=to_date,
+        employees=employees,
+        status=status,
+        skip_holidays=frappe.utils.cint(skip_holidays),
+    )
+    return _("Attendance marking has been queued.")
+
+
+def plan_bulk_attendance(company, from_date, to_date, employees=None, status="Present", skip_holidays=True):
+    """
+    Build the list of Attendance rows to create, without touching the DB
+    beyond three prefetches (employees, existing attendance, holiday lists).
+
+    Each employee is planned only inside their joining / relieving window.
+    Days that already have a non-cancelled Attendance are skipped, as are
+    holidays when *skip_holidays* is set. 1st / 3rd / 5th Saturdays get the
+    same Absent + weekly-off marker CustomAttendance.validate would set.
+
+    Returns ``(rows, skipped)`` where *skipped* counts rows by reason.
+    """
+    from_date, to_date = getdate(from_date), getdate(to_date)
+
+    filters = {"company": company, "date_of_joining": ["<=", to_date]}
+    if employees:
+        filters["name"] = ["in", list(employees)]
+    candidates = frappe.get_all(
+        "Employee",
+        filters=filters,
+        or_filters={"status": "Active", "relieving_date": [">=", from_date]},
+        fields=["name", "employee_name", "department", "date_of_joining", "relieving_date", "holiday_list"],
+    )
+    if not candidates:
+        return [], {}
+
+    existing = {
+        (row.employee, getdate(row.attendance_date))
+        for row in frappe.get_all(
+            "Attendance",
+            filters={
+                "employee": ["in", [e.name for e in candidates]],
+                "attendance_date": ["between", [from_date, to_date]],
+                "docstatus": ["!=", 2],
+            },
+            fields=["employee", "attendance_date"],
+        )
+    }
+
+    default_holiday_list = get_company_holiday_list(company)
+    calendars = {}
+
+    # The Saturday rule only depends on (company, day): evaluate it once per day.
+    days = [add_days(from_date, i) for i in range(date_diff(to_date, from_date) + 1)]
+    weekly_off_days = {day for day in days if applies_saturday_rule(company, day)}
+
+    rows = []
+    skipped = {"already marked": 0, "holiday": 0}
+    for emp in candidates:
+        holiday_list = emp.holiday_list or default_holiday_list
+        if holiday_list not in calendars:
+            calendars[holiday_list] = get_holiday_list_calendar(holiday_list)
+        calendar = calendars[holiday_list]
+
+        first_day = max(from_date, getdate(emp.date_of_joining))
+        last_day = min(to_date, getdate(emp.relieving_date)) if emp.relieving_date else to_date
+
+        for day in days:
+            if day < first_day or day > last_day:
+                continue
+            if (emp.name, day) in existing:
+                skipped["already marked"] += 1
+                continue
+            if skip_holidays and get_day_type(holiday_list, day, calendar):
+                skipped["holiday"] += 1
+                continue
+
+            row = {
+                "doctype": "Attendance",
+                "employee": emp.name,
+                "employee_name": emp.employee_name,
+                "company": company,
+                "department": emp.department,
+                "attendance_date": day,
+                "status": status,
+            }
+            if day in weekly_off_days:
+                row["status"] = "Absent"
+                row["custom_weekly_off_marker"] = WEEKLY_OFF_MARKER
+            rows.append(row)
+
+    return rows, skipped
+
+
+@instrumented()
+def run_bulk_attendance(company, from_date, to_date, employees=None, status="Present", skip_holidays=True):
+    """Background job: plan, then insert submitted Attendance in committed chunks."""
+    rows, skipped = plan_bulk_attendance(company, from_date, to_date, employees, status, skip_holidays)
+    result = {"created": 0, "skipped": skipped, "failed": []}
+
+    for start in range(0, len(rows), BULK_ATTENDANCE_CHUNK_SIZE):
+        for idx, row in enumerate(rows[start:start + BULK_ATTENDANCE_CHUNK_SIZE], start):
+            # Each row in its own savepoint so one bad row does not roll back the chunk.
+            savepoint = f"bulk_attendance_{idx}"
+            frappe.db.savepoint(savepoint)
+            try:
+                # Inserting with docstatus 1 validates and submits in one save.
+                doc = frappe.get_doc(row)
+                doc.docstatus = 1
+                doc.insert()
+                result["created"] += 1
+            except Exception as e:
+                frappe.db.rollback(save_point=savepoint)
+                result["failed"].append({
+                    "employee": row["employee"],
+                    "attendance_date": str(row["attendance_date"]),
+                    "error": str(e),
+                })
+        frappe.db.commit()
+
+    frappe.logger().info(
+        f"[bulk attendance] {company} {from_date}..{to_date} created={result['created']} "
+        f"skipped={skipped} failed={len(result['failed'])}"
+    )
+    return result
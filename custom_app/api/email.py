@@ -1,5 +1,9 @@
 import frappe
 
+# company -> {"name": <Email Account>, "email_id": <sender>}
+COMPANY_EMAIL_ACCOUNT_CACHE_KEY = "custom_app:company_email_account_map"
+
+
 def set_company_email_account(doc, method):
     """
     Set outgoing Email Account based on linked document's company before Communication is created.
@@ -11,11 +15,11 @@ def set_company_email_account(doc, method):
 
         company = None
 
-        # Check if Communication is linked to a document with company
+        # Check if Communication is linked to a document with company.
+        # Only the `company` column is read -- loading the full reference doc
+        # (with all child tables) here dominated bulk notification runs.
         if doc.reference_doctype and doc.reference_name:
-            ref_doc = frappe.get_doc(doc.reference_doctype, doc.reference_name)
-            if hasattr(ref_doc, "company"):
-                company = ref_doc.company
+            company = get_reference_company(doc.reference_doctype, doc.reference_name)
 
         # Fallback: try to get company from current user
         if not company and frappe.session.user not in ["Administrator", "Guest"]:
@@ -25,24 +29,73 @@ def set_company_email_account(doc, method):
             return  # No company found, skip custom logic
 
         # Get Email Account for this company
-        email_account_name = frappe.db.get_value("Email Account", {"custom_company": company}, "name")
-        if not email_account_name:
+        email_account = get_company_email_account(company)
+        if not email_account:
             frappe.logger().warning(f"No Email Account found for company {company}")
             return
 
         # Assign this account to Communication
-        doc.email_account = email_account_name
+        doc.email_account = email_account["name"]
 
         # Optionally override the sender
-        sender = frappe.db.get_value("Email Account", email_account_name, "email_id")
-        if sender:
-            doc.sender = sender
+        if email_account.get("email_id"):
+            doc.sender = email_account["email_id"]
 
-        frappe.logger().info(f"📧 Using {email_account_name} for {company} Communication")
+        frappe.logger().info(f"📧 Using {email_account['name']} for {company} Communication")
 
     except Exception as e:
         frappe.log_error(f"Company-based Communication email routing failed: {e}")
 
+
+def get_reference_company(reference_doctype, reference_name):
+    """
+    Return the `company` of the referenced document, or None when the
+    doctype has no company column. `has_column` is answered from the
+    cached table columns, so this costs at most one single-column query.
+    """
+    if not frappe.db.has_column(reference_doctype, "company"):
+        return None
+
+    return frappe.db.get_value(reference_doctype, reference_name, "company")
+
+
+def get_company_email_account(company):
+    """
+    Return {"name", "email_id"} of the Email Account mapped to *company*
+    (via Email Account.custom_company), served from a cached map.
+    """
+    if not company:
+        return None
+
+    account_map = frappe.cache().get_value(
+        COMPANY_EMAIL_ACCOUNT_CACHE_KEY, generator=_build_company_email_account_map
+    )
+    return (account_map or {}).get(company)
+
+
+def _build_company_email_account_map():
+    accounts = frappe.get_all(
+        "Email Account",
+        filters={"custom_company": ["is", "set"]},
+        fields=["name", "email_id", "custom_company"],
+        order_by="creation asc",
+    )
+
+    account_map = {}
+    for account in accounts:
+        # Keep the first account per company, matching the previous get_value lookup
+        account_map.setdefault(
+            account.custom_company,
+            {"name": account.name, "email_id": account.email_id},
+        )
+    return account_map
+
+
+def clear_company_email_account_cache(doc=None, method=None):
+    """doc_event: Email Account on_update / on_trash -> drop the cached map."""
+    frappe.cache().delete_value(COMPANY_EMAIL_ACCOUNT_CACHE_KEY)
+
+
 def send_company_email(recipients, subject, message, reference_doctype=None, reference_name=None):
     frappe.sendmail(
         recipients=recipients,
@@ -51,4 +104,3 @@ def send_company_email(recipients, subject, message, reference_doctype=None, ref
         reference_doctype=reference_doctype,
         reference_name=reference_name
     )
-
@@ -1,5 +1,13 @@
+import json
+
 import frappe
 from frappe import _
+from frappe.utils import get_datetime
+
+# Redis hash: employee -> 1/0 (custom_allow_checkincheckout_from_mobile_app)
+MOBILE_CHECKIN_POLICY_CACHE_KEY = "custom_app:mobile_checkin_policy"
+MAX_BULK_PUNCHES = 5000
+
 
 def before_insert_checkin(doc, method):
     try:
@@ -7,24 +15,172 @@ def before_insert_checkin(doc, method):
         if not doc.employee:
             frappe.throw(_("Employee field is mandatory."))
 
-        employee = frappe.get_doc("Employee", doc.employee)
-
         # Get request info
         request = getattr(frappe.local, "request", None)
         headers = dict(request.headers) if request else {}
         referer = headers.get("Referer", "")
-        
+
+        # Only web-portal / mobile-app check-ins are policy-checked, so device
+        # punches never pay for the lookup.
+        if not (referer and referer.rstrip("/").endswith("hrms/home")):
+            return
+
         # Validation Logic
-        if not employee.custom_allow_checkincheckout_from_mobile_app:
-            # If referer ends with hrms/home → block
-            if referer and referer.rstrip("/").endswith("hrms/home"):
-                frappe.throw(
-                    _("You are not allowed to Check-in or Check-out from HRMS web portal/mobile app."),
-                    frappe.PermissionError
-                )
+        if not get_mobile_checkin_policy(doc.employee):
+            frappe.throw(
+                _("You are not allowed to Check-in or Check-out from HRMS web portal/mobile app."),
+                frappe.PermissionError
+            )
 
     except frappe.PermissionError:
         raise
     except Exception as e:
         frappe.logger().error(f"❌ Error in before_insert_checkin: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def get_mobile_checkin_policy(employee):
+    """
+    Return True if *employee* may check in from the HRMS web portal /
+    mobile app. Cached per employee in a Redis hash; cleared on Employee update.
+    """
+    allowed = frappe.cache().hget(
+        MOBILE_CHECKIN_POLICY_CACHE_KEY,
+        employee,
+        generator=lambda: _load_mobile_checkin_policy(employee),
+    )
+    return bool(allowed)
+
+
+def _load_mobile_checkin_policy(employee):
+    allowed = frappe.db.get_value(
+        "Employee", employee, "custom_allow_checkincheckout_from_mobile_app"
+    )
+    if allowed is None:
+        frappe.throw(_("Employee {0} not found.").format(employee), frappe.DoesNotExistError)
+
+    return allowed
+
+
+def clear_mobile_checkin_policy_cache(doc, method=None):
+    """doc_event: Employee on_update / on_trash -> drop the cached policy."""
+    frappe.cache().hdel(MOBILE_CHECKIN_POLICY_CACHE_KEY, doc.name)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bulk ingestion for biometric / device punches
+# ──────────────────────────────────────────────────────────────────────────────
+
+@frappe.whitelist(methods=["POST"])
+def add_checkins_in_bulk(punches):
+    """
+    Validate and insert a batch of device punches in one call.
+
+    *punches* is a list (or JSON string) of dicts with ``employee``, ``time``
+    and optionally ``log_type`` and ``device_id``. Unknown / inactive
+    employees and punches already recorded for the same (employee, time)
+    are skipped using one prefetch query each, instead of per punch.
+
+    Returns ``{"inserted": [...], "skipped": [...], "failed": [...]}``.
+    """
+    frappe.has_permission("Employee Checkin", "create", throw=True)
+
+    if isinstance(punches, str):
+        punches = json.loads(punches)
+
+    if not isinstance(punches, list):
+        frappe.throw(_("Punches must be a list."))
+
+    if len(punches) > MAX_BULK_PUNCHES:
+        frappe.throw(_("At most {0} punches can be imported in one call.").format(MAX_BULK_PUNCHES))
+
+    result = {"inserted": [], "skipped": [], "failed": []}
+
+    # 1. Normalise + de-duplicate within the batch
+    normalised = []
+    seen = set()
+    for idx, punch in enumerate(punches):
+        if not isinstance(punch, dict):
+            result["failed"].append({"idx": idx, "error": _("Each punch must be an object.")})
+            continue
+
+        employee = punch.get("employee")
+        time = punch.get("time")
+        if not employee or not time:
+            result["failed"].append({"idx": idx, "error": _("Employee and Time are mandatory.")})
+            continue
+
+        try:
+            time = get_datetime(time)
+        except Exception:
+            result["failed"].append({"idx": idx, "error": _("Invalid Time {0}").format(time)})
+            continue
+
+        key = (employee, time)
+        if key in seen:
+            result["skipped"].append({"idx": idx, "reason": "duplicate in batch"})
+            continue
+        seen.add(key)
+
+        normalised.append((idx, employee, time, punch))
+
+    if not normalised:
+        return result
+
+    employees = {employee for _idx, employee, _time, _punch in normalised}
+
+    # 2. One query for all referenced employees
+    active_employees = set(
+        frappe.get_all(
+            "Employee",
+            filters={"name": ["in", list(employees)], "status": "Active"},
+            pluck="name",
+        )
+    )
+
+    # 3. One query for punches that already exist
+    times = [time for _idx, _employee, time, _punch in normalised]
+    existing = {
+        (row.employee, get_datetime(row.time))
+        for row in frappe.get_all(
+            "Employee Checkin",
+            filters={
+                "employee": ["in", list(employees)],
+                "time": ["between", [min(times), max(times)]],
+            },
+            fields=["employee", "time"],
+        )
+    }
+
+    # 4. Insert -- each punch in its own savepoint so one bad row does not
+    #    roll back the batch.
+    for idx, employee, time, punch in normalised:
+        if employee not in active_employees:
+            result["skipped"].append({"idx": idx, "reason": "unknown or inactive employee"})
+            continue
+
+        if (employee, time) in existing:
+            result["skipped"].append({"idx": idx, "reason": "already recorded"})
+            continue
+
+        savepoint = f"bulk_checkin_{idx}"
+        frappe.db.savepoint(savepoint)
+        try:
+            checkin = frappe.get_doc({
+                "doctype": "Employee Checkin",
+                "employee": employee,
+                "time": time,
+                "log_type": punch.get("log_type"),
+                "device_id": punch.get("device_id"),
+            })
+            checkin.insert()
+            result["inserted"].append({"idx": idx, "name": checkin.name})
+        except Exception as e:
+            frappe.db.rollback(save_point=savepoint)
+            result["failed"].append({"idx": idx, "error": str(e)})
+
+    frappe.logger().info(
+        f"[bulk checkin] inserted={len(result['inserted'])} "
+        f"skipped={len(result['skipped'])} failed={len(result['failed'])}"
+    )
+    return result
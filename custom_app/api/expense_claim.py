@@ -2,7 +2,7 @@ import frappe
 from frappe import _
 from custom_app.api.notification_utils import (
     get_user_from_employee,
-    safe_sendmail,
+    queue_notification,
 )
  
 
@@ -119,7 +119,7 @@ def notify_approver_on_create(doc, method=None):
     if not approver:
         return
  
-    approver_email = frappe.db.get_value("User", approver, "email") or approver
+    # approver is a User id; the outbox resolves it to an email when sending
     link = frappe.utils.get_url_to_form(doc.doctype, doc.name)
     subject = f"New Expense Claim: {doc.name}"
     message = f"""
@@ -145,12 +145,13 @@ def notify_approver_on_create(doc, method=None):
     <p>Please log in to review and take action.</p>
     """
  
-    safe_sendmail(
-        recipients=[approver_email],
+    queue_notification(
+        recipients=[approver],
         subject=subject,
         message=message,
         reference_doctype=doc.doctype,
         reference_name=doc.name,
+        notification_type="Approval Request",
     )
  
  
@@ -183,7 +184,6 @@ def on_workflow_state_change(doc, method=None):
     if not employee_user:
         return
 
-    employee_email = frappe.db.get_value("User", employee_user, "email") or employee_user
     link = frappe.utils.get_url_to_form(doc.doctype, doc.name)
 
     state_color = "#28a745" if current_state == "Approved" else "#dc3545"
@@ -208,10 +208,11 @@ def on_workflow_state_change(doc, method=None):
     <p>Regards,<br>System</p>
     """
 
-    safe_sendmail(
-        recipients=[employee_email],
+    queue_notification(
+        recipients=[employee_user],
         subject=subject,
         message=message,
         reference_doctype=doc.doctype,
         reference_name=doc.name,
+        notification_type="Status Change",
     )
\ No newline at end of file
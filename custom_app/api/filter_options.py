@@ -0,0 +1,61 @@
+import hashlib
+
+import frappe
+
+# Master lists behind the dashboard / timeline filter dropdowns. Each list is
+# cached in Redis together with the version of its table (row count + latest
+# `modified`), so it is reloaded only after a master record is added,
+# edited or deleted -- no doc_events needed.
+MASTER_LISTS = {
+    "Company": {"order_by": "name asc"},
+    "Cost Center": {"filters": {"is_group": 0}, "order_by": "name asc"},
+    "Supplier": {"order_by": "name asc"},
+    "Department": {"order_by": "name asc"},
+    "Fiscal Year": {"filters": {"disabled": 0}, "order_by": "year_start_date desc"},
+}
+
+# Redis hash: doctype -> {"version": ..., "names": [...]}
+MASTER_LISTS_CACHE_KEY = "custom_app:filter_master_lists"
+
+
+def get_master_version(doctype):
+    """Cheap change token for a master table: ``"<count>:<max modified>"``."""
+    count, modified = frappe.db.sql(f"SELECT COUNT(*), MAX(modified) FROM `tab{doctype}`")[0]
+    return f"{count}:{modified}"
+
+
+def get_master_list(doctype, version=None):
+    """Names of *doctype* as shown in the filter dropdowns, cached per table version."""
+    version = version or get_master_version(doctype)
+    cached = frappe.cache().hget(MASTER_LISTS_CACHE_KEY, doctype)
+    if cached and cached.get("version") == version:
+        return cached["names"]
+
+    spec = MASTER_LISTS[doctype]
+    names = frappe.get_all(
+        doctype, filters=spec.get("filters"), order_by=spec["order_by"], pluck="name"
+    )
+    frappe.cache().hset(MASTER_LISTS_CACHE_KEY, doctype, {"version": version, "names": names})
+    return names
+
+
+def filter_options_response(etag, doctypes, build, **scope):
+    """
+    Return filter options, or ``{"unchanged": True}`` when *etag* is current.
+
+    The etag is derived from the versions of *doctypes* and the caller's
+    user-specific *scope* (permitted companies, lock flag, ...), so an
+    unchanged reply is decided without loading any list. *build* is called
+    with ``{doctype: names}`` only when the client copy is stale.
+    """
+    versions = {doctype: get_master_version(doctype) for doctype in doctypes}
+    current = hashlib.md5(
+        frappe.as_json({"versions": versions, "scope": scope}).encode()
+    ).hexdigest()
+
+    if etag and etag == current:
+        return {"unchanged": True, "etag": current}
+
+    payload = build({doctype: get_master_list(doctype, version) for doctype, version in versions.items()})
+    payload["etag"] = current
+    return payload
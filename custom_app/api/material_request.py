@@ -1,9 +1,10 @@
 import frappe
 from frappe import _
 from frappe.utils import flt
+from custom_app.api.supplier_quotation import QTY_ORDERED_FIELD
 from custom_app.api.notification_utils import (
     get_user_from_employee,
-    safe_sendmail,
+    queue_notification,
 )
 
 
@@ -123,9 +124,7 @@ def notify_approver_on_create(doc, method=None):
         )
         return
  
-    # Resolve approver email (field is Link → User, so name == email in Frappe)
-    approver_email = frappe.db.get_value("User", approver, "email") or approver
- 
+    # approver is a User id; the outbox resolves it to an email when sending
     link = frappe.utils.get_url_to_form(doc.doctype, doc.name)
     subject = f"New Purchase Request: {doc.name}"
     message = f"""
@@ -149,12 +148,13 @@ def notify_approver_on_create(doc, method=None):
     <p>Please log in to review and take action.</p>
     """
  
-    safe_sendmail(
-        recipients=[approver_email],
+    queue_notification(
+        recipients=[approver],
         subject=subject,
         message=message,
         reference_doctype=doc.doctype,
         reference_name=doc.name,
+        notification_type="Approval Request",
     )
  
  
@@ -190,7 +190,6 @@ def notify_employee_on_status_change(doc, method=None):
     if not employee_user:
         return
  
-    employee_email = frappe.db.get_value("User", employee_user, "email") or employee_user
     link = frappe.utils.get_url_to_form(doc.doctype, doc.name)
  
     state_color = "#28a745" if state == "Approved" else "#dc3545"
@@ -213,12 +212,13 @@ def notify_employee_on_status_change(doc, method=None):
     <p>Regards,<br>System</p>
     """
  
-    safe_sendmail(
-        recipients=[employee_email],
+    queue_notification(
+        recipients=[employee_user],
         subject=subject,
         message=message,
         reference_doctype=doc.doctype,
         reference_name=doc.name,
+        notification_type="Status Change",
     )
  
  
@@ -261,16 +261,28 @@ def validate_request_verifier(doc, method=None):
 def validate_quotation_against_material_request(doc, method=None):
     """
     Triggered by doc_events → validate on Supplier Quotation.
-    For every item row that references a Material Request (Purchase Requisition),
-    ensure the quoted amount does not exceed the approved PR amount for that item.
+    For every Material Request Item (Purchase Requisition row) this quotation
+    quotes against, ensure the quoted amount -- summed over the quotation's
+    rows, plus what other submitted quotations have already had ordered
+    against the same MR item -- does not exceed the approved PR amount.
+
+    Runs in two queries regardless of the number of rows.
     """
-    for row in doc.items:
-        if not row.material_request:
-            continue
+    rows = [row for row in doc.items if row.material_request]
+    if not rows:
+        return
+
+    mr_items = _get_material_request_items(rows)
+    consumed = _get_consumed_mr_item_amounts(doc, mr_items)
 
-        mr_amount = get_material_request_item_amount(row)
+    quoted = {}
+    for row in rows:
+        key = _resolve_mr_item(row.material_request, row.material_request_item, row.item_code, mr_items)
+        quoted[key] = quoted.get(key, 0) + flt(row.amount)
 
-        if flt(row.amount) > flt(mr_amount):
+    for key, amount in quoted.items():
+        mr_amount = mr_items["by_name"][key].amount if key else 0
+        if flt(amount) > flt(mr_amount) - flt(consumed.get(key)):
             frappe.throw(
                 _(
                     "Supplier quotation amount cannot exceed the approved Purchase "
@@ -279,24 +291,74 @@ def validate_quotation_against_material_request(doc, method=None):
             )
 
 
-def get_material_request_item_amount(row):
+def _get_material_request_items(rows):
+    """
+    Fetch every Material Request Item the rows can resolve to, in one query:
+    the exact linked rows plus all rows of the referenced Material Requests
+    (for the item_code fallback).
+    """
+    parents = {row.material_request for row in rows}
+    names = {row.material_request_item for row in rows if row.material_request_item}
+
+    items = frappe.db.sql(
+        """
+        SELECT name, parent, item_code, amount
+        FROM `tabMaterial Request Item`
+        WHERE parent IN %(parents)s OR name IN %(names)s
+        ORDER BY parent, idx
+        """,
+        {"parents": tuple(parents), "names": tuple(names) or ("",)},
+        as_dict=True,
+    )
+
+    by_name = {}
+    by_parent_item = {}
+    for item in items:
+        by_name[item.name] = item
+        by_parent_item.setdefault((item.parent, item.item_code), item.name)
+    return {"by_name": by_name, "by_parent_item": by_parent_item}
+
+
+def _resolve_mr_item(material_request, material_request_item, item_code, mr_items):
     """
-    Resolve the approved amount from the source Material Request Item.
+    Resolve a quotation row to its source Material Request Item name.
     Prefers the exact linked row (material_request_item) and falls back
     to matching by item_code within that Material Request.
     """
-    if row.material_request_item:
-        amount = frappe.db.get_value(
-            "Material Request Item", row.material_request_item, "amount"
-        )
-        if amount is not None:
-            return amount
+    item = mr_items["by_name"].get(material_request_item)
+    if item is not None and item.amount is not None:
+        return item.name
+    return mr_items["by_parent_item"].get((material_request, item_code))
 
-    return (
-        frappe.db.get_value(
-            "Material Request Item",
-            {"parent": row.material_request, "item_code": row.item_code},
-            "amount",
-        )
-        or 0
-    )
\ No newline at end of file
+
+def _get_consumed_mr_item_amounts(doc, mr_items):
+    """
+    Amount already ordered (qty ordered x rate) against each MR item through
+    other submitted Supplier Quotations. Only the ordered part counts, so
+    competing quotations for the same requisition do not block each other.
+    """
+    parents = {item.parent for item in mr_items["by_name"].values()}
+    if not parents:
+        return {}
+
+    consumed_rows = frappe.db.sql(
+        f"""
+        SELECT material_request, material_request_item, item_code,
+               SUM(IFNULL(`{QTY_ORDERED_FIELD}`, 0) * rate) AS amount
+        FROM `tabSupplier Quotation Item`
+        WHERE docstatus = 1
+          AND parent != %(quotation)s
+          AND material_request IN %(parents)s
+          AND IFNULL(`{QTY_ORDERED_FIELD}`, 0) > 0
+        GROUP BY material_request, material_request_item, item_code
+        """,
+        {"quotation": doc.name or "", "parents": tuple(parents)},
+        as_dict=True,
+    )
+
+    consumed = {}
+    for r in consumed_rows:
+        key = _resolve_mr_item(r.material_request, r.material_request_item, r.item_code, mr_items)
+        if key:
+            consumed[key] = consumed.get(key, 0) + flt(r.amount)
+    return consumed
\ No newline at end of file
@@ -21,31 +21,159 @@ def get_user_from_employee(employee: str) -> str | None:
 
 
 # ──────────────────────────────────────────────
-# 2.  Role → User list
+# 2.  Approver directory (role → company → department)
+#
+# Built from ONE query over User / Has Role / Employee plus the Cost Center
+# → department map, stored in Redis and memoised in-process. A small
+# version token in Redis tells each process when its copy is stale, so a
+# lookup costs one tiny GET (itself request-cached) and dict accesses.
+# Invalidated on User (which also saves its Has Role rows), Employee and
+# Cost Center changes.
 # ──────────────────────────────────────────────
 
-def get_users_by_role(role: str) -> list[str]:
+APPROVER_DIRECTORY_KEY = "custom_app:approver_directory"
+APPROVER_DIRECTORY_VERSION_KEY = "custom_app:approver_directory_version"
+
+# site -> (version, directory)
+_local_directory = {}
+
+
+def get_approver_directory() -> dict:
     """
-    Return a deduplicated list of enabled user emails that hold *role*.
+    Return the approver directory::
+
+        {
+            "by_role":         {role: [email, ...]},
+            "by_company":      {role: {company: [email, ...]}},
+            "by_department":   {role: {company: {department: [email, ...]}}},
+            "cost_center_department": {cost_center: department},
+        }
+
+    Company / department buckets only contain users linked to an Active
+    Employee.
     """
+    cache = frappe.cache()
+    site = getattr(frappe.local, "site", None)
+    version = cache.get_value(APPROVER_DIRECTORY_VERSION_KEY)
+
+    if version:
+        local = _local_directory.get(site)
+        if local and local[0] == version:
+            return local[1]
+
+        directory = cache.get_value(APPROVER_DIRECTORY_KEY)
+        if directory is not None:
+            _local_directory[site] = (version, directory)
+            return directory
+
+    directory = _build_approver_directory()
+    version = frappe.generate_hash(length=12)
+    cache.set_value(APPROVER_DIRECTORY_KEY, directory)
+    cache.set_value(APPROVER_DIRECTORY_VERSION_KEY, version)
+    _local_directory[site] = (version, directory)
+    return directory
+
+
+def _build_approver_directory() -> dict:
     rows = frappe.db.sql(
         """
-        SELECT DISTINCT u.email
+        SELECT DISTINCT hr.role, u.email, e.company, e.department
         FROM   `tabUser` u
-        JOIN   `tabHas Role` hr ON hr.parent = u.name
-        WHERE  hr.role        = %s
-          AND  u.enabled      = 1
-          AND  u.email        != ''
-          AND  u.name        NOT IN ('Administrator', 'Guest')
+        JOIN   `tabHas Role` hr ON hr.parent     = u.name
+                               AND hr.parenttype = 'User'
+        LEFT JOIN `tabEmployee` e ON e.user_id   = u.name
+                                 AND e.status    = 'Active'
+        WHERE  u.enabled  = 1
+          AND  u.email   != ''
+          AND  u.name   NOT IN ('Administrator', 'Guest')
         """,
-        (role,),
         as_dict=True,
     )
-    return [r.email for r in rows if r.email]
+
+    by_role = {}
+    by_company = {}
+    by_department = {}
+    for r in rows:
+        if not r.email:
+            continue
+        _add_unique(by_role.setdefault(r.role, []), r.email)
+        if r.company:
+            _add_unique(by_company.setdefault(r.role, {}).setdefault(r.company, []), r.email)
+            if r.department:
+                _add_unique(
+                    by_department.setdefault(r.role, {})
+                    .setdefault(r.company, {})
+                    .setdefault(r.department, []),
+                    r.email,
+                )
+
+    cost_center_department = dict(
+        frappe.db.sql(
+            """
+            SELECT name, custom_department
+            FROM   `tabCost Center`
+            WHERE  IFNULL(custom_department, '') != ''
+            """
+        )
+    )
+
+    return {
+        "by_role": by_role,
+        "by_company": by_company,
+        "by_department": by_department,
+        "cost_center_department": cost_center_department,
+    }
+
+
+def _add_unique(bucket: list, email: str) -> None:
+    if email not in bucket:
+        bucket.append(email)
+
+
+def clear_approver_directory(doc=None, method=None) -> None:
+    """doc_event: User / Employee / Cost Center on_update / on_trash."""
+    frappe.cache().delete_value([APPROVER_DIRECTORY_KEY, APPROVER_DIRECTORY_VERSION_KEY])
+    _local_directory.pop(getattr(frappe.local, "site", None), None)
+
+
+def prewarm_approver_directory() -> None:
+    """after_migrate / scheduler: build the directory if it is not cached."""
+    get_approver_directory()
 
 
 # ──────────────────────────────────────────────
-# 3.  Finance Approvers filtered by company / cost-center
+# 3.  Role → User list
+# ──────────────────────────────────────────────
+
+def get_users_by_role(role: str) -> list[str]:
+    """
+    Return a deduplicated list of enabled user emails that hold *role*.
+    """
+    return list(get_approver_directory()["by_role"].get(role, []))
+
+
+def get_role_approvers(role: str, company: str, cost_center: str | None = None) -> list[str]:
+    """
+    Return emails of *role* holders whose Active Employee belongs to
+    *company*, narrowed to the department mapped on *cost_center* when that
+    yields anyone.
+    """
+    directory = get_approver_directory()
+    candidates = directory["by_company"].get(role, {}).get(company, [])
+
+    if cost_center and candidates:
+        dept = directory["cost_center_department"].get(cost_center)
+        if dept:
+            dept_emails = directory["by_department"].get(role, {}).get(company, {}).get(dept, [])
+            # Use narrower list only when it is non-empty
+            if dept_emails:
+                return list(dept_emails)
+
+    return list(candidates)
+
+
+# ──────────────────────────────────────────────
+# 4.  Finance Approvers filtered by company / cost-center
 # ──────────────────────────────────────────────
 
 def get_finance_approvers(company: str, cost_center: str | None = None) -> list[str]:
@@ -54,85 +182,53 @@ def get_finance_approvers(company: str, cost_center: str | None = None) -> list[
     the same *company*.  If *cost_center* is supplied, further filter
     by the cost-center mapped on the Employee's department.
 
-    Strategy
-    --------
-    1.  Start from all users with role 'Finance Approver'.
-    2.  Cross-join with Employee (via user_id) to get company.
-    3.  Filter by company.
-    4.  Optionally filter by cost_center via Cost Center.custom_department
-        → Employee.department chain.
+    Resolved from the cached approver directory (see section 2).
     """
     if not company:
         return get_users_by_role("Finance Approver")
 
-    # Base query: Finance Approvers whose employee record matches company
-    rows = frappe.db.sql(
-        """
-        SELECT DISTINCT u.email
-        FROM   `tabUser`     u
-        JOIN   `tabHas Role` hr ON hr.parent    = u.name
-        JOIN   `tabEmployee` e  ON e.user_id    = u.name
-        WHERE  hr.role     = 'Finance Approver'
-          AND  u.enabled   = 1
-          AND  u.email    != ''
-          AND  u.name    NOT IN ('Administrator', 'Guest')
-          AND  e.company   = %s
-          AND  e.status    = 'Active'
-        """,
-        (company,),
-        as_dict=True,
-    )
-    candidates = [r.email for r in rows if r.email]
-
-    # Optional cost-center filter
-    if cost_center and candidates:
-        dept = frappe.db.get_value(
-            "Cost Center", cost_center, "custom_department"
-        )
-        if dept:
-            dept_filtered = frappe.db.sql(
-                """
-                SELECT DISTINCT u.email
-                FROM   `tabUser`     u
-                JOIN   `tabHas Role` hr ON hr.parent    = u.name
-                JOIN   `tabEmployee` e  ON e.user_id    = u.name
-                WHERE  hr.role        = 'Finance Approver'
-                  AND  u.enabled      = 1
-                  AND  u.email       != ''
-                  AND  u.name       NOT IN ('Administrator', 'Guest')
-                  AND  e.company      = %s
-                  AND  e.status       = 'Active'
-                  AND  e.department   = %s
-                """,
-                (company, dept),
-                as_dict=True,
-            )
-            dept_emails = [r.email for r in dept_filtered if r.email]
-            # Use narrower list only when it is non-empty
-            if dept_emails:
-                return dept_emails
-
-    return candidates
+    return get_role_approvers("Finance Approver", company, cost_center)
 
 
 # ──────────────────────────────────────────────
-# 4.  Safe email dispatch
+# 5.  Notification outbox
+#
+# Workflow hooks never send inline. They write a `Notification Outbox` row
+# inside the user's transaction (so a rolled-back save sends nothing) and a
+# background job drains the outbox after commit. The drain job
+#   * claims each batch atomically (Queued → Sending, stamped with a lock
+#     token) so the enqueued job and the scheduler safety-net run can never
+#     send the same row twice,
+#   * resolves recipient Users → emails in one query per batch,
+#   * de-duplicates recipients, and
+#   * coalesces several queued notifications of the same type for the same
+#     document (e.g. rapid state changes) into one email – the newest wins.
+# A failed send only marks the outbox row; it never touches the user action.
 # ──────────────────────────────────────────────
 
-def safe_sendmail(
+OUTBOX_DOCTYPE = "Notification Outbox"
+OUTBOX_JOB_ID = "custom_app:process_notification_outbox"
+OUTBOX_BATCH_SIZE = 200
+OUTBOX_MAX_BATCHES = 25
+OUTBOX_MAX_ATTEMPTS = 3
+# Claims older than this belong to a worker that died mid-batch
+OUTBOX_CLAIM_TIMEOUT_MINUTES = 30
+
+
+def queue_notification(
     recipients: list[str],
     subject: str,
     message: str,
     reference_doctype: str | None = None,
     reference_name: str | None = None,
+    notification_type: str | None = None,
 ) -> None:
     """
-    Deduplicate recipients, validate they are non-empty, then send.
-    Never raises — errors are logged.
+    Add a notification to the outbox and schedule the drain job to run
+    once the current transaction commits. *recipients* may be User ids or
+    email addresses.
     """
-    from custom_app.api.email import send_company_email  # local import avoids circular
-
-    unique = list({r.strip().lower() for r in recipients if r and r.strip()})
+    unique = _dedupe_recipients(recipients)
     if not unique:
         frappe.logger().warning(
             f"[notifications] No valid recipients for {reference_doctype} "
@@ -140,21 +236,204 @@ def safe_sendmail(
         )
         return
 
-    try:
-        send_company_email(
-            recipients=unique,
-            subject=subject,
-            message=message,
-            reference_doctype=reference_doctype,
-            reference_name=reference_name,
+    frappe.get_doc({
+        "doctype": OUTBOX_DOCTYPE,
+        "reference_doctype": reference_doctype,
+        "reference_name": reference_name,
+        "notification_type": notification_type,
+        "recipients": "\n".join(unique),
+        "subject": subject,
+        "message": message,
+        "status": "Queued",
+    }).insert(ignore_permissions=True)
+
+    frappe.enqueue(
+        "custom_app.api.notification_utils.process_notification_outbox",
+        queue="short",
+        job_id=OUTBOX_JOB_ID,
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )
+
+
+def process_notification_outbox() -> None:
+    """
+    Background job (also scheduled as a safety net): drain queued outbox
+    rows in batches, committing after each batch.
+    """
+    _release_stale_claims()
+    attempted = set()
+
+    for _batch in range(OUTBOX_MAX_BATCHES):
+        rows = _claim_outbox_batch(attempted)
+        if not rows:
+            break
+
+        attempted.update(r.name for r in rows)
+        _drain_outbox_batch(rows)
+        frappe.db.commit()
+
+        if len(rows) < OUTBOX_BATCH_SIZE:
+            break
+
+
+def _claim_outbox_batch(exclude) -> list:
+    """
+    Move up to OUTBOX_BATCH_SIZE Queued rows to Sending under a fresh lock
+    token and return them. The UPDATE takes the row locks, so a concurrent
+    drain blocks on it and then skips the rows that are no longer Queued.
+    Rows already attempted in this run (*exclude*) are left for the next.
+    """
+    token = frappe.generate_hash(length=20)
+    values = {"token": token, "now": frappe.utils.now(), "limit": OUTBOX_BATCH_SIZE}
+
+    exclude_condition = ""
+    if exclude:
+        exclude_condition = "AND name NOT IN %(exclude)s"
+        values["exclude"] = tuple(exclude)
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabNotification Outbox`
+        SET    status = 'Sending', lock_token = %(token)s, claimed_on = %(now)s
+        WHERE  status = 'Queued'
+          {exclude_condition}
+        ORDER BY creation ASC
+        LIMIT  %(limit)s
+        """,
+        values,
+    )
+    # Release the row locks before sending; the claim itself is the lock now
+    frappe.db.commit()
+
+    return frappe.get_all(
+        OUTBOX_DOCTYPE,
+        filters={"lock_token": token, "status": "Sending"},
+        fields=[
+            "name", "reference_doctype", "reference_name", "notification_type",
+            "recipients", "subject", "message", "attempts",
+        ],
+        order_by="creation asc",
+    )
+
+
+def _release_stale_claims() -> None:
+    """Requeue rows left in Sending by a worker that died before finishing."""
+    frappe.db.sql(
+        """
+        UPDATE `tabNotification Outbox`
+        SET    status = 'Queued', lock_token = NULL, claimed_on = NULL
+        WHERE  status = 'Sending'
+          AND  claimed_on < %(cutoff)s
+        """,
+        {"cutoff": frappe.utils.add_to_date(None, minutes=-OUTBOX_CLAIM_TIMEOUT_MINUTES)},
+    )
+    frappe.db.commit()
+
+
+def _drain_outbox_batch(rows) -> None:
+    # Coalesce by (document, notification type); rows without a reference
+    # are never merged.
+    groups = {}
+    for row in rows:
+        if row.reference_doctype and row.reference_name and row.notification_type:
+            key = (row.reference_doctype, row.reference_name, row.notification_type)
+        else:
+            key = (row.name,)
+        groups.setdefault(key, []).append(row)
+
+    email_by_user = _get_user_emails(
+        {r for row in rows for r in (row.recipients or "").splitlines()}
+    )
+
+    for group in groups.values():
+        latest = group[-1]
+        recipients = _dedupe_recipients(
+            email_by_user.get(r, r)
+            for row in group
+            for r in (row.recipients or "").splitlines()
         )
+
+        try:
+            from custom_app.api.email import send_company_email  # local import avoids circular
+
+            send_company_email(
+                recipients=recipients,
+                subject=latest.subject,
+                message=latest.message,
+                reference_doctype=latest.reference_doctype,
+                reference_name=latest.reference_name,
+            )
+        except Exception:
+            attempts = (latest.attempts or 0) + 1
+            frappe.db.set_value(
+                OUTBOX_DOCTYPE,
+                {"name": ["in", [row.name for row in group]]},
+                {
+                    "attempts": attempts,
+                    "status": "Failed" if attempts >= OUTBOX_MAX_ATTEMPTS else "Queued",
+                    "error": frappe.get_traceback()[-1000:],
+                    "lock_token": None,
+                    "claimed_on": None,
+                },
+                update_modified=False,
+            )
+            frappe.log_error(
+                frappe.get_traceback(),
+                f"[notifications] Failed sending '{latest.subject}' for "
+                f"{latest.reference_doctype} {latest.reference_name!r}",
+            )
+            continue
+
+        frappe.db.set_value(
+            OUTBOX_DOCTYPE,
+            latest.name,
+            {
+                "status": "Sent",
+                "sent_on": frappe.utils.now(),
+                "recipients": "\n".join(recipients),
+                "lock_token": None,
+            },
+            update_modified=False,
+        )
+        if len(group) > 1:
+            frappe.db.set_value(
+                OUTBOX_DOCTYPE,
+                {"name": ["in", [row.name for row in group[:-1]]]},
+                {"status": "Coalesced", "lock_token": None},
+                update_modified=False,
+            )
+
         frappe.logger().info(
-            f"[notifications] Sent '{subject}' → {unique} "
-            f"({reference_doctype} {reference_name!r})"
+            f"[notifications] Sent '{latest.subject}' → {recipients} "
+            f"({latest.reference_doctype} {latest.reference_name!r}, "
+            f"{len(group)} queued)"
         )
-    except Exception:
-        frappe.log_error(
-            frappe.get_traceback(),
-            f"[notifications] Failed sending '{subject}' for "
-            f"{reference_doctype} {reference_name!r}",
-        )
\ No newline at end of file
+
+
+def _get_user_emails(recipients) -> dict:
+    """Map every recipient that is a User id to that user's email (one query)."""
+    recipients = [r for r in recipients if r]
+    if not recipients:
+        return {}
+
+    return {
+        u.name: u.email
+        for u in frappe.get_all(
+            "User",
+            filters={"name": ["in", recipients]},
+            fields=["name", "email"],
+        )
+        if u.email
+    }
+
+
+def _dedupe_recipients(recipients) -> list[str]:
+    unique = []
+    seen = set()
+    for r in recipients:
+        r = (r or "").strip()
+        if r and r.lower() not in seen:
+            seen.add(r.lower())
+            unique.append(r)
+    return unique
@@ -45,22 +45,39 @@ collected during the run and written as a SINGLE combined Error Log
 entry per batch (see _log_batch_issues), so a bad batch with many
 mismatched files doesn't flood the Error Log list.
 
-NOTE: Python's zipfile module only supports the classic "ZipCrypto"
-per-entry encryption, not WinZip/7-Zip AES encryption. If Paysquare
-ever switches to AES-encrypted zips, extraction will need the
-third-party `pyzipper` library instead -- this module detects that case
-and skips those files with an explicit message rather than silently
+Re-runs are cheap: each PDF entry is still decrypted in memory so it can
+be hashed (streaming SHA-256) and compared against the `content_hash`
+stored on the existing record, but unchanged files are reported as
+"unchanged" and are not re-attached or re-saved -- nothing is written to
+the DB or the file store for them. Changed files replace the
+attachment and the previous File is removed, so re-uploading a corrected
+zip doesn't pile up duplicate private files. Employees and existing
+records for the whole batch are prefetched up front (one query per
+doctype) instead of being looked up file by file.
+
+Entries are never extracted to disk: each one is decrypted as a stream
+(ZipCrypto, or WinZip/7-Zip AES-128/256) into a bounded in-memory buffer
+(MAX_PDF_BYTES) that is hashed on the way in and handed straight to the
+File writer. AES decryption uses the `pyzipper` library; if it isn't
+installed, the built-in zipfile module is used for ZipCrypto and AES
+entries are skipped with an explicit message rather than silently
 producing corrupt output.
 """
 
+import hashlib
+import io
 import os
 import re
-import shutil
-import tempfile
 import zipfile
 
 import frappe
 
+try:
+	# Drop-in zipfile replacement that also decrypts AES entries
+	import pyzipper
+except ImportError:
+	pyzipper = None
+
 DOCTYPE_SALARY_SLIP = "Paysquare Salary Slip"
 DOCTYPE_TAX_SHEET = "Paysquare Tax Sheet"
 
@@ -80,6 +97,11 @@ FORCED_DOCTYPE_FOR_BATCH = {
 	BATCH_TAX_SHEET_ONLY: DOCTYPE_TAX_SHEET,
 }
 
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
+# Upper bound for a single PDF held in memory while importing
+MAX_PDF_BYTES = 25 * 1024 * 1024  # 25 MiB
+
 # Which field on Employee to match the filename's employee code against.
 # "employee" checks the Employee ID itself (e.g. IFIM0713 is the Employee
 # ID). Change this if your Employee IDs don't look like the Paysquare
@@ -184,8 +206,9 @@ def parse_filename(filename, batch_type):
 def _is_aes_encrypted(zip_info):
 	"""
 	Detects WinZip/7-Zip AES encryption via the 0x9901 extra-field marker.
-	Python's zipfile can't decrypt these (it only supports classic
-	ZipCrypto) -- better to skip explicitly than silently extract garbage.
+	Only matters when pyzipper isn't installed: Python's zipfile can't
+	decrypt these (it only supports classic ZipCrypto) -- better to skip
+	explicitly than silently extract garbage.
 	"""
 	extra = zip_info.extra
 	i = 0
@@ -230,20 +253,125 @@ def find_employee(employee_code, match_field=EMPLOYEE_MATCH_FIELD):
 	return frappe.db.get_value("Employee", filters, "name")
 
 
-def create_or_update_record(parsed, employee, extracted_pdf_path, original_filename):
+def prefetch_employees(employee_codes, match_field=EMPLOYEE_MATCH_FIELD):
+	"""
+	Batch version of find_employee: returns {employee_code: {"name",
+	"company"}} for every code that matches, in one query.
+	"""
+	if not employee_codes:
+		return {}
+
+	field = "name" if match_field == "employee" else match_field
+	rows = frappe.get_all(
+		"Employee",
+		filters={field: ["in", list(employee_codes)]},
+		fields=["name", "company", f"{field} as match_code"],
+	)
+	return {row.match_code: row for row in rows}
+
+
+def prefetch_existing_records(docnames_by_doctype):
+	"""
+	Returns {(doctype, docname): {"name", "content_hash", <attach field>}}
+	for the records a batch is about to touch -- one query per doctype.
+	"""
+	existing = {}
+	for doctype, docnames in docnames_by_doctype.items():
+		if not docnames:
+			continue
+		for row in frappe.get_all(
+			doctype,
+			filters={"name": ["in", list(docnames)]},
+			fields=["name", "content_hash", ATTACH_FIELD[doctype]],
+		):
+			existing[(doctype, row.name)] = row
+	return existing
+
+
+def record_name(parsed, employee):
+	"""Docname per the doctypes' autoname: {PREFIX}-{employee}-{month}-{year}."""
+	prefix = "PSS" if parsed["target_doctype"] == DOCTYPE_SALARY_SLIP else "PTS"
+	return f"{prefix}-{employee}-{parsed['month']}-{parsed['year']}"
+
+
+def open_zip(zip_path):
+	"""Opens zip_path with AES support when pyzipper is available."""
+	if pyzipper:
+		return pyzipper.AESZipFile(zip_path)
+	return zipfile.ZipFile(zip_path)
+
+
+def read_zip_entry(zf, info, pwd, max_bytes=MAX_PDF_BYTES):
+	"""
+	Decrypts a zip entry as a stream into a bounded in-memory buffer,
+	hashing it on the way in. Returns (content_bytes, sha256_hexdigest).
+	Raises SkipFile if the entry is larger than max_bytes.
+	"""
+	if info.file_size > max_bytes:
+		raise SkipFile(
+			f"'{os.path.basename(info.filename)}' is {info.file_size} bytes, "
+			f"larger than the {max_bytes} byte limit"
+		)
+
+	digest = hashlib.sha256()
+	buffer = io.BytesIO()
+	with zf.open(info, pwd=pwd) as stream:
+		for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+			if buffer.tell() + len(chunk) > max_bytes:
+				raise SkipFile(
+					f"'{os.path.basename(info.filename)}' is larger than the {max_bytes} byte limit"
+				)
+			digest.update(chunk)
+			buffer.write(chunk)
+
+	return buffer.getvalue(), digest.hexdigest()
+
+
+def _remove_replaced_files(doctype, docname, attach_field, keep_file):
+	"""Deletes File docs previously attached to this field, except keep_file."""
+	for file_name in frappe.get_all(
+		"File",
+		filters={
+			"attached_to_doctype": doctype,
+			"attached_to_name": docname,
+			"attached_to_field": attach_field,
+			"name": ["!=", keep_file],
+		},
+		pluck="name",
+	):
+		frappe.delete_doc("File", file_name, ignore_permissions=True)
+
+
+def create_or_update_record(
+	parsed,
+	employee,
+	pdf_content,
+	original_filename,
+	employee_company=None,
+	existing=None,
+	content_hash=None,
+):
 	"""
 	Creates (or updates, if re-run for the same month) the
 	Paysquare Salary Slip / Paysquare Tax Sheet record and attaches the
-	PDF exactly as extracted (no PDF-internal unlocking). Naming follows
-	the doctype's own autoname: {employee}-{month}-{year}. Company on the
-	record is fetched from the matched Employee (informational only).
+	PDF bytes exactly as decrypted (no PDF-internal unlocking). Naming follows
+	the doctype's own autoname (see record_name). Company on the record is
+	taken from the matched Employee (informational only).
+
+	`existing` is the prefetched row for this record (see
+	prefetch_existing_records), or None if it doesn't exist yet; when
+	omitted it is looked up here. When an existing record's attachment is
+	replaced, the previous File is deleted.
 	"""
 	target_doctype = parsed["target_doctype"]
 	attach_field = ATTACH_FIELD[target_doctype]
-	docname = f"{employee}-{parsed['month']}-{parsed['year']}"
-	employee_company = frappe.db.get_value("Employee", employee, "company")
+	docname = record_name(parsed, employee)
+	if employee_company is None:
+		employee_company = frappe.db.get_value("Employee", employee, "company")
+	if existing is None and frappe.db.exists(target_doctype, docname):
+		existing = {"name": docname}
 
-	if frappe.db.exists(target_doctype, docname):
+	if existing:
 		doc = frappe.get_doc(target_doctype, docname)
 	else:
 		doc = frappe.new_doc(target_doctype)
@@ -253,6 +381,7 @@ def create_or_update_record(parsed, employee, extracted_pdf_path, original_filen
 	doc.company = employee_company
 	doc.employee = employee
 	doc.status = "Imported"
+	doc.content_hash = content_hash
 
 	# The attach field is mandatory on these doctypes, but we only set it
 	# right after insert/save (via db_set below), so skip the mandatory
@@ -265,19 +394,22 @@ def create_or_update_record(parsed, employee, extracted_pdf_path, original_filen
 	else:
 		doc.save(ignore_permissions=True)
 
-	with open(extracted_pdf_path, "rb") as f:
-		file_doc = frappe.get_doc({
-			"doctype": "File",
-			"file_name": original_filename,
-			"attached_to_doctype": target_doctype,
-			"attached_to_name": doc.name,
-			"attached_to_field": attach_field,
-			"is_private": 1,
-			"content": f.read(),
-		})
-		file_doc.save(ignore_permissions=True)
+	file_doc = frappe.get_doc({
+		"doctype": "File",
+		"file_name": original_filename,
+		"attached_to_doctype": target_doctype,
+		"attached_to_name": doc.name,
+		"attached_to_field": attach_field,
+		"is_private": 1,
+		"content": pdf_content,
+	})
+	file_doc.save(ignore_permissions=True)
 
 	doc.db_set(attach_field, file_doc.file_url)
+
+	if existing:
+		_remove_replaced_files(target_doctype, doc.name, attach_field, keep_file=file_doc.name)
+
 	return doc.name
 
 
@@ -329,9 +461,13 @@ def process_zip_file(zip_path, batch_type, zip_password, progress_callback=None)
 	the run and written to Error Log as a single combined entry at the
 	end (see _log_batch_issues) rather than one entry per file.
 
+	Entries whose content hash matches the existing record are reported
+	under "unchanged" and nothing is written for them.
+
 	Returns a summary dict:
 	    {
 	        "created": [{"file":..., "doctype":..., "docname":...}, ...],
+	        "unchanged": [{"file":..., "doctype":..., "docname":...}, ...],
 	        "skipped": [{"file":..., "reason":...}, ...],
 	        "errors":  [{"file":..., "reason":...}, ...],
 	    }
@@ -344,70 +480,111 @@ def process_zip_file(zip_path, batch_type, zip_password, progress_callback=None)
 
 	password_bytes = zip_password.encode()
 
-	summary = {"created": [], "skipped": [], "errors": []}
+	summary = {"created": [], "unchanged": [], "skipped": [], "errors": []}
 	error_tracebacks = []  # parallel detail for summary["errors"], not sent to the client
-	temp_dir = tempfile.mkdtemp(prefix="payslip_import_")
 
 	try:
-		try:
-			zf = zipfile.ZipFile(zip_path)
-		except Exception as e:
-			frappe.log_error(title="Paysquare Import: Zip Open Error", message=f"{zip_path}: {e}")
-			summary["errors"].append({"file": os.path.basename(zip_path), "reason": f"Could not open zip: {e}"})
-			return summary
+		zf = open_zip(zip_path)
+	except Exception as e:
+		frappe.log_error(title="Paysquare Import: Zip Open Error", message=f"{zip_path}: {e}")
+		summary["errors"].append({"file": os.path.basename(zip_path), "reason": f"Could not open zip: {e}"})
+		return summary
+
+	with zf:
+		pdf_entries = list(_iter_pdf_entries(zf))
+		total = len(pdf_entries)
+		processed = 0
+
+		# Parse every filename up front so employees and existing
+		# records can be prefetched for the whole batch.
+		parsed_by_entry = {}
+		for info in pdf_entries:
+			try:
+				parsed_by_entry[info.filename] = parse_filename(os.path.basename(info.filename), batch_type)
+			except SkipFile:
+				pass  # re-raised (and reported) in the main loop below
+
+		employees = prefetch_employees({p["employee_code"] for p in parsed_by_entry.values()})
+		docnames_by_doctype = {}
+		for p in parsed_by_entry.values():
+			employee_row = employees.get(p["employee_code"])
+			if employee_row:
+				docnames_by_doctype.setdefault(p["target_doctype"], set()).add(
+					record_name(p, employee_row.name)
+				)
+		existing_records = prefetch_existing_records(docnames_by_doctype)
+
+		for info in pdf_entries:
+			filename = os.path.basename(info.filename)
+
+			try:
+				parsed = parsed_by_entry.get(info.filename) or parse_filename(filename, batch_type)
 
-		with zf:
-			pdf_entries = list(_iter_pdf_entries(zf))
-			total = len(pdf_entries)
-			processed = 0
+				employee_row = employees.get(parsed["employee_code"])
+				if not employee_row:
+					raise SkipFile(
+						f"No Employee found matching code '{parsed['employee_code']}'"
+					)
+				employee = employee_row.name
 
-			for info in pdf_entries:
-				filename = os.path.basename(info.filename)
+				if not pyzipper and _is_aes_encrypted(info):
+					raise SkipFile(
+						f"'{filename}' uses AES zip encryption, which needs the "
+						f"pyzipper library -- install it, or re-zip with standard "
+						f"ZipCrypto encryption"
+					)
 
 				try:
-					parsed = parse_filename(filename, batch_type)
-
-					employee = find_employee(parsed["employee_code"])
-					if not employee:
-						raise SkipFile(
-							f"No Employee found matching code '{parsed['employee_code']}'"
-						)
-
-					if _is_aes_encrypted(info):
-						raise SkipFile(
-							f"'{filename}' uses AES zip encryption, which isn't supported "
-							f"by the built-in extractor -- re-zip with standard ZipCrypto "
-							f"encryption, or ask to add AES support"
-						)
-
-					try:
-						extracted_path = zf.extract(info, path=temp_dir, pwd=password_bytes)
-					except RuntimeError as e:
-						raise SkipFile(
-							f"Could not extract '{filename}' with the given zip password ({e})"
-						)
-
-					docname = create_or_update_record(parsed, employee, extracted_path, filename)
-					summary["created"].append({
+					pdf_content, content_hash = read_zip_entry(zf, info, password_bytes)
+				except RuntimeError as e:
+					raise SkipFile(
+						f"Could not extract '{filename}' with the given zip password ({e})"
+					)
+
+				docname = record_name(parsed, employee)
+				existing = existing_records.get((parsed["target_doctype"], docname))
+				if existing and existing.content_hash == content_hash and existing.get(
+					ATTACH_FIELD[parsed["target_doctype"]]
+				):
+					summary["unchanged"].append({
 						"file": filename,
 						"doctype": parsed["target_doctype"],
 						"docname": docname,
 					})
-
-				except SkipFile as e:
-					summary["skipped"].append({"file": filename, "reason": str(e)})
-
-				except Exception as e:
-					error_tracebacks.append(f"{filename}:\n{frappe.get_traceback()}")
-					summary["errors"].append({"file": filename, "reason": str(e)})
-
-				finally:
-					processed += 1
-					if progress_callback:
-						progress_callback(processed, total)
-
-	finally:
-		shutil.rmtree(temp_dir, ignore_errors=True)
+					continue
+
+				docname = create_or_update_record(
+					parsed,
+					employee,
+					pdf_content,
+					filename,
+					employee_company=employee_row.company,
+					existing=existing or {},
+					content_hash=content_hash,
+				)
+				# Same file name can repeat within a batch -- keep the index current
+				existing_records[(parsed["target_doctype"], docname)] = frappe._dict(
+					name=docname,
+					content_hash=content_hash,
+					**{ATTACH_FIELD[parsed["target_doctype"]]: True},
+				)
+				summary["created"].append({
+					"file": filename,
+					"doctype": parsed["target_doctype"],
+					"docname": docname,
+				})
+
+			except SkipFile as e:
+				summary["skipped"].append({"file": filename, "reason": str(e)})
+
+			except Exception as e:
+				error_tracebacks.append(f"{filename}:\n{frappe.get_traceback()}")
+				summary["errors"].append({"file": filename, "reason": str(e)})
+
+			finally:
+				processed += 1
+				if progress_callback:
+					progress_callback(processed, total)
 
 	errors_with_tb = [
 		{**row, "traceback": tb}
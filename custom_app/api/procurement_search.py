@@ -0,0 +1,220 @@
+import re
+
+import frappe
+
+from custom_app.utils.perf import instrumented
+
+# Typeahead index for the Purchase Timeline search dropdowns.
+#
+# Every non-cancelled procurement document owns rows in
+# `tabProcurement Search Term` holding every suffix of its name, supplier
+# and employee ("MR-00123" is stored as "mr-00123", "r-00123", "-00123",
+# "00123", "0123", ...). Any substring of a value is a prefix of one of its
+# suffixes, so a prefix match on (reference_doctype, term) -- served directly
+# by the composite index -- finds the same documents the old
+# `LIKE '%txt%'` scan of the base table did.
+
+SEARCH_SOURCES = {
+    "Material Request": {
+        "date_field": "transaction_date",
+        "cost_center_field": "custom_cost_center",
+        "employee_field": "custom_employee",
+    },
+    "Purchase Order": {"date_field": "transaction_date", "supplier_field": "supplier"},
+    "Purchase Invoice": {"date_field": "posting_date", "supplier_field": "supplier"},
+    "Purchase Receipt": {"date_field": "posting_date", "supplier_field": "supplier"},
+    "Supplier Quotation": {"date_field": "transaction_date", "supplier_field": "supplier"},
+    "Request for Quotation": {"date_field": "transaction_date"},
+}
+
+TERM_LENGTH = 140
+REBUILD_CHUNK_SIZE = 500
+
+_TERM_FIELDS = [
+    "name", "creation", "modified", "owner", "modified_by",
+    "reference_doctype", "reference_name", "term", "sort_date",
+    "company", "cost_center", "supplier",
+]
+
+
+# ─────────────────────────────────────────────────────────────────
+# TERMS
+# ─────────────────────────────────────────────────────────────────
+
+def _suffix_terms(value):
+    """Every suffix of lower-cased *value*, whitespace-only ones excluded."""
+    value = (value or "").strip().lower()
+    return {value[i:i + TERM_LENGTH] for i in range(len(value)) if not value[i].isspace()}
+
+
+def _document_terms(doc, source, employee_name=None):
+    terms = _suffix_terms(doc.get("name"))
+
+    supplier_field = source.get("supplier_field")
+    if supplier_field:
+        terms |= _suffix_terms(doc.get(supplier_field))
+        terms |= _suffix_terms(doc.get("supplier_name"))
+
+    employee_field = source.get("employee_field")
+    if employee_field:
+        terms |= _suffix_terms(doc.get(employee_field))
+        terms |= _suffix_terms(employee_name)
+
+    return terms
+
+
+def _term_rows(doc, source, employee_name=None):
+    now = frappe.utils.now()
+    user = frappe.session.user
+    cost_center_field = source.get("cost_center_field")
+    supplier_field = source.get("supplier_field")
+
+    return [
+        (
+            frappe.generate_hash(length=10), now, now, user, user,
+            doc.get("doctype"), doc.get("name"), term, doc.get(source["date_field"]),
+            doc.get("company"),
+            doc.get(cost_center_field) if cost_center_field else None,
+            doc.get(supplier_field) if supplier_field else None,
+        )
+        for term in sorted(_document_terms(doc, source, employee_name))
+    ]
+
+
+# ─────────────────────────────────────────────────────────────────
+# INDEX MAINTENANCE (doc_events + rebuild)
+# ─────────────────────────────────────────────────────────────────
+
+def update_search_index(doc, method=None):
+    """on_change / on_trash hook: replace the document's terms."""
+    source = SEARCH_SOURCES.get(doc.doctype)
+    if not source:
+        return
+
+    frappe.db.delete(
+        "Procurement Search Term",
+        {"reference_doctype": doc.doctype, "reference_name": doc.name},
+    )
+    if method == "on_trash" or doc.docstatus == 2:
+        return
+
+    employee_name = None
+    employee_field = source.get("employee_field")
+    if employee_field and doc.get(employee_field):
+        employee_name = frappe.db.get_value("Employee", doc.get(employee_field), "employee_name")
+
+    rows = _term_rows(doc, source, employee_name)
+    if rows:
+        frappe.db.bulk_insert("Procurement Search Term", _TERM_FIELDS, rows)
+
+
+@instrumented()
+def rebuild_search_index(doctypes=None):
+    """Rebuild the index from scratch, one doctype and chunk at a time."""
+    employee_names = None
+
+    for doctype in doctypes or SEARCH_SOURCES:
+        source = SEARCH_SOURCES[doctype]
+        frappe.db.delete("Procurement Search Term", {"reference_doctype": doctype})
+
+        fields = ["name", "company", source["date_field"]]
+        for key in ("cost_center_field", "supplier_field", "employee_field"):
+            if source.get(key):
+                fields.append(source[key])
+        if source.get("supplier_field"):
+            fields.append("supplier_name")
+
+        if source.get("employee_field") and employee_names is None:
+            employee_names = dict(frappe.get_all("Employee", fields=["name", "employee_name"], as_list=True))
+
+        last_name = ""
+        while True:
+            docs = frappe.get_all(
+                doctype,
+                filters={"docstatus": ["!=", 2], "name": [">", last_name]},
+                fields=fields,
+                order_by="name asc",
+                limit=REBUILD_CHUNK_SIZE,
+            )
+            if not docs:
+                break
+
+            rows = []
+            for doc in docs:
+                doc.doctype = doctype
+                employee = doc.get(source["employee_field"]) if source.get("employee_field") else None
+                rows.extend(_term_rows(doc, source, (employee_names or {}).get(employee)))
+            if rows:
+                frappe.db.bulk_insert("Procurement Search Term", _TERM_FIELDS, rows)
+            frappe.db.commit()
+
+            last_name = docs[-1].name
+
+
+# ─────────────────────────────────────────────────────────────────
+# LOOKUP
+# ─────────────────────────────────────────────────────────────────
+
+def search_documents(doctype, txt, fields, company=None, cost_center=None, supplier=None, limit=20):
+    """
+    Typeahead search over one procurement doctype, newest first.
+
+    With *txt* the candidate names come from a prefix match on the search
+    index, which matches *txt* anywhere in a name, supplier or employee;
+    without it the base table is listed directly (both paths use an
+    index). Returns ``frappe.get_all``-style dicts with *fields*.
+    """
+    source = SEARCH_SOURCES[doctype]
+    date_field = source["date_field"]
+    limit = frappe.utils.cint(limit) or 20
+
+    txt = (txt or "").strip().lower()
+    if not txt:
+        filters = {"docstatus": ["!=", 2]}
+        if company:
+            filters["company"] = company
+        if cost_center and source.get("cost_center_field"):
+            filters[source["cost_center_field"]] = cost_center
+        if supplier and source.get("supplier_field"):
+            filters[source["supplier_field"]] = supplier
+        return frappe.get_all(
+            doctype, filters=filters, fields=fields, order_by=f"{date_field} desc", limit=limit
+        )
+
+    conditions = ["reference_doctype = %(doctype)s", "term LIKE %(prefix)s"]
+    values = {
+        "doctype": doctype,
+        "prefix": re.sub(r"([%_\\])", r"\\\1", txt[:TERM_LENGTH]) + "%",
+        "limit": limit,
+    }
+    if company:
+        conditions.append("company = %(company)s")
+        values["company"] = company
+    if cost_center:
+        conditions.append("cost_center = %(cost_center)s")
+        values["cost_center"] = cost_center
+    if supplier:
+        conditions.append("supplier = %(supplier)s")
+        values["supplier"] = supplier
+
+    names = frappe.db.sql_list(
+        f"""
+        SELECT reference_name
+        FROM `tabProcurement Search Term`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY reference_name
+        ORDER BY MAX(sort_date) DESC, reference_name DESC
+        LIMIT %(limit)s
+        """,
+        values,
+    )
+    if not names:
+        return []
+
+    return frappe.get_all(
+        doctype,
+        filters={"name": ["in", names]},
+        fields=fields,
+        order_by=f"{date_field} desc",
+        limit=limit,
+    )
@@ -1,37 +1,120 @@
+import json
+
 import frappe
+from frappe import _
 from datetime import datetime
 
+VENDOR_CODE_PREFIXES = {
+    "DSJ Keep Learning": "DSJ",
+    "Centre for Developmental Education": "CDE",
+    "Vijaybhoomi University": "VU"
+}
+
+MAX_BULK_SUPPLIERS = 5000
+
+
 def set_vendor_code(doc, method):
-    mapping = {
-        "DSJ Keep Learning": "DSJ",
-        "Centre for Developmental Education": "CDE",
-        "Vijaybhoomi University": "VU"
-    }
+    # Codes reserved up front by import_suppliers are kept as-is
+    if doc.flags.vendor_code_reserved:
+        return
+
+    abbr = VENDOR_CODE_PREFIXES.get(doc.custom_company, "GEN")
+    doc.custom_vendor_code = reserve_vendor_codes(abbr, datetime.now().year)[0]
 
-    abbr = mapping.get(doc.custom_company, "GEN")
-    year = datetime.now().year
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Vendor code sequence
+#
+# One `tabSeries` counter per (abbreviation, year), bumped with a single
+# INSERT .. ON DUPLICATE KEY UPDATE .. LAST_INSERT_ID(). The row lock is held
+# until the supplier transaction commits, so concurrent inserts and imports
+# never see the same number, and a rolled back insert gives its number back.
+# ──────────────────────────────────────────────────────────────────────────────
+
+def reserve_vendor_codes(abbr, year, count=1):
+    """Atomically reserve *count* consecutive vendor codes for *abbr* / *year*."""
     prefix = f"{abbr}-{year}-"
+    series = f"custom_app.vendor_code.{prefix}"
 
-    # 🔍 Get last vendor code
-    last = frappe.db.sql("""
-        SELECT custom_vendor_code
-        FROM `tabSupplier`
-        WHERE custom_vendor_code LIKE %s
-        ORDER BY creation DESC
-        LIMIT 1
-    """, (f"{prefix}%",), as_dict=True)
+    seed = 0
+    if not frappe.db.sql("SELECT 1 FROM `tabSeries` WHERE name = %s", series):
+        # First code of the year for this prefix: continue after any codes
+        # issued before the counter existed.
+        seed = frappe.db.sql("""
+            SELECT IFNULL(MAX(CAST(SUBSTRING_INDEX(custom_vendor_code, '-', -1) AS UNSIGNED)), 0)
+            FROM `tabSupplier`
+            WHERE custom_vendor_code LIKE %s
+        """, (f"{prefix}%",))[0][0]
 
-    if last and last[0].custom_vendor_code:
-        last_code = last[0].custom_vendor_code
+    frappe.db.sql("""
+        INSERT INTO `tabSeries` (name, current)
+        VALUES (%(series)s, LAST_INSERT_ID(%(seed)s + %(count)s))
+        ON DUPLICATE KEY UPDATE current = LAST_INSERT_ID(current + %(count)s)
+    """, {"series": series, "seed": seed, "count": count})
+    last_number = frappe.db.sql("SELECT LAST_INSERT_ID()")[0][0]
 
-        try:
-            last_number = int(last_code.split("-")[-1])
-        except:
-            last_number = 0
-    else:
-        last_number = 0
+    return [
+        f"{prefix}{str(number).zfill(4)}"
+        for number in range(last_number - count + 1, last_number + 1)
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bulk supplier import (vendor onboarding / migrations)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@frappe.whitelist(methods=["POST"])
+def import_suppliers(suppliers):
+    """
+    Insert a batch of suppliers, reserving one block of vendor codes per
+    company prefix instead of one counter round-trip per supplier.
 
-    new_number = last_number + 1
+    *suppliers* is a list (or JSON string) of Supplier field dicts.
+    Returns ``{"inserted": [...], "failed": [...]}``.
+    """
+    frappe.has_permission("Supplier", "create", throw=True)
+
+    if isinstance(suppliers, str):
+        suppliers = json.loads(suppliers)
+
+    if not isinstance(suppliers, list):
+        frappe.throw(_("Suppliers must be a list."))
+
+    if len(suppliers) > MAX_BULK_SUPPLIERS:
+        frappe.throw(_("At most {0} suppliers can be imported in one call.").format(MAX_BULK_SUPPLIERS))
+
+    result = {"inserted": [], "failed": []}
+    year = datetime.now().year
+    by_abbr = {}
+    for idx, row in enumerate(suppliers):
+        if not isinstance(row, dict):
+            result["failed"].append({"idx": idx, "error": _("Each supplier must be an object.")})
+            continue
+
+        abbr = VENDOR_CODE_PREFIXES.get(row.get("custom_company"), "GEN")
+        by_abbr.setdefault(abbr, []).append(idx)
+
+    codes = {}
+    for abbr, indexes in by_abbr.items():
+        codes.update(zip(indexes, reserve_vendor_codes(abbr, year, len(indexes))))
+
+    for idx, row in enumerate(suppliers):
+        if idx not in codes:
+            continue
+
+        # Each supplier in its own savepoint so one bad row does not roll
+        # back the batch (its reserved code is simply left unused).
+        savepoint = f"bulk_supplier_{idx}"
+        frappe.db.savepoint(savepoint)
+        try:
+            doc = frappe.get_doc({**row, "doctype": "Supplier"})
+            doc.custom_vendor_code = codes[idx]
+            doc.flags.vendor_code_reserved = True
+            doc.insert()
+            result["inserted"].append({"idx": idx, "name": doc.name, "vendor_code": doc.custom_vendor_code})
+        except Exception as e:
+            frappe.db.rollback(save_point=savepoint)
+            result["failed"].append({"idx": idx, "error": str(e)})
 
-    doc.custom_vendor_code = f"{prefix}{str(new_number).zfill(4)}"
\ No newline at end of file
+    result["failed"].sort(key=lambda f: f["idx"])
+    return result
@@ -1,7 +1,9 @@
 import frappe
+from frappe.utils import flt
 
 ORDER_STATUS_FIELD = "custom_order_status"
 QTY_ORDERED_FIELD = "custom_qty_ordered"
+RECONCILE_CHUNK_SIZE = 500
 
 
 def update_item_cost_center(doc, method):
@@ -25,6 +27,9 @@ def update_item_cost_center(doc, method):
 # subtract it. After each change the parent Supplier Quotation's
 # `custom_order_status` select is recomputed (Not / Partially / Completely
 # Ordered) so it always reflects reality without manual entry.
+#
+# A weekly `reconcile_ordered_qty` job rebuilds the ledger from submitted
+# POs so any historical drift is corrected.
 # ─────────────────────────────────────────────────────────────────
 
 def update_ordered_qty_on_po_submit(doc, method):
@@ -38,6 +43,9 @@ def update_ordered_qty_on_po_cancel(doc, method):
 
 
 def _apply_po_ordered_qty(po, sign):
+    # Collapse the PO into one delta per Supplier Quotation Item -- a PO can
+    # carry several rows against the same quotation row.
+    deltas = {}
     affected_sqs = set()
 
     for item in po.items:
@@ -46,40 +54,137 @@ def _apply_po_ordered_qty(po, sign):
         if not sq_item or not sq_name:
             continue
 
-        current = frappe.db.get_value("Supplier Quotation Item", sq_item, QTY_ORDERED_FIELD) or 0
-        new_val = current + sign * (item.qty or 0)
-        if new_val < 0:
-            new_val = 0  # never let rounding / out-of-order cancels drive it negative
+        deltas[sq_item] = deltas.get(sq_item, 0) + sign * flt(item.qty)
+        affected_sqs.add(sq_name)
+
+    if not deltas:
+        return
+
+    # Single atomic UPDATE for the whole PO: the increment happens inside the
+    # database, so concurrent PO submits against the same quotation can no
+    # longer lose each other's read-modify-write. GREATEST(0, ...) keeps
+    # rounding / out-of-order cancels from driving it negative.
+    case_sql = " ".join(["WHEN %s THEN %s"] * len(deltas))
+    values = []
+    for sq_item, delta in deltas.items():
+        values.extend([sq_item, delta])
+
+    frappe.db.sql(
+        f"""
+        UPDATE `tabSupplier Quotation Item`
+        SET    `{QTY_ORDERED_FIELD}` = GREATEST(
+                   0, IFNULL(`{QTY_ORDERED_FIELD}`, 0) + (CASE name {case_sql} ELSE 0 END)
+               )
+        WHERE  name IN %s
+        """,
+        (*values, tuple(deltas)),
+    )
+
+    _recompute_order_status(affected_sqs)
+
+
+def _recompute_order_status(sq_names):
+    """
+    Recompute `custom_order_status` for every Supplier Quotation in
+    *sq_names* from one grouped query over their items, then write the
+    result back with one UPDATE per distinct status.
+    """
+    sq_names = list(set(sq_names or []))
+    if not sq_names:
+        return
 
-        frappe.db.set_value(
-            "Supplier Quotation Item", sq_item, QTY_ORDERED_FIELD, new_val,
-            update_modified=False,
+    rows = frappe.db.sql(
+        f"""
+        SELECT parent,
+               COUNT(*)                                        AS item_count,
+               SUM(IFNULL(`{QTY_ORDERED_FIELD}`, 0))           AS total_ordered,
+               SUM(CASE WHEN IFNULL(`{QTY_ORDERED_FIELD}`, 0) >= IFNULL(qty, 0)
+                        THEN 1 ELSE 0 END)                     AS fully_ordered
+        FROM   `tabSupplier Quotation Item`
+        WHERE  parent IN %s
+          AND  parenttype = 'Supplier Quotation'
+        GROUP BY parent
+        """,
+        (tuple(sq_names),),
+        as_dict=True,
+    )
+    summary = {r.parent: r for r in rows}
+
+    by_status = {}
+    for sq_name in sq_names:
+        by_status.setdefault(_order_status(summary.get(sq_name)), []).append(sq_name)
+
+    for status, names in by_status.items():
+        frappe.db.sql(
+            f"""
+            UPDATE `tabSupplier Quotation`
+            SET    `{ORDER_STATUS_FIELD}` = %s
+            WHERE  name IN %s
+            """,
+            (status, tuple(names)),
         )
-        affected_sqs.add(sq_name)
 
-    for sq_name in affected_sqs:
-        _recompute_order_status(sq_name)
+
+def _order_status(summary):
+    if not summary or not summary.item_count or flt(summary.total_ordered) <= 0:
+        return "Not Ordered"
+    if summary.fully_ordered == summary.item_count:
+        return "Completely Ordered"
+    return "Partially Ordered"
 
 
-def _recompute_order_status(sq_name):
-    items = frappe.get_all(
-        "Supplier Quotation Item",
-        filters={"parent": sq_name},
-        fields=["qty", QTY_ORDERED_FIELD],
+def reconcile_ordered_qty():
+    """
+    Scheduled job: rebuild `custom_qty_ordered` from submitted Purchase
+    Orders and fix any quotation rows that have drifted (e.g. from updates
+    lost before the ordered qty was maintained atomically). Only rows whose
+    stored value differs are touched, so a clean ledger is a no-op.
+    """
+    drifted = frappe.db.sql(
+        f"""
+        SELECT sqi.name, sqi.parent, IFNULL(po_qty.qty, 0) AS expected
+        FROM   `tabSupplier Quotation Item` sqi
+        LEFT JOIN (
+            SELECT   poi.supplier_quotation_item, SUM(poi.qty) AS qty
+            FROM     `tabPurchase Order Item` poi
+            JOIN     `tabPurchase Order` po ON po.name = poi.parent
+            WHERE    po.docstatus = 1
+              AND    IFNULL(poi.supplier_quotation_item, '') != ''
+            GROUP BY poi.supplier_quotation_item
+        ) po_qty ON po_qty.supplier_quotation_item = sqi.name
+        WHERE  sqi.parenttype = 'Supplier Quotation'
+          AND  ABS(IFNULL(sqi.`{QTY_ORDERED_FIELD}`, 0) - IFNULL(po_qty.qty, 0)) > 0.000001
+        """,
+        as_dict=True,
     )
 
-    total_ordered = sum((i.get(QTY_ORDERED_FIELD) or 0) for i in items)
+    if not drifted:
+        return
+
+    for start in range(0, len(drifted), RECONCILE_CHUNK_SIZE):
+        chunk = drifted[start:start + RECONCILE_CHUNK_SIZE]
+        case_sql = " ".join(["WHEN %s THEN %s"] * len(chunk))
+        values = []
+        for row in chunk:
+            values.extend([row.name, row.expected])
+
+        frappe.db.sql(
+            f"""
+            UPDATE `tabSupplier Quotation Item`
+            SET    `{QTY_ORDERED_FIELD}` = CASE name {case_sql} END
+            WHERE  name IN %s
+            """,
+            (*values, tuple(row.name for row in chunk)),
+        )
 
-    if not items or total_ordered <= 0:
-        status = "Not Ordered"
-    elif all((i.get(QTY_ORDERED_FIELD) or 0) >= (i.get("qty") or 0) for i in items):
-        status = "Completely Ordered"
-    else:
-        status = "Partially Ordered"
+    affected_sqs = list({row.parent for row in drifted})
+    for start in range(0, len(affected_sqs), RECONCILE_CHUNK_SIZE):
+        _recompute_order_status(affected_sqs[start:start + RECONCILE_CHUNK_SIZE])
 
-    frappe.db.set_value(
-        "Supplier Quotation", sq_name, ORDER_STATUS_FIELD, status,
-        update_modified=False,
+    frappe.db.commit()
+    frappe.logger().info(
+        f"[ordered qty] Reconciled {len(drifted)} Supplier Quotation Item(s) "
+        f"across {len(affected_sqs)} quotation(s)"
     )
 
 def set_default_order_status(doc, method):
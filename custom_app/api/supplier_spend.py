@@ -0,0 +1,237 @@
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, get_first_day, get_last_day, getdate
+
+from custom_app.utils.perf import instrumented
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Supplier Spend Month -- one row per (company, supplier, posting month) of
+# submitted Purchase Invoices: invoiced (grand total), paid, outstanding and
+# invoice count. Rows are keyed by a hash of (company, supplier, month) so a
+# cell can be upserted without a lookup.
+#
+# Purchase Invoice, Payment Entry and Journal Entry submit / cancel (and
+# reconciliation updates of submitted payments) re-aggregate just the cells
+# they touch from the invoices themselves, so returns, partial payments and
+# cancellations all stay exact. Anything that moves an invoice's outstanding
+# without touching those documents (e.g. unreconciling) is picked up by the
+# nightly rebuild_supplier_spend, which recreates the table in one
+# INSERT .. SELECT:
+#
+#     bench --site <site> execute custom_app.api.supplier_spend.rebuild_supplier_spend
+# ──────────────────────────────────────────────────────────────────────────────
+
+_CELL_AGGREGATE = """
+    SELECT
+        pi.company,
+        pi.supplier,
+        MAX(pi.supplier_name)                      AS supplier_name,
+        DATE_FORMAT(pi.posting_date, '%%Y-%%m-01') AS month,
+        SUM(pi.grand_total)                        AS invoiced,
+        SUM(pi.grand_total - pi.outstanding_amount) AS paid,
+        SUM(pi.outstanding_amount)                 AS outstanding,
+        COUNT(pi.name)                             AS invoice_count
+    FROM `tabPurchase Invoice` pi
+    WHERE pi.docstatus = 1 {conditions}
+    GROUP BY pi.company, pi.supplier, DATE_FORMAT(pi.posting_date, '%%Y-%%m-01')
+"""
+
+
+def cell_name(company, supplier, month):
+    return hashlib.md5(f"{company}::{supplier}::{getdate(month)}".encode()).hexdigest()
+
+
+def refresh_supplier_spend(cells):
+    """Re-aggregate the given ``(company, supplier, month_start)`` cells."""
+    now = frappe.utils.now()
+    user = frappe.session.user
+
+    for company, supplier, month in cells:
+        month = get_first_day(month)
+        rows = frappe.db.sql(
+            _CELL_AGGREGATE.format(conditions="""
+                AND pi.company = %(company)s
+                AND pi.supplier = %(supplier)s
+                AND pi.posting_date BETWEEN %(month_start)s AND %(month_end)s
+            """),
+            {"company": company, "supplier": supplier, "month_start": month, "month_end": get_last_day(month)},
+            as_dict=True,
+        )
+        name = cell_name(company, supplier, month)
+
+        if not rows:
+            frappe.db.delete("Supplier Spend Month", {"name": name})
+            continue
+
+        r = rows[0]
+        frappe.db.sql(
+            """
+            INSERT INTO `tabSupplier Spend Month`
+                (name, creation, modified, owner, modified_by, docstatus, idx,
+                 company, supplier, supplier_name, month, invoiced, paid, outstanding, invoice_count)
+            VALUES
+                (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                 %(company)s, %(supplier)s, %(supplier_name)s, %(month)s,
+                 %(invoiced)s, %(paid)s, %(outstanding)s, %(invoice_count)s)
+            ON DUPLICATE KEY UPDATE
+                modified = VALUES(modified), modified_by = VALUES(modified_by),
+                supplier_name = VALUES(supplier_name), invoiced = VALUES(invoiced),
+                paid = VALUES(paid), outstanding = VALUES(outstanding),
+                invoice_count = VALUES(invoice_count)
+            """,
+            {**r, "name": name, "now": now, "user": user, "month": month},
+        )
+
+
+def update_spend_on_purchase_invoice(doc, method=None):
+    """doc_event: Purchase Invoice on_submit / on_cancel."""
+    cells = {(doc.company, doc.supplier, get_first_day(doc.posting_date))}
+
+    # A debit note also changes the outstanding of the invoice it returns against
+    if doc.get("return_against"):
+        original = frappe.db.get_value(
+            "Purchase Invoice", doc.return_against, ["company", "supplier", "posting_date"], as_dict=True
+        )
+        if original:
+            cells.add((original.company, original.supplier, get_first_day(original.posting_date)))
+
+    refresh_supplier_spend(cells)
+
+
+def update_spend_on_payment_entry(doc, method=None):
+    """
+    doc_event: Payment Entry on_submit / on_cancel / on_update_after_submit
+    (Payment Reconciliation re-allocates references on submitted entries).
+    """
+    if doc.party_type != "Supplier":
+        return
+
+    _refresh_invoice_cells({
+        ref.reference_name
+        for ref in doc.get("references") or []
+        if ref.reference_doctype == "Purchase Invoice" and ref.reference_name
+    })
+
+
+def update_spend_on_journal_entry(doc, method=None):
+    """doc_event: Journal Entry on_submit / on_cancel / on_update_after_submit."""
+    _refresh_invoice_cells({
+        row.reference_name
+        for row in doc.get("accounts") or []
+        if row.party_type == "Supplier" and row.reference_type == "Purchase Invoice" and row.reference_name
+    })
+
+
+def _refresh_invoice_cells(invoices):
+    """Refresh the cells of the given Purchase Invoices."""
+    if not invoices:
+        return
+
+    refresh_supplier_spend({
+        (r.company, r.supplier, get_first_day(r.posting_date))
+        for r in frappe.get_all(
+            "Purchase Invoice",
+            filters={"name": ["in", list(invoices)]},
+            fields=["company", "supplier", "posting_date"],
+        )
+    })
+
+
+@frappe.whitelist()
+def enqueue_supplier_spend_rebuild():
+    frappe.only_for("System Manager")
+
+    frappe.enqueue(
+        "custom_app.api.supplier_spend.rebuild_supplier_spend",
+        queue="long",
+        timeout=3600,
+        job_id="custom_app:rebuild_supplier_spend",
+        deduplicate=True,
+    )
+    return _("Supplier spend rebuild has been queued.")
+
+
+@instrumented()
+def rebuild_supplier_spend():
+    """Recreate every Supplier Spend Month row from submitted Purchase Invoices."""
+    now = frappe.utils.now()
+    user = frappe.session.user
+
+    frappe.db.delete("Supplier Spend Month")
+    frappe.db.sql(
+        f"""
+        INSERT INTO `tabSupplier Spend Month`
+            (name, creation, modified, owner, modified_by, docstatus, idx,
+             company, supplier, supplier_name, month, invoiced, paid, outstanding, invoice_count)
+        SELECT
+            MD5(CONCAT_WS('::', cell.company, cell.supplier, cell.month)),
+            %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+            cell.company, cell.supplier, cell.supplier_name, cell.month,
+            cell.invoiced, cell.paid, cell.outstanding, cell.invoice_count
+        FROM ({_CELL_AGGREGATE.format(conditions="")}) cell
+        """,
+        {"now": now, "user": user},
+    )
+    frappe.db.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Reads
+# ──────────────────────────────────────────────────────────────────────────────
+
+def get_supplier_spend(date_from, date_to, co_where="", co_args=None):
+    """
+    Spend per supplier for *date_from* .. *date_to* as
+    ``[{supplier, supplier_name, total_spend, invoice_count}]``, largest first.
+
+    Whole months are read from Supplier Spend Month; partial months at either
+    end of the range fall back to the invoices of just those days. *co_where*
+    is a `` AND ssm.company ...`` snippet from the finance dashboard.
+    """
+    date_from, date_to = getdate(date_from), getdate(date_to)
+    args = {**(co_args or {})}
+    totals = {}
+
+    def add(rows):
+        for r in rows:
+            entry = totals.setdefault(
+                r.supplier,
+                {"supplier": r.supplier, "supplier_name": r.supplier_name, "total_spend": 0, "invoice_count": 0},
+            )
+            entry["total_spend"] += r.total_spend or 0
+            entry["invoice_count"] += r.invoice_count or 0
+            entry["supplier_name"] = entry["supplier_name"] or r.supplier_name
+
+    full_from = date_from if date_from.day == 1 else add_days(get_last_day(date_from), 1)
+    full_to = date_to if date_to == get_last_day(date_to) else add_days(get_first_day(date_to), -1)
+
+    if full_from <= full_to:
+        add(frappe.db.sql(f"""
+            SELECT ssm.supplier, MAX(ssm.supplier_name) AS supplier_name,
+                   SUM(ssm.invoiced) AS total_spend, SUM(ssm.invoice_count) AS invoice_count
+            FROM `tabSupplier Spend Month` ssm
+            WHERE ssm.month BETWEEN %(full_from)s AND %(full_to)s {co_where}
+            GROUP BY ssm.supplier
+        """, {**args, "full_from": full_from, "full_to": full_to}, as_dict=True))
+        edges = []
+        if date_from < full_from:
+            edges.append((date_from, add_days(full_from, -1)))
+        if full_to < date_to:
+            edges.append((add_days(full_to, 1), date_to))
+    else:
+        edges = [(date_from, date_to)]
+
+    pi_where = co_where.replace("ssm.", "pi.")
+    for edge_from, edge_to in edges:
+        add(frappe.db.sql(f"""
+            SELECT pi.supplier, MAX(pi.supplier_name) AS supplier_name,
+                   SUM(pi.grand_total) AS total_spend, COUNT(pi.name) AS invoice_count
+            FROM `tabPurchase Invoice` pi
+            WHERE pi.docstatus = 1
+              AND pi.posting_date BETWEEN %(edge_from)s AND %(edge_to)s {pi_where}
+            GROUP BY pi.supplier
+        """, {**args, "edge_from": edge_from, "edge_to": edge_to}, as_dict=True))
+
+    return sorted(totals.values(), key=lambda r: r["total_spend"], reverse=True)
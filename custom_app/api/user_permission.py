@@ -1,8 +1,12 @@
 import frappe
+from frappe import _
+from custom_app.permissions.permission_scope import clear_permission_scope
+
+PRIVILEGED_ROLE_PROFILES = ["HR", "Admin"]
+EMAIL_ACCOUNT_SCOPE = "Email Account"
 
-def manage_user_permissions(doc, method):
-    role_profile = doc.role_profile_name
 
+def manage_user_permissions(doc, method):
     # Find linked Employee record
     employee = frappe.db.get_value(
         "Employee",
@@ -11,71 +15,194 @@ def manage_user_permissions(doc, method):
         as_dict=True
     )
 
-    # -------------------------------
-    # CASE 1: Employee / Blank / Any non-HR/Admin role
-    # -------------------------------
-    if role_profile not in ["HR", "Admin"]:
+    if doc.role_profile_name not in PRIVILEGED_ROLE_PROFILES and not employee:
+        frappe.logger().info(f"No Employee record found for user {doc.name}")
+        return
+
+    existing = frappe.get_all(
+        "User Permission",
+        filters={"user": doc.name, "allow": ["in", ["Employee", "Company"]]},
+        fields=["name", "allow", "for_value", "applicable_for"],
+    )
+
+    to_insert, to_delete = get_user_permission_diff(
+        doc.name,
+        doc.role_profile_name,
+        employee,
+        frappe.get_all("Company", pluck="name"),
+        existing,
+    )
+    apply_user_permission_diff(to_insert, to_delete, {doc.name})
+
+
+def get_user_permission_diff(user, role_profile, employee, all_companies, existing):
+    """
+    Compare the desired Employee / Company permissions of *user* with the
+    *existing* ones and return ``(to_insert, to_delete)``.
+
+    * Employee / blank / any non-HR/Admin profile: an Employee permission for
+      the linked employee, and no Company permission other than the
+      employee's own company.
+    * HR / Admin profile: no Employee permission, plus an Email Account
+      scoped Company permission for every company except the employee's own
+      (existing Company permissions are never removed).
+    """
+    to_insert = []
+    to_delete = []
+
+    if role_profile not in PRIVILEGED_ROLE_PROFILES:
         if not employee:
-            frappe.logger().info(f"No Employee record found for user {doc.name}")
-            return
+            return to_insert, to_delete
 
-        # ✅ Ensure Employee permission exists
-        existing = frappe.db.exists(
-            "User Permission",
-            {"user": doc.name, "allow": "Employee", "for_value": employee.name}
+        has_employee_perm = any(
+            p.allow == "Employee" and p.for_value == employee.name for p in existing
         )
-        if not existing:
-            perm = frappe.get_doc({
-                "doctype": "User Permission",
-                "user": doc.name,
+        if not has_employee_perm:
+            to_insert.append({
+                "user": user,
                 "allow": "Employee",
                 "for_value": employee.name,
-                "apply_to_all_doctypes": 1
+                "apply_to_all_doctypes": 1,
+                "applicable_for": None,
             })
-            perm.insert(ignore_permissions=True)
 
-        # 🗑️ Remove all company permissions except the employee’s own company
-        existing_company_perms = frappe.get_all(
-            "User Permission",
-            filters={"user": doc.name, "allow": "Company"},
-            pluck="name"
+        # Remove all company permissions except the employee's own company
+        to_delete.extend(
+            p.name for p in existing
+            if p.allow == "Company" and p.for_value != employee.company
+        )
+
+    else:
+        # Remove Employee permission if exists
+        to_delete.extend(p.name for p in existing if p.allow == "Employee")
+
+        # Add missing Company permissions (don't remove existing)
+        own_company = employee.company if employee else None
+        scoped = {
+            p.for_value for p in existing
+            if p.allow == "Company" and p.applicable_for == EMAIL_ACCOUNT_SCOPE
+        }
+        to_insert.extend(
+            {
+                "user": user,
+                "allow": "Company",
+                "for_value": company,
+                "apply_to_all_doctypes": 0,
+                "applicable_for": EMAIL_ACCOUNT_SCOPE,
+            }
+            for company in all_companies
+            if company != own_company and company not in scoped
         )
 
-        for perm_name in existing_company_perms:
-            perm_company = frappe.db.get_value("User Permission", perm_name, "for_value")
-            if perm_company != employee.company:
-                frappe.delete_doc("User Permission", perm_name, ignore_permissions=True)
-
-    # -------------------------------
-    # CASE 2: HR / Admin Role Profile
-    # -------------------------------
-    elif role_profile in ["HR", "Admin"]:
-        # 🗑️ Remove Employee permission if exists
-        frappe.db.delete("User Permission", {"user": doc.name, "allow": "Employee"})
-
-        # ✅ Get all companies except employee’s company
-        all_companies = frappe.get_all("Company", pluck="name")
-        if employee and employee.company in all_companies:
-            all_companies.remove(employee.company)
-
-        # ✅ Add missing Company permissions (don’t remove existing)
-        for company_name in all_companies:
-            exists = frappe.db.exists(
-                "User Permission",
-                {
-                    "user": doc.name,
-                    "allow": "Company",
-                    "for_value": company_name,
-                    "applicable_for": "Email Account"
-                }
+    return to_insert, to_delete
+
+
+def apply_user_permission_diff(to_insert, to_delete, users):
+    """Apply a permission diff with one bulk DELETE and one bulk INSERT."""
+    if not to_insert and not to_delete:
+        return
+
+    if to_delete:
+        frappe.db.delete("User Permission", {"name": ["in", to_delete]})
+
+    if to_insert:
+        now = frappe.utils.now()
+        session_user = frappe.session.user
+        fields = [
+            "name", "creation", "modified", "owner", "modified_by", "docstatus",
+            "user", "allow", "for_value", "apply_to_all_doctypes", "applicable_for",
+            "is_default", "hide_descendants",
+        ]
+        values = [
+            (
+                frappe.generate_hash(length=10), now, now, session_user, session_user, 0,
+                p["user"], p["allow"], p["for_value"], p["apply_to_all_doctypes"], p["applicable_for"],
+                0, 0,
             )
-            if not exists:
-                perm = frappe.get_doc({
-                    "doctype": "User Permission",
-                    "user": doc.name,
-                    "allow": "Company",
-                    "for_value": company_name,
-                    "apply_to_all_doctypes": 0,
-                    "applicable_for": "Email Account"
-                })
-                perm.insert(ignore_permissions=True)
\ No newline at end of file
+            for p in to_insert
+        ]
+        frappe.db.bulk_insert("User Permission", fields, values)
+
+    # Bulk writes bypass UserPermission.on_update / on_trash, so clear the
+    # same per-user cache they would have.
+    for user in users:
+        frappe.cache().hdel("user_permissions", user)
+        clear_permission_scope(user)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# One-shot resync (e.g. after a new Company is added)
+# ──────────────────────────────────────────────────────────────────────────────
+
+@frappe.whitelist()
+def resync_all_user_permissions():
+    """Enqueue a resync of Employee / Company permissions for every user."""
+    frappe.only_for("System Manager")
+
+    frappe.enqueue(
+        "custom_app.api.user_permission.sync_all_user_permissions",
+        queue="long",
+        timeout=3600,
+        job_id="custom_app:resync_all_user_permissions",
+        deduplicate=True,
+    )
+    return _("User Permission resync has been queued.")
+
+
+def sync_all_user_permissions():
+    """
+    Reconcile Employee / Company permissions for all enabled users using a
+    fixed number of queries: users, employees, companies and existing
+    permissions are each prefetched once, and the combined diff is applied
+    in bulk.
+    """
+    users = frappe.get_all(
+        "User",
+        filters={"enabled": 1, "name": ["not in", ["Administrator", "Guest"]]},
+        fields=["name", "role_profile_name"],
+    )
+    if not users:
+        return
+
+    employees = {
+        e.user_id: e
+        for e in frappe.get_all(
+            "Employee",
+            filters={"user_id": ["is", "set"]},
+            fields=["name", "company", "user_id"],
+            order_by="creation asc",
+        )
+    }
+    all_companies = frappe.get_all("Company", pluck="name")
+
+    existing_by_user = {}
+    for perm in frappe.get_all(
+        "User Permission",
+        filters={"allow": ["in", ["Employee", "Company"]]},
+        fields=["name", "user", "allow", "for_value", "applicable_for"],
+    ):
+        existing_by_user.setdefault(perm.user, []).append(perm)
+
+    to_insert = []
+    to_delete = []
+    changed_users = set()
+    for user in users:
+        inserts, deletes = get_user_permission_diff(
+            user.name,
+            user.role_profile_name,
+            employees.get(user.name),
+            all_companies,
+            existing_by_user.get(user.name, []),
+        )
+        if inserts or deletes:
+            to_insert.extend(inserts)
+            to_delete.extend(deletes)
+            changed_users.add(user.name)
+
+    apply_user_permission_diff(to_insert, to_delete, changed_users)
+    frappe.db.commit()
+
+    frappe.logger().info(
+        f"[user permissions] Resynced {len(changed_users)} user(s): "
+        f"+{len(to_insert)} / -{len(to_delete)} permission(s)"
+    )
@@ -0,0 +1,418 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+
+import frappe
+from frappe.utils import cint, getdate, now
+
+from custom_app import hooks
+from custom_app.api.paysquare_payslip_import_utils import BATCH_COMBINED, process_zip_file
+from custom_app.benchmarks.synthetic_data import (
+    BENCH_PREFIX,
+    SCALES,
+    ensure_test_site,
+    generate_dataset,
+    get_dataset_context,
+)
+from custom_app.custom_app.doctype.attendance_excel_generator.attendance_excel_generator import generate_excel
+from custom_app.custom_app.page.asset_dashboard import asset_dashboard
+from custom_app.custom_app.page.finance_dashboard import finance_dashboard
+from custom_app.custom_app.page.hr_dashboard import hr_dashboard
+from custom_app.custom_app.page.purchase_timeline import purchase_timeline
+from custom_app.utils.perf import PerfRecorder, percentile
+
+try:
+    # Needed to write the encrypted payslip zip; declared in pyproject
+    import pyzipper
+except ImportError:
+    pyzipper = None
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Benchmark suite for custom_app hot paths
+#
+# Generates (or reuses) the seeded synthetic dataset, runs every case
+# `warmup + repeat` times through PerfRecorder and writes wall time and SQL
+# statistics as JSON, so two runs can be compared with compare():
+#
+#     bench --site <test-site> execute custom_app.benchmarks.suite.run --kwargs "{'scale': 'medium'}"
+#     bench --site <test-site> execute custom_app.benchmarks.suite.compare \
+#         --kwargs "{'baseline': '/path/a.json', 'current': '/path/b.json'}"
+#
+# Caches are left warm between iterations, as they are in production.
+# Doc-event hooks run inside a savepoint that is rolled back after each call.
+# ──────────────────────────────────────────────────────────────────────────────
+
+# doc_events run here; notification hooks (after_insert / on_update) would send mail
+BENCHMARKED_EVENTS = ("before_insert", "before_save", "validate", "on_submit", "on_cancel", "on_change")
+
+ASSET_ENDPOINTS = [
+    "get_kpi_summary", "get_assets_by_category", "get_assets_by_company", "get_assets_by_status",
+    "get_assets_by_location", "get_monthly_trend", "get_assets_by_department", "get_assets_by_item",
+    "get_assets_by_vendor", "get_depreciation_summary", "get_asset_register",
+]
+HR_ENDPOINTS = [
+    "get_attrition_rate", "get_time_to_hire", "get_offer_acceptance", "get_headcount_summary",
+    "get_staffing_vs_actuals", "get_recruitment_pipeline", "get_recent_movements",
+]
+PAYSLIP_PASSWORD = "bench0425"
+
+
+class Case:
+    """One benchmark: *prepare* and *cleanup* run outside the timed section."""
+
+    def __init__(self, group, name, run, prepare=None, cleanup=None):
+        self.group = group
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.cleanup = cleanup
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cases
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _report(report, filters):
+    module = frappe.get_module(f"custom_app.custom_app.report.{report}.{report}")
+    return module.execute(frappe._dict(filters))
+
+
+def get_cases(ctx, zip_path=None):
+    company, fiscal_year = ctx.company, ctx.fiscal_year
+    dates = {"date_from": ctx.date_from, "date_to": ctx.date_to}
+
+    cases = [
+        Case("procurement", "get_procurement_tree (company)",
+             lambda _state: purchase_timeline.get_procurement_tree(company=company, **dates)),
+        Case("procurement", "get_procurement_tree (material_request)",
+             lambda _state: purchase_timeline.get_procurement_tree(material_request=ctx.material_request)),
+        Case("procurement", "get_procurement_tree (purchase_invoice)",
+             lambda _state: purchase_timeline.get_procurement_tree(purchase_invoice=ctx.purchase_invoice)),
+        Case("procurement", "search_material_requests",
+             lambda _state: purchase_timeline.search_material_requests(txt=f"{BENCH_PREFIX}-MR-0001", company=company)),
+        Case("attendance", "generate_excel",
+             lambda _state: generate_excel({
+                 "company": company, "from_date": ctx.attendance_from, "to_date": ctx.attendance_to,
+             })),
+        Case("reports", "Institution Budget Report",
+             lambda _state: _report("institution_budget_report", {"company": company, "fiscal_year": fiscal_year})),
+        Case("reports", "Budget Committed Actual Report",
+             lambda _state: _report("budget_committed_actual_report", {
+                 "company": company, "cost_center": ctx.cost_center, "fiscal_year": fiscal_year,
+             })),
+        Case("reports", "Budget Version History Report",
+             lambda _state: _report("budget_version_history_report", {
+                 "company": company, "cost_center": ctx.cost_center, "fiscal_year": fiscal_year, "all_accounts": 1,
+             })),
+    ]
+
+    # ── Dashboards ───────────────────────────────────────────────────────────
+    for module in (purchase_timeline, finance_dashboard, hr_dashboard):
+        cases.append(Case(
+            "dashboards", f"{module.__name__.rsplit('.', 1)[-1]}.get_filter_options",
+            lambda _state, module=module: module.get_filter_options(),
+        ))
+
+    asset_filters = json.dumps({"company": company})
+    cases.append(Case("dashboards", "asset_dashboard.get_filter_options",
+                      lambda _state: asset_dashboard.get_filter_options()))
+    cases.extend(
+        Case("dashboards", f"asset_dashboard.{method}",
+             lambda _state, method=method: getattr(asset_dashboard, method)(filters=asset_filters))
+        for method in ASSET_ENDPOINTS
+    )
+    cases.extend(
+        Case("dashboards", f"hr_dashboard.{method}",
+             lambda _state, method=method: getattr(hr_dashboard, method)(company=company, **dates))
+        for method in HR_ENDPOINTS
+    )
+    cases.extend([
+        Case("dashboards", "finance_dashboard.get_creditor_ageing",
+             lambda _state: finance_dashboard.get_creditor_ageing(company=company, **dates)),
+        Case("dashboards", "finance_dashboard.get_expense_vs_budget",
+             lambda _state: finance_dashboard.get_expense_vs_budget(company=company, fiscal_year=fiscal_year)),
+        Case("dashboards", "finance_dashboard.get_non_budgeted_payments",
+             lambda _state: finance_dashboard.get_non_budgeted_payments(company=company, fiscal_year=fiscal_year)),
+        Case("dashboards", "finance_dashboard.get_vendor_concentration",
+             lambda _state: finance_dashboard.get_vendor_concentration(company=company, fiscal_year=fiscal_year)),
+        Case("dashboards", "finance_dashboard.get_supplier_spend_trend",
+             lambda _state: finance_dashboard.get_supplier_spend_trend(company=company, fiscal_year=fiscal_year)),
+    ])
+
+    # ── Paysquare import ─────────────────────────────────────────────────────
+    if zip_path:
+        cases.append(Case(
+            "payslips", "process_zip_file (new batch)",
+            lambda _state: process_zip_file(zip_path, BATCH_COMBINED, PAYSLIP_PASSWORD),
+            prepare=_delete_imported_payslips,
+            cleanup=lambda _state: _delete_imported_payslips(),
+        ))
+        cases.append(Case(
+            "payslips", "process_zip_file (unchanged re-run)",
+            lambda _state: process_zip_file(zip_path, BATCH_COMBINED, PAYSLIP_PASSWORD),
+            prepare=lambda: process_zip_file(zip_path, BATCH_COMBINED, PAYSLIP_PASSWORD),
+            cleanup=lambda _state: _delete_imported_payslips(),
+        ))
+
+    # ── Doc-event hooks ──────────────────────────────────────────────────────
+    samples = {
+        "Material Request": ctx.material_request,
+        "Supplier Quotation": ctx.supplier_quotation,
+        "Purchase Order": ctx.purchase_order,
+        "Purchase Invoice": ctx.purchase_invoice,
+    }
+    for doctype, docname in samples.items():
+        if not docname:
+            continue
+        for event, handlers in hooks.doc_events.get(doctype, {}).items():
+            if event not in BENCHMARKED_EVENTS:
+                continue
+            for handler in [handlers] if isinstance(handlers, str) else handlers:
+                cases.append(_doc_event_case(doctype, docname, event, handler))
+
+    return cases
+
+
+def _doc_event_case(doctype, docname, event, handler):
+    savepoint = "custom_app_benchmark"
+
+    def prepare():
+        frappe.db.savepoint(savepoint)
+        return frappe.get_doc(doctype, docname)
+
+    def cleanup(_doc):
+        frappe.db.rollback(save_point=savepoint)
+
+    return Case(
+        "doc_events",
+        f"{doctype}.{event}: {handler.rsplit('.', 1)[-1]}",
+        lambda doc: frappe.get_attr(handler)(doc, event),
+        prepare=prepare,
+        cleanup=cleanup,
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Paysquare zip fixture
+# ──────────────────────────────────────────────────────────────────────────────
+
+def build_payslip_zip(directory, count, seed, period):
+    """
+    AES-encrypted zip of a salary slip and a tax sheet per benchmark
+    employee, named the way Paysquare sends them. Returns its path.
+    """
+    rng = random.Random(seed)
+    employees = frappe.get_all(
+        "Employee",
+        filters={"name": ["like", f"{BENCH_PREFIX}%"], "status": "Active"},
+        pluck="name",
+        order_by="name",
+        limit=count,
+    )
+    month, year = period.strftime("%b"), period.year
+
+    path = os.path.join(directory, f"paysquare_{month}_{year}.zip")
+    with pyzipper.AESZipFile(path, "w", compression=pyzipper.ZIP_DEFLATED, encryption=pyzipper.WZ_AES) as zf:
+        zf.setpassword(PAYSLIP_PASSWORD.encode())
+        for employee in employees:
+            for keyword in ("PaySlip", "TaxSheet"):
+                # A few KB of incompressible payload, like a real rendered PDF
+                body = bytes(rng.getrandbits(8) for _byte in range(rng.randint(20_000, 60_000)))
+                zf.writestr(f"{employee}_{keyword}_{month}_{year}.pdf", b"%PDF-1.4\n" + body + b"\n%%EOF\n")
+    return path
+
+
+def _delete_imported_payslips():
+    for doctype in ("Paysquare Salary Slip", "Paysquare Tax Sheet"):
+        for name in frappe.get_all(doctype, filters={"employee": ["like", f"{BENCH_PREFIX}%"]}, pluck="name"):
+            frappe.delete_doc(doctype, name, force=True, ignore_permissions=True)
+    # Attached files are removed from disk on commit
+    frappe.db.commit()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Runner
+# ──────────────────────────────────────────────────────────────────────────────
+
+def measure(case, repeat=5, warmup=1, trace_memory=False):
+    """Run *case* and summarise its timed iterations."""
+    samples, error = [], None
+
+    def iterate(trace):
+        nonlocal error
+        state = case.prepare() if case.prepare else None
+        recorder = PerfRecorder(case.name, trace_memory=trace).start()
+        result, failed = None, False
+        try:
+            result = case.run(state)
+        except Exception as e:
+            failed = True
+            error = f"{type(e).__name__}: {e}"
+            frappe.clear_messages()
+        finally:
+            sample = recorder.stop(result, error=failed)
+            if case.cleanup:
+                case.cleanup(state)
+        return sample, failed
+
+    for i in range(warmup + repeat):
+        sample, failed = iterate(False)
+        if i >= warmup and sample:
+            samples.append(sample)
+        if failed:
+            break
+
+    peak_kb = None
+    if trace_memory and not error:
+        sample, _failed = iterate(True)
+        peak_kb = sample and sample["peak_kb"]
+
+    wall = sorted(s["wall_ms"] for s in samples)
+    sql_ms = sorted(s["sql_ms"] for s in samples)
+    last = samples[-1] if samples else {}
+    return {
+        "group": case.group,
+        "name": case.name,
+        "runs": len(samples),
+        "min_ms": wall[0] if wall else None,
+        "p50_ms": percentile(wall, 50),
+        "p95_ms": percentile(wall, 95),
+        "max_ms": wall[-1] if wall else None,
+        "mean_ms": round(sum(wall) / len(wall), 2) if wall else None,
+        "sql_count": last.get("sql_count"),
+        "sql_ms_p50": percentile(sql_ms, 50),
+        "rows": last.get("rows"),
+        "peak_kb": peak_kb,
+        "error": error,
+    }
+
+
+def _app_versions():
+    versions = {}
+    for app in frappe.get_installed_apps():
+        try:
+            versions[app] = frappe.get_attr(f"{app}.__version__")
+        except Exception:
+            versions[app] = None
+    return versions
+
+
+def run(scale="small", seed=42, repeat=5, warmup=1, generate=True, only=None, trace_memory=False, output=None):
+    """
+    Run the suite and write the results as JSON. Returns the output path.
+
+    *generate* regenerates the dataset first (pass 0 to reuse the current
+    one); *only* keeps cases whose group or name contains that text;
+    *trace_memory* adds one extra tracemalloc run per case for peak memory.
+    """
+    ensure_test_site()
+    frappe.set_user("Administrator")
+    seed, repeat, warmup = cint(seed), max(cint(repeat), 1), max(cint(warmup), 0)
+
+    ctx = generate_dataset(scale, seed) if cint(generate) else get_dataset_context()
+
+    workdir = tempfile.mkdtemp(prefix="custom_app_benchmark_")
+    try:
+        zip_path = None
+        if pyzipper:
+            zip_path = build_payslip_zip(workdir, SCALES[scale]["payslips"], seed, getdate(ctx.attendance_from))
+
+        cases = get_cases(ctx, zip_path)
+        if only:
+            cases = [c for c in cases if only in c.group or only in c.name]
+
+        started = now()
+        results = []
+        for case in cases:
+            result = measure(case, repeat, warmup, cint(trace_memory))
+            results.append(result)
+            print(_format_result(result))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "site": frappe.local.site,
+            "scale": scale,
+            "seed": seed,
+            "repeat": repeat,
+            "warmup": warmup,
+            "started": started,
+            "finished": now(),
+            "versions": _app_versions(),
+            "dataset": ctx.counts,
+            "skipped": [] if zip_path else ["process_zip_file (pyzipper is not installed)"],
+        },
+        "results": results,
+    }
+
+    if not output:
+        directory = frappe.get_site_path("private", "benchmarks")
+        os.makedirs(directory, exist_ok=True)
+        output = os.path.join(directory, f"custom_app-{scale}-{started.replace(' ', 'T').replace(':', '')[:17]}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=1, default=str)
+
+    print(f"\nResults written to {output}")
+    return output
+
+
+def _format_result(r):
+    if r["error"] and not r["runs"]:
+        return f"{r['name']:<60} ERROR {r['error']}"
+    line = f"{r['name']:<60} p50 {r['p50_ms']:>9.1f} ms  p95 {r['p95_ms']:>9.1f} ms  sql {r['sql_count']:>6}"
+    return f"{line}  ERROR {r['error']}" if r["error"] else line
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Run-over-run comparison
+# ──────────────────────────────────────────────────────────────────────────────
+
+def compare(baseline, current, threshold=10):
+    """
+    Compare two result files case by case. Cases whose p50 got more than
+    *threshold* percent slower, or that issue more SQL, are flagged.
+    """
+    with open(baseline) as f:
+        before = {r["name"]: r for r in json.load(f)["results"]}
+    with open(current) as f:
+        after = {r["name"]: r for r in json.load(f)["results"]}
+
+    rows = []
+    for name, new in after.items():
+        old = before.get(name)
+        if not old or old.get("p50_ms") is None or new.get("p50_ms") is None:
+            rows.append({"name": name, "status": "new" if not old else "error"})
+            continue
+
+        delta_pct = round((new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100, 1) if old["p50_ms"] else 0.0
+        sql_delta = (new.get("sql_count") or 0) - (old.get("sql_count") or 0)
+        if delta_pct > threshold or sql_delta > 0:
+            status = "regressed"
+        elif delta_pct < -threshold or sql_delta < 0:
+            status = "improved"
+        else:
+            status = "unchanged"
+
+        rows.append({
+            "name": name,
+            "status": status,
+            "p50_before": old["p50_ms"],
+            "p50_after": new["p50_ms"],
+            "delta_pct": delta_pct,
+            "sql_before": old.get("sql_count"),
+            "sql_after": new.get("sql_count"),
+        })
+
+    for r in rows:
+        if "delta_pct" in r:
+            print(
+                f"{r['name']:<60} {r['p50_before']:>9.1f} -> {r['p50_after']:>9.1f} ms "
+                f"({r['delta_pct']:+.1f}%)  sql {r['sql_before']} -> {r['sql_after']}  {r['status']}"
+            )
+        else:
+            print(f"{r['name']:<60} {r['status']}")
+
+    return rows
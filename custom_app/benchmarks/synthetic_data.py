@@ -0,0 +1,670 @@
+import random
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, add_months, add_years, get_first_day, getdate
+
+from custom_app.api.procurement_search import rebuild_search_index
+from custom_app.api.supplier_spend import rebuild_supplier_spend
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Seeded synthetic ERP data for the benchmark suite (see suite.py).
+#
+# The same (scale, seed) always produces the same rows, so timings from two
+# runs are comparable. Masters that ERPNext has to build itself (companies
+# with their chart of accounts, cost centers, fiscal year, holiday lists,
+# monthly distributions) are inserted as documents once and reused.
+# Everything else is written with bulk inserts, named with BENCH_PREFIX,
+# and deleted / regenerated on every call to generate_dataset.
+#
+# Only ever run this on a throwaway test site.
+# ──────────────────────────────────────────────────────────────────────────────
+
+BENCH_PREFIX = "BENCH"
+BENCH_COMPANY = "Bench Institute {0}"
+BENCH_ABBR = "BI{0}"
+
+# Start of the benchmark fiscal year (April - March, as the live companies use)
+FISCAL_YEAR_START = "2025-04-01"
+
+SCALES = {
+    "small": {
+        "companies": 2, "cost_centers": 4, "suppliers": 40, "items": 80,
+        "material_requests": 400, "expense_claims": 150, "employees": 150,
+        "attendance_months": 1, "assets": 400, "payslips": 40,
+    },
+    "medium": {
+        "companies": 3, "cost_centers": 8, "suppliers": 200, "items": 300,
+        "material_requests": 3000, "expense_claims": 800, "employees": 800,
+        "attendance_months": 2, "assets": 3000, "payslips": 200,
+    },
+    "large": {
+        "companies": 4, "cost_centers": 15, "suppliers": 600, "items": 1000,
+        "material_requests": 12000, "expense_claims": 3000, "employees": 3000,
+        "attendance_months": 3, "assets": 12000, "payslips": 500,
+    },
+}
+
+# Percentage per calendar month, January .. December
+MONTHLY_DISTRIBUTIONS = {
+    "BENCH Even": [5, 5, 10, 10, 5, 10, 10, 5, 10, 10, 10, 10],
+    "BENCH Front Loaded": [10, 5, 5, 15, 10, 10, 10, 5, 10, 5, 10, 5],
+}
+MONTH_NAMES = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+ASSET_CATEGORIES = ["BENCH Furniture", "BENCH IT Equipment", "BENCH Lab Equipment", "BENCH Vehicles"]
+PUBLIC_HOLIDAYS = ["01-26", "03-14", "04-18", "05-01", "08-15", "10-02", "10-20", "11-05", "12-25"]
+
+# Bulk-inserted doctypes with their child tables, in insert order. Deleted in
+# reverse order by clear_synthetic_data.
+GENERATED_DOCTYPES = [
+    ("Supplier", []),
+    ("Item", []),
+    ("Department", []),
+    ("Location", []),
+    ("Asset Category", []),
+    ("Employee", []),
+    ("Budget", ["Budget Account"]),
+    ("Material Request", ["Material Request Item"]),
+    ("Supplier Quotation", ["Supplier Quotation Item"]),
+    ("Purchase Order", ["Purchase Order Item"]),
+    ("Purchase Invoice", ["Purchase Invoice Item"]),
+    ("Expense Claim", ["Expense Claim Detail"]),
+    ("Attendance", []),
+    ("Asset", []),
+]
+
+
+def ensure_test_site():
+    if not (frappe.conf.get("allow_tests") or frappe.conf.get("custom_app_benchmark_site")):
+        frappe.throw(_(
+            "Synthetic benchmark data can only be generated on a test site "
+            "(set allow_tests or custom_app_benchmark_site in site_config)."
+        ))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Entry point
+# ──────────────────────────────────────────────────────────────────────────────
+
+def generate_dataset(scale="small", seed=42):
+    """
+    (Re)generate the benchmark dataset and return its context (see
+    get_dataset_context). Commits.
+
+        bench --site <test-site> execute custom_app.benchmarks.synthetic_data.generate_dataset --kwargs "{'scale': 'medium'}"
+    """
+    ensure_test_site()
+    if scale not in SCALES:
+        frappe.throw(_("Scale must be one of: {0}").format(", ".join(SCALES)))
+
+    frappe.set_user("Administrator")
+    volume = SCALES[scale]
+    rng = random.Random(seed)
+
+    masters = ensure_masters(volume)
+    clear_synthetic_data()
+
+    generator = DatasetGenerator(rng, volume, masters)
+    generator.generate()
+
+    # Derived tables the dashboards read
+    rebuild_supplier_spend()
+    rebuild_search_index()
+    frappe.db.commit()
+
+    return get_dataset_context()
+
+
+def clear_synthetic_data():
+    """Delete every bulk-inserted BENCH row (masters inserted as documents are kept)."""
+    like = ["like", f"{BENCH_PREFIX}%"]
+    for doctype, child_doctypes in reversed(GENERATED_DOCTYPES):
+        for child in child_doctypes:
+            frappe.db.delete(child, {"parent": like})
+        frappe.db.delete(doctype, {"name": like})
+
+    frappe.db.delete("Procurement Search Term", {"reference_name": like})
+    frappe.db.delete("Supplier Spend Month", {"supplier": like})
+    frappe.db.commit()
+
+
+def get_dataset_context():
+    """Names the benchmark cases need, read back from the generated data."""
+    fiscal_year_start = getdate(FISCAL_YEAR_START)
+    companies = frappe.get_all(
+        "Company", filters={"company_name": ["like", BENCH_COMPANY.format("%")]}, pluck="name", order_by="name"
+    )
+    if not companies:
+        frappe.throw(_("No benchmark data found. Run generate_dataset first."))
+
+    company = companies[0]
+    budget = frappe.db.get_value(
+        "Budget", {"company": company, "name": ["like", f"{BENCH_PREFIX}%"]}, ["cost_center", "fiscal_year"],
+        as_dict=True, order_by="name asc",
+    )
+    account = frappe.db.get_value("Budget Account", {"parent": ["like", f"{BENCH_PREFIX}-BUD-%"]}, "account")
+
+    def first(doctype, filters=None):
+        return frappe.db.get_value(
+            doctype, {"name": ["like", f"{BENCH_PREFIX}%"], "company": company, **(filters or {})},
+            "name", order_by="name asc",
+        )
+
+    counts = {
+        doctype: frappe.db.count(doctype, {"name": ["like", f"{BENCH_PREFIX}%"]})
+        for doctype, _children in GENERATED_DOCTYPES
+    }
+
+    return frappe._dict({
+        "companies": companies,
+        "company": company,
+        "cost_center": budget.cost_center,
+        "fiscal_year": budget.fiscal_year,
+        "account": account,
+        "date_from": str(fiscal_year_start),
+        "date_to": str(add_days(add_years(fiscal_year_start, 1), -1)),
+        "attendance_from": str(fiscal_year_start),
+        "attendance_to": str(add_days(add_months(fiscal_year_start, 1), -1)),
+        "material_request": first("Material Request", {"docstatus": 1}),
+        "supplier_quotation": first("Supplier Quotation"),
+        "purchase_order": first("Purchase Order"),
+        "purchase_invoice": first("Purchase Invoice"),
+        "counts": counts,
+    })
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Masters inserted as documents (idempotent)
+# ──────────────────────────────────────────────────────────────────────────────
+
+def ensure_masters(volume):
+    fiscal_year = _ensure_fiscal_year()
+    for name, weights in MONTHLY_DISTRIBUTIONS.items():
+        _ensure_monthly_distribution(name, weights)
+
+    companies = []
+    for i in range(1, volume["companies"] + 1):
+        company = _ensure_company(i)
+        holiday_list = _ensure_holiday_list(company)
+        companies.append(frappe._dict({
+            "name": company,
+            "abbr": BENCH_ABBR.format(i),
+            "holiday_list": holiday_list,
+            "cost_centers": _ensure_cost_centers(company, BENCH_ABBR.format(i), volume["cost_centers"]),
+            "expense_accounts": frappe.get_all(
+                "Account",
+                filters={"company": company, "root_type": "Expense", "is_group": 0},
+                pluck="name",
+                order_by="name",
+                limit=8,
+            ),
+        }))
+
+    frappe.db.commit()
+    return frappe._dict({
+        "fiscal_year": fiscal_year,
+        "fiscal_year_start": getdate(FISCAL_YEAR_START),
+        "companies": companies,
+    })
+
+
+def _ensure_fiscal_year():
+    start = getdate(FISCAL_YEAR_START)
+    end = add_days(add_years(start, 1), -1)
+    existing = frappe.db.get_value("Fiscal Year", {"year_start_date": start, "year_end_date": end})
+    if existing:
+        return existing
+
+    doc = frappe.get_doc({
+        "doctype": "Fiscal Year",
+        "year": f"{start.year}-{end.year}",
+        "year_start_date": start,
+        "year_end_date": end,
+    })
+    doc.insert()
+    return doc.name
+
+
+def _ensure_monthly_distribution(name, weights):
+    if frappe.db.exists("Monthly Distribution", name):
+        return
+
+    doc = frappe.new_doc("Monthly Distribution")
+    doc.distribution_id = name
+    for month, percentage in zip(MONTH_NAMES, weights):
+        doc.append("percentages", {"month": month, "percentage_allocation": percentage})
+    doc.insert()
+
+
+def _ensure_company(i):
+    name = BENCH_COMPANY.format(i)
+    if not frappe.db.exists("Company", name):
+        frappe.get_doc({
+            "doctype": "Company",
+            "company_name": name,
+            "abbr": BENCH_ABBR.format(i),
+            "default_currency": "INR",
+            "country": "India",
+            "chart_of_accounts": "Standard",
+        }).insert()
+    return name
+
+
+def _ensure_cost_centers(company, abbr, count):
+    root = frappe.db.get_value(
+        "Cost Center", {"company": company, "is_group": 1, "parent_cost_center": ["is", "not set"]}
+    )
+
+    names = []
+    for j in range(1, count + 1):
+        name = f"BENCH Dept {j:02d} - {abbr}"
+        if not frappe.db.exists("Cost Center", name):
+            frappe.get_doc({
+                "doctype": "Cost Center",
+                "cost_center_name": f"BENCH Dept {j:02d}",
+                "parent_cost_center": root,
+                "company": company,
+                "is_group": 0,
+            }).insert()
+        names.append(name)
+    return names
+
+
+def _ensure_holiday_list(company):
+    name = f"BENCH Holidays {company}"
+    if not frappe.db.exists("Holiday List", name):
+        start = getdate(FISCAL_YEAR_START)
+        end = add_days(add_years(start, 1), -1)
+
+        doc = frappe.new_doc("Holiday List")
+        doc.holiday_list_name = name
+        doc.from_date = start
+        doc.to_date = end
+
+        public = {getdate(f"{year}-{md}") for year in (start.year, end.year) for md in PUBLIC_HOLIDAYS}
+        day = start
+        while day <= end:
+            if day.weekday() == 6:
+                doc.append("holidays", {"holiday_date": day, "description": "Sunday", "weekly_off": 1})
+            elif day in public:
+                doc.append("holidays", {"holiday_date": day, "description": "Public Holiday", "weekly_off": 0})
+            day = add_days(day, 1)
+        doc.insert()
+
+    frappe.db.set_value("Company", company, "default_holiday_list", name)
+    return name
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Bulk-inserted rows
+# ──────────────────────────────────────────────────────────────────────────────
+
+def _insert_rows(doctype, rows):
+    """bulk_insert *rows*, keeping only the columns this site's table has."""
+    if not rows:
+        return
+
+    columns = set(frappe.db.get_table_columns(doctype))
+    fields = sorted(columns.intersection({key for row in rows for key in row}))
+    frappe.db.bulk_insert(doctype, fields, [tuple(row.get(f) for f in fields) for row in rows])
+
+
+class DatasetGenerator:
+    def __init__(self, rng, volume, masters):
+        self.rng = rng
+        self.volume = volume
+        self.masters = masters
+        self.fy_start = masters.fiscal_year_start
+        self.fy_days = (add_days(add_years(self.fy_start, 1), -1) - self.fy_start).days + 1
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+
+    def row(self, name, on_date, docstatus=0, **fields):
+        timestamp = f"{getdate(on_date)} 10:00:00"
+        return {
+            "name": name,
+            "creation": timestamp,
+            "modified": timestamp,
+            "owner": "Administrator",
+            "modified_by": "Administrator",
+            "docstatus": docstatus,
+            "idx": 0,
+            **fields,
+        }
+
+    def child(self, parent, parenttype, idx, on_date, docstatus, parentfield="items", **fields):
+        return self.row(
+            f"{parent}-{idx}", on_date, docstatus,
+            parent=parent, parenttype=parenttype, parentfield=parentfield, idx=idx, **fields,
+        )
+
+    def fy_date(self):
+        return add_days(self.fy_start, self.rng.randrange(self.fy_days))
+
+    def amount(self, low, high):
+        return round(self.rng.uniform(low, high), 2)
+
+    # ── generation ───────────────────────────────────────────────────────────
+
+    def generate(self):
+        self.generate_parties()
+        self.generate_employees()
+        self.generate_budgets()
+        self.generate_procurement()
+        self.generate_expense_claims()
+        self.generate_attendance()
+        self.generate_assets()
+
+    def generate_parties(self):
+        rng, volume = self.rng, self.volume
+        self.suppliers = [f"{BENCH_PREFIX}-SUP-{i:04d}" for i in range(1, volume["suppliers"] + 1)]
+        self.items = [f"{BENCH_PREFIX}-ITEM-{i:04d}" for i in range(1, volume["items"] + 1)]
+        self.item_rates = {item: self.amount(50, 50000) for item in self.items}
+
+        _insert_rows("Supplier", [
+            self.row(
+                name, self.fy_start, supplier_name=f"Bench Supplier {i}", supplier_group="All Supplier Groups",
+                supplier_type="Company", country="India",
+                custom_company=rng.choice(self.masters.companies).name,
+            )
+            for i, name in enumerate(self.suppliers, 1)
+        ])
+        _insert_rows("Item", [
+            self.row(
+                name, self.fy_start, item_code=name, item_name=f"Bench Item {i}", item_group="All Item Groups",
+                stock_uom="Nos", is_stock_item=0, is_purchase_item=1, include_item_in_manufacturing=0,
+            )
+            for i, name in enumerate(self.items, 1)
+        ])
+
+        self.departments = {}
+        departments, locations = [], []
+        for company in self.masters.companies:
+            self.departments[company.name] = []
+            for j in range(1, len(company.cost_centers) + 1):
+                name = f"{BENCH_PREFIX} Dept {j:02d} - {company.abbr}"
+                self.departments[company.name].append(name)
+                departments.append(self.row(
+                    name, self.fy_start, department_name=f"{BENCH_PREFIX} Dept {j:02d}",
+                    company=company.name, parent_department="All Departments", is_group=0,
+                ))
+            locations.append(self.row(
+                f"{BENCH_PREFIX} Campus {company.abbr}", self.fy_start,
+                location_name=f"{BENCH_PREFIX} Campus {company.abbr}", is_group=0,
+            ))
+        _insert_rows("Department", departments)
+        _insert_rows("Location", locations)
+        _insert_rows("Asset Category", [
+            self.row(name, self.fy_start, asset_category_name=name) for name in ASSET_CATEGORIES
+        ])
+
+    def generate_employees(self):
+        rng = self.rng
+        self.employees = []
+        rows = []
+        for i in range(1, self.volume["employees"] + 1):
+            # Alphanumeric only: Paysquare file names carry the Employee ID
+            name = f"{BENCH_PREFIX}EMP{i:05d}"
+            company = rng.choice(self.masters.companies)
+            joined = add_days(self.fy_start, -rng.randrange(6 * 365))
+            left = rng.random() < 0.15
+            relieving_date = add_days(joined, rng.randrange(60, 6 * 365)) if left else None
+            if relieving_date and relieving_date > add_years(self.fy_start, 1):
+                relieving_date, left = None, False
+
+            emp = frappe._dict({
+                "name": name,
+                "company": company.name,
+                "department": rng.choice(self.departments[company.name]),
+                "holiday_list": company.holiday_list,
+                "date_of_joining": joined,
+                "relieving_date": relieving_date,
+                "status": "Left" if left else "Active",
+            })
+            self.employees.append(emp)
+            rows.append(self.row(
+                name, joined, employee=name, first_name=f"Bench Employee {i}",
+                employee_name=f"Bench Employee {i}", gender=rng.choice(["Male", "Female"]),
+                date_of_birth=add_days(joined, -rng.randrange(22 * 365, 50 * 365)),
+                custom_type=rng.choice(["Teaching", "Non-Teaching"]),
+                **{k: v for k, v in emp.items() if k != "name"},
+            ))
+        _insert_rows("Employee", rows)
+
+    def generate_budgets(self):
+        rng = self.rng
+        budgets, accounts = [], []
+        for company in self.masters.companies:
+            for j, cost_center in enumerate(company.cost_centers, 1):
+                name = f"{BENCH_PREFIX}-BUD-{company.abbr}-{j:02d}"
+                budgets.append(self.row(
+                    name, self.fy_start, 1, budget_against="Cost Center", cost_center=cost_center,
+                    company=company.name, fiscal_year=self.masters.fiscal_year,
+                    monthly_distribution=rng.choice([*MONTHLY_DISTRIBUTIONS, None]),
+                    action_if_annual_budget_exceeded="Warn", action_if_accumulated_monthly_budget_exceeded="Warn",
+                ))
+                chosen = rng.sample(company.expense_accounts, min(len(company.expense_accounts), rng.randint(3, 6)))
+                accounts.extend(
+                    self.child(
+                        name, "Budget", idx, self.fy_start, 1, parentfield="accounts",
+                        account=account, budget_amount=self.amount(2e5, 5e6),
+                    )
+                    for idx, account in enumerate(chosen, 1)
+                )
+        _insert_rows("Budget", budgets)
+        _insert_rows("Budget Account", accounts)
+
+    def generate_procurement(self):
+        """MR -> Supplier Quotation(s) -> Purchase Order -> Purchase Invoice chains."""
+        rng = self.rng
+        parents = {doctype: [] for doctype in ("Material Request", "Supplier Quotation", "Purchase Order", "Purchase Invoice")}
+        children = {doctype: [] for doctype in parents}
+        counters = {"SQ": 0, "PO": 0, "PI": 0}
+
+        def next_name(key):
+            counters[key] += 1
+            return f"{BENCH_PREFIX}-{key}-{counters[key]:06d}"
+
+        for i in range(1, self.volume["material_requests"] + 1):
+            company = rng.choice(self.masters.companies)
+            cost_center = rng.choice(company.cost_centers)
+            on_date = self.fy_date()
+            docstatus = 1 if rng.random() < 0.9 else 0
+            employee = rng.choice(self.employees)
+
+            mr = f"{BENCH_PREFIX}-MR-{i:06d}"
+            mr_items = []
+            for idx in range(1, rng.randint(1, 5) + 1):
+                item = rng.choice(self.items)
+                qty = rng.randint(1, 20)
+                rate = self.item_rates[item]
+                mr_items.append(self.child(
+                    mr, "Material Request", idx, on_date, docstatus,
+                    item_code=item, item_name=item, qty=qty, stock_qty=qty, rate=rate, amount=qty * rate,
+                    uom="Nos", stock_uom="Nos", conversion_factor=1, schedule_date=add_days(on_date, 14),
+                    cost_center=cost_center, expense_account=rng.choice(company.expense_accounts),
+                ))
+            children["Material Request"].extend(mr_items)
+            parents["Material Request"].append(self.row(
+                mr, on_date, docstatus, material_request_type="Purchase", transaction_date=on_date,
+                schedule_date=add_days(on_date, 14), company=company.name,
+                status="Pending" if docstatus else "Draft",
+                workflow_state=rng.choice(["Approved", "Approved", "Pending", "Rejected"]) if docstatus else "Draft",
+                custom_cost_center=cost_center, custom_employee=employee.name,
+            ))
+
+            if not docstatus or rng.random() > 0.6:
+                continue
+
+            # 1-2 quotations per MR, the first one is ordered most of the time
+            sqs = []
+            for _q in range(rng.randint(1, 2)):
+                sq = next_name("SQ")
+                supplier = rng.choice(self.suppliers)
+                sq_date = add_days(on_date, rng.randint(1, 10))
+                sq_items = [
+                    self.child(
+                        sq, "Supplier Quotation", idx, sq_date, 1,
+                        item_code=row["item_code"], item_name=row["item_name"], qty=row["qty"],
+                        rate=round(row["rate"] * rng.uniform(0.85, 1.05), 2), uom="Nos", stock_uom="Nos",
+                        conversion_factor=1, material_request=mr, material_request_item=row["name"],
+                        cost_center=cost_center, expense_account=row["expense_account"],
+                    )
+                    for idx, row in enumerate(mr_items, 1)
+                ]
+                for row in sq_items:
+                    row["amount"] = row["qty"] * row["rate"]
+                total = sum(row["amount"] for row in sq_items)
+                children["Supplier Quotation"].extend(sq_items)
+                parents["Supplier Quotation"].append(self.row(
+                    sq, sq_date, 1, supplier=supplier, supplier_name=supplier, transaction_date=sq_date,
+                    company=company.name, status="Submitted", total=total, net_total=total, grand_total=total,
+                    base_grand_total=total,
+                ))
+                sqs.append((sq, supplier, sq_date, sq_items))
+
+            if rng.random() > 0.7:
+                continue
+
+            sq, supplier, sq_date, sq_items = sqs[0]
+            po = next_name("PO")
+            po_date = add_days(sq_date, rng.randint(1, 7))
+            po_items = [
+                self.child(
+                    po, "Purchase Order", idx, po_date, 1,
+                    item_code=row["item_code"], item_name=row["item_name"], qty=row["qty"], rate=row["rate"],
+                    amount=row["amount"], base_amount=row["amount"], net_amount=row["amount"],
+                    base_net_amount=row["amount"], uom="Nos", stock_uom="Nos", conversion_factor=1,
+                    schedule_date=add_days(po_date, 14), material_request=mr,
+                    material_request_item=row["material_request_item"], supplier_quotation=sq,
+                    supplier_quotation_item=row["name"], cost_center=cost_center,
+                    expense_account=row["expense_account"],
+                )
+                for idx, row in enumerate(sq_items, 1)
+            ]
+            total = sum(row["amount"] for row in po_items)
+            children["Purchase Order"].extend(po_items)
+            parents["Purchase Order"].append(self.row(
+                po, po_date, 1, supplier=supplier, supplier_name=supplier, transaction_date=po_date,
+                schedule_date=add_days(po_date, 14), company=company.name, status="To Receive and Bill",
+                total=total, net_total=total, grand_total=total, base_grand_total=total,
+            ))
+
+            if rng.random() > 0.8:
+                continue
+
+            pi = next_name("PI")
+            pi_date = add_days(po_date, rng.randint(5, 45))
+            pi_items = [
+                self.child(
+                    pi, "Purchase Invoice", idx, pi_date, 1,
+                    item_code=row["item_code"], item_name=row["item_name"], qty=row["qty"], rate=row["rate"],
+                    amount=row["amount"], base_amount=row["amount"], net_amount=row["amount"],
+                    base_net_amount=row["amount"], uom="Nos", stock_uom="Nos", conversion_factor=1,
+                    purchase_order=po, po_detail=row["name"], cost_center=cost_center,
+                    expense_account=row["expense_account"],
+                )
+                for idx, row in enumerate(po_items, 1)
+            ]
+            paid = rng.choice([1.0, 1.0, 0.0, rng.uniform(0.2, 0.8)])
+            outstanding = round(total * (1 - paid), 2)
+            children["Purchase Invoice"].extend(pi_items)
+            parents["Purchase Invoice"].append(self.row(
+                pi, pi_date, 1, supplier=supplier, supplier_name=supplier, posting_date=pi_date,
+                bill_date=pi_date, due_date=add_days(pi_date, 30), company=company.name,
+                status="Paid" if not outstanding else ("Unpaid" if paid == 0 else "Partly Paid"),
+                total=total, net_total=total, base_net_total=total, grand_total=total, base_grand_total=total,
+                outstanding_amount=outstanding,
+            ))
+
+        for doctype, rows in parents.items():
+            _insert_rows(doctype, rows)
+            _insert_rows(f"{doctype} Item", children[doctype])
+
+    def generate_expense_claims(self):
+        rng = self.rng
+        claims, details = [], []
+        for i in range(1, self.volume["expense_claims"] + 1):
+            employee = rng.choice(self.employees)
+            company = next(c for c in self.masters.companies if c.name == employee.company)
+            on_date = self.fy_date()
+            name = f"{BENCH_PREFIX}-EC-{i:06d}"
+            cost_center = rng.choice(company.cost_centers)
+
+            rows = [
+                self.child(
+                    name, "Expense Claim", idx, on_date, 1, parentfield="expenses", expense_date=on_date,
+                    amount=self.amount(500, 40000), default_account=rng.choice(company.expense_accounts),
+                    cost_center=cost_center,
+                )
+                for idx in range(1, rng.randint(1, 3) + 1)
+            ]
+            for row in rows:
+                row["sanctioned_amount"] = row["amount"]
+            total = sum(row["amount"] for row in rows)
+            details.extend(rows)
+            claims.append(self.row(
+                name, on_date, 1, employee=employee.name, employee_name=employee.name, company=company.name,
+                department=employee.department, posting_date=on_date, cost_center=cost_center,
+                approval_status="Approved", status="Unpaid",
+                workflow_state=rng.choice(["Finance Approved", "Finance Approved", "HOD Approved"]),
+                total_claimed_amount=total, total_sanctioned_amount=total, grand_total=total,
+            ))
+        _insert_rows("Expense Claim", claims)
+        _insert_rows("Expense Claim Detail", details)
+
+    def generate_attendance(self):
+        """Submitted Attendance for the first attendance_months of the fiscal year."""
+        rng = self.rng
+        start = get_first_day(self.fy_start)
+        end = add_days(add_months(start, self.volume["attendance_months"]), -1)
+        holidays = {
+            (row.parent, getdate(row.holiday_date))
+            for row in frappe.get_all(
+                "Holiday",
+                filters={"parent": ["in", [c.holiday_list for c in self.masters.companies]]},
+                fields=["parent", "holiday_date"],
+            )
+        }
+
+        rows, counter = [], 0
+        for emp in self.employees:
+            day = max(start, getdate(emp.date_of_joining))
+            last = min(end, getdate(emp.relieving_date)) if emp.relieving_date else end
+            while day <= last:
+                if (emp.holiday_list, day) not in holidays:
+                    counter += 1
+                    status = rng.choices(["Present", "Absent", "On Leave", "Half Day"], [88, 4, 5, 3])[0]
+                    rows.append(self.row(
+                        f"{BENCH_PREFIX}-ATT-{counter:07d}", day, 1, employee=emp.name, employee_name=emp.name,
+                        company=emp.company, department=emp.department, attendance_date=day, status=status,
+                        leave_type="Casual Leave" if status in ("On Leave", "Half Day") else None,
+                        half_day_status="Present" if status == "Half Day" else None,
+                    ))
+                day = add_days(day, 1)
+        _insert_rows("Attendance", rows)
+
+    def generate_assets(self):
+        rng = self.rng
+        rows = []
+        for i in range(1, self.volume["assets"] + 1):
+            company = rng.choice(self.masters.companies)
+            item = rng.choice(self.items)
+            purchase_date = add_days(self.fy_start, -rng.randrange(5 * 365))
+            gross = self.amount(5000, 2e6)
+            status = rng.choices(["Submitted", "Partially Depreciated", "Draft", "Scrapped"], [60, 25, 10, 5])[0]
+            rows.append(self.row(
+                f"{BENCH_PREFIX}-AST-{i:06d}", purchase_date, 0 if status == "Draft" else 1,
+                asset_name=f"Bench Asset {i}", item_code=item, item_name=item, company=company.name,
+                asset_category=rng.choice(ASSET_CATEGORIES), location=f"{BENCH_PREFIX} Campus {company.abbr}",
+                department=rng.choice(self.departments[company.name]), custodian=rng.choice(self.employees).name,
+                supplier=rng.choice(self.suppliers), status=status, purchase_date=purchase_date,
+                available_for_use_date=purchase_date, gross_purchase_amount=gross,
+                value_after_depreciation=round(gross * rng.uniform(0.2, 1.0), 2), calculate_depreciation=0,
+                is_existing_asset=1, is_fully_depreciated=0,
+            ))
+        _insert_rows("Asset", rows)
@@ -9,6 +9,8 @@ from frappe.utils import getdate, add_days
 from frappe import _
 import json
 
+from custom_app.utils.working_calendar import get_day_type, get_holiday_list_calendar
+
 
 class AttendanceExcelGenerator(Document):
     pass
@@ -46,29 +48,12 @@ def map_leave_code(leave_type):
 # ---------------------------------------
 # HOLIDAY CHECK FUNCTION
 # ---------------------------------------
-def get_holiday_code(employee, date):
+def get_holiday_code(holiday_list, date, calendar=None):
     """Return WO (week off) or PH (public holiday) based on employee holiday list."""
-    
-    holiday_list = frappe.db.get_value("Employee", employee, "holiday_list")
     if not holiday_list:
         return None
 
-    holiday = frappe.get_all(
-        "Holiday",
-        filters={"parent": holiday_list, "holiday_date": date},
-        fields=["description"],
-        limit=1
-    )
-
-    if not holiday:
-        return None
-
-    desc = (holiday[0].description or "").lower()
-
-    if "saturday" in desc or "sunday" in desc:
-        return "WO"
-
-    return "PH"
+    return get_day_type(holiday_list, date, calendar)
 
 
 # ---------------------------------------
@@ -110,10 +95,16 @@ def generate_excel(doc):
     employees = frappe.get_all(
         "Employee",
         filters={"company": doc.company},
-        fields=["name", "employee", "employee_name", "date_of_joining", "relieving_date", "status"],
+        fields=["name", "employee", "employee_name", "date_of_joining", "relieving_date", "status", "holiday_list"],
         order_by="name asc"
     )
 
+    # Compiled holiday bitmaps, loaded once per holiday list
+    calendars = {
+        holiday_list: get_holiday_list_calendar(holiday_list)
+        for holiday_list in {emp.holiday_list for emp in employees if emp.holiday_list}
+    }
+
     start = getdate(doc.from_date)
     end = getdate(doc.to_date)
 
@@ -193,7 +184,7 @@ def generate_excel(doc):
             )
 
             value = ""
-            holiday_code = get_holiday_code(emp.name, date)
+            holiday_code = get_holiday_code(emp.holiday_list, date, calendars.get(emp.holiday_list))
 
             if attendance:
                 status = (attendance.status or "").lower()
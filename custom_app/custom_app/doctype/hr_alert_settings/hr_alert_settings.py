@@ -0,0 +1,24 @@
+# Copyright (c) 2026, . and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+
+
+class HRAlertSettings(Document):
+	def validate(self):
+		self.validate_date_fields()
+
+	def validate_date_fields(self):
+		"""Each rule must point at a Date / Datetime field on Employee"""
+		employee_meta = frappe.get_meta("Employee")
+
+		for row in self.alert_rules:
+			field = employee_meta.get_field(row.date_field)
+			if not field or field.fieldtype not in ("Date", "Datetime"):
+				frappe.throw(
+					_("Row {0}: {1} is not a Date field of Employee.").format(
+						row.idx, frappe.bold(row.date_field)
+					)
+				)
@@ -0,0 +1,19 @@
+# Copyright (c) 2026, . and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder import Interval
+from frappe.query_builder.functions import Now
+
+
+class NotificationOutbox(Document):
+	@staticmethod
+	def clear_old_logs(days=30):
+		"""Called by Log Settings: purge processed rows older than *days*."""
+		table = frappe.qb.DocType("Notification Outbox")
+		frappe.db.delete(
+			table,
+			filters=(table.creation < (Now() - Interval(days=days)))
+			& (table.status.isin(["Sent", "Coalesced"])),
+		)
@@ -0,0 +1,8 @@
+// Copyright (c) 2026, . and contributors
+// For license information, please see license.txt
+
+// frappe.ui.form.on("Probation Leave Run Log", {
+// 	refresh(frm) {
+
+// 	},
+// });
@@ -0,0 +1,16 @@
+# Copyright (c) 2026, . and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class ProcurementSearchTerm(Document):
+	pass
+
+
+def on_doctype_update():
+	# Typeahead lookups filter on the doctype and a term prefix; index
+	# maintenance deletes every term of one document at a time.
+	frappe.db.add_index("Procurement Search Term", ["reference_doctype", "term"])
+	frappe.db.add_index("Procurement Search Term", ["reference_doctype", "reference_name"])
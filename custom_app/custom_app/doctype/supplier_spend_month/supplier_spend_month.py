@@ -0,0 +1,14 @@
+# Copyright (c) 2026, . and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+
+class SupplierSpendMonth(Document):
+	pass
+
+
+def on_doctype_update():
+	# Dashboard reads scan one company over a month range.
+	frappe.db.add_index("Supplier Spend Month", ["company", "month"])
@@ -0,0 +1,131 @@
+frappe.pages['custom-app-performance'].on_page_load = function (wrapper) {
+	var page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: 'Custom App Performance',
+		single_column: true
+	});
+
+	const API = 'custom_app.custom_app.page.custom_app_performance.custom_app_performance';
+
+	async function callApi(method, args = {}) {
+		const res = await frappe.call({ method: `${API}.${method}`, args });
+		return res.message;
+	}
+
+	// ── Styles ────────────────────────────────────────────────────────────────
+	const css = `
+	.cp-root{font-family:var(--font-stack);padding:24px;background:var(--bg-color);}
+	.cp-meta{font-size:12px;color:var(--text-muted);margin-bottom:16px;}
+	.cp-section-title{font-size:13px;font-weight:700;color:var(--text-color);margin:0 0 14px;padding-bottom:8px;border-bottom:2px solid var(--border-color);}
+	.cp-card{background:var(--card-bg);border:1px solid var(--border-color);border-radius:12px;padding:20px 22px;margin-bottom:24px;}
+	.cp-table-wrap{overflow-x:auto;}
+	.cp-table{width:100%;border-collapse:collapse;font-size:12.5px;}
+	.cp-table th{background:var(--control-bg);color:var(--text-muted);font-weight:600;text-align:left;padding:9px 12px;border-bottom:2px solid var(--border-color);white-space:nowrap;}
+	.cp-table td{padding:8px 12px;border-bottom:1px solid var(--border-color);color:var(--text-color);vertical-align:top;}
+	.cp-table td.num,.cp-table th.num{text-align:right;}
+	.cp-table tr.cp-row{cursor:pointer;}
+	.cp-table tr.cp-row:hover td{background:var(--bg-color);}
+	.cp-method{font-family:var(--font-stack-monospace, monospace);font-size:12px;word-break:break-all;}
+	.cp-error{color:#991b1b;font-weight:600;}
+	.cp-queries{display:none;}
+	.cp-queries pre{margin:0 0 6px;padding:6px 8px;font-size:11px;white-space:pre-wrap;background:var(--control-bg);border-radius:6px;}
+	.cp-queries .qt{font-size:11px;color:var(--text-muted);}
+	.cp-empty{padding:40px;text-align:center;color:var(--text-muted);font-size:13px;}
+	`;
+	$('<style>').text(css).appendTo('head');
+
+	const $root = $('<div class="cp-root">').appendTo(page.main);
+
+	const fmtMs  = v => v == null ? '—' : `${Number(v).toLocaleString('en-IN', { maximumFractionDigits: 1 })} ms`;
+	const fmtNum = v => v == null ? '—' : Number(v).toLocaleString('en-IN');
+	const esc    = v => frappe.utils.escape_html(String(v ?? ''));
+
+	// ── Render ────────────────────────────────────────────────────────────────
+	function renderSummary(rows) {
+		if (!rows.length) {
+			return `<div class="cp-empty">${__('No samples recorded yet.')}</div>`;
+		}
+		return `<div class="cp-table-wrap"><table class="cp-table">
+			<thead><tr>
+				<th>${__('Method')}</th><th class="num">${__('Calls')}</th>
+				<th class="num">p50</th><th class="num">p95</th><th class="num">${__('Max')}</th>
+				<th class="num">${__('Avg SQL')}</th><th class="num">${__('Max SQL')}</th>
+				<th class="num">${__('Avg SQL Time')}</th><th class="num">${__('Peak Memory')}</th>
+				<th class="num">${__('Errors')}</th><th>${__('Last Called')}</th>
+			</tr></thead>
+			<tbody>${rows.map(r => `<tr>
+				<td class="cp-method">${esc(r.method)}</td>
+				<td class="num">${fmtNum(r.calls)}</td>
+				<td class="num">${fmtMs(r.p50_ms)}</td>
+				<td class="num">${fmtMs(r.p95_ms)}</td>
+				<td class="num">${fmtMs(r.max_ms)}</td>
+				<td class="num">${fmtNum(r.avg_sql_count)}</td>
+				<td class="num">${fmtNum(r.max_sql_count)}</td>
+				<td class="num">${fmtMs(r.avg_sql_ms)}</td>
+				<td class="num">${r.max_peak_kb == null ? '—' : fmtNum(r.max_peak_kb) + ' KB'}</td>
+				<td class="num ${r.errors ? 'cp-error' : ''}">${fmtNum(r.errors)}</td>
+				<td>${esc(frappe.datetime.str_to_user(r.last_called))}</td>
+			</tr>`).join('')}</tbody>
+		</table></div>`;
+	}
+
+	function renderSlowest(rows) {
+		if (!rows.length) {
+			return `<div class="cp-empty">${__('No samples recorded yet.')}</div>`;
+		}
+		return `<div class="cp-table-wrap"><table class="cp-table">
+			<thead><tr>
+				<th>${__('Method')}</th><th>${__('When')}</th><th>${__('User')}</th>
+				<th class="num">${__('Time')}</th><th class="num">${__('SQL')}</th>
+				<th class="num">${__('SQL Time')}</th><th class="num">${__('Rows')}</th>
+			</tr></thead>
+			<tbody>${rows.map((r, i) => `
+				<tr class="cp-row" data-idx="${i}">
+					<td class="cp-method ${r.error ? 'cp-error' : ''}">${esc(r.method)}</td>
+					<td>${esc(frappe.datetime.str_to_user(r.timestamp))}</td>
+					<td>${esc(r.user)}</td>
+					<td class="num">${fmtMs(r.wall_ms)}</td>
+					<td class="num">${fmtNum(r.sql_count)}</td>
+					<td class="num">${fmtMs(r.sql_ms)}</td>
+					<td class="num">${fmtNum(r.rows)}</td>
+				</tr>
+				<tr class="cp-queries" data-idx="${i}"><td colspan="7">
+					${(r.queries || []).length
+						? r.queries.map(q => `<div class="qt">${fmtMs(q.ms)}</div><pre>${esc(q.query.trim())}</pre>`).join('')
+						: `<span class="qt">${__('No queries')}</span>`}
+				</td></tr>`).join('')}
+			</tbody>
+		</table></div>`;
+	}
+
+	async function load() {
+		$root.html(`<div class="cp-empty">${__('Loading…')}</div>`);
+		const d = await callApi('get_performance_summary', { limit: 25 });
+
+		$root.html(`
+			<div class="cp-meta">${__('{0} samples in the buffer (most recent 1000 calls).', [fmtNum(d.sample_count)])}</div>
+			<div class="cp-card">
+				<div class="cp-section-title">${__('Latency by Method')}</div>
+				${renderSummary(d.summary)}
+			</div>
+			<div class="cp-card">
+				<div class="cp-section-title">${__('Slowest Recent Calls')} <span class="cp-meta">(${__('click a row for its queries')})</span></div>
+				${renderSlowest(d.slowest)}
+			</div>
+		`);
+	}
+
+	$root.on('click', 'tr.cp-row', function () {
+		$root.find(`tr.cp-queries[data-idx="${$(this).data('idx')}"]`).toggle();
+	});
+
+	page.set_primary_action(__('Refresh'), load, 'refresh');
+	page.set_secondary_action(__('Clear Samples'), () => {
+		frappe.confirm(__('Clear all recorded performance samples?'), async () => {
+			await callApi('clear_performance_samples');
+			load();
+		});
+	});
+
+	load();
+};
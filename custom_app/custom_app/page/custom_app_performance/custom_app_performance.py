@@ -0,0 +1,53 @@
+import frappe
+from frappe.utils import cint
+
+from custom_app.utils.perf import clear_samples, get_samples, percentile
+
+
+def _summarise(samples):
+	by_method = {}
+	for s in samples:
+		by_method.setdefault(s["method"], []).append(s)
+
+	summary = []
+	for method, rows in by_method.items():
+		wall = sorted(r["wall_ms"] for r in rows)
+		sql_counts = [r.get("sql_count") or 0 for r in rows]
+		peaks = [r["peak_kb"] for r in rows if r.get("peak_kb") is not None]
+		summary.append({
+			"method":        method,
+			"calls":         len(rows),
+			"p50_ms":        percentile(wall, 50),
+			"p95_ms":        percentile(wall, 95),
+			"max_ms":        wall[-1],
+			"avg_sql_count": round(sum(sql_counts) / len(rows), 1),
+			"max_sql_count": max(sql_counts),
+			"avg_sql_ms":    round(sum(r.get("sql_ms") or 0 for r in rows) / len(rows), 2),
+			"max_peak_kb":   max(peaks) if peaks else None,
+			"errors":        sum(1 for r in rows if r.get("error")),
+			"last_called":   max(r["timestamp"] for r in rows),
+		})
+
+	return sorted(summary, key=lambda r: r["p95_ms"] or 0, reverse=True)
+
+
+@frappe.whitelist()
+def get_performance_summary(limit=20):
+	"""p50 / p95 latency and SQL counts per method, plus the slowest recent calls."""
+	frappe.only_for("System Manager")
+
+	samples = get_samples()
+	limit = min(max(cint(limit), 1), 100)
+
+	return {
+		"sample_count": len(samples),
+		"summary": _summarise(samples),
+		"slowest": sorted(samples, key=lambda s: s["wall_ms"], reverse=True)[:limit],
+	}
+
+
+@frappe.whitelist(methods=["POST"])
+def clear_performance_samples():
+	frappe.only_for("System Manager")
+	clear_samples()
+	return True
@@ -523,7 +523,7 @@ class FinanceDashboard {
 	// ─────────────────────────────────────────────────────────────
 	async load_filter_options() {
 		return new Promise((resolve) => {
-			frappe.call({
+			custom_app.filter_options.call({
 				method: "custom_app.custom_app.page.finance_dashboard.finance_dashboard.get_filter_options",
 				callback: (r) => {
 					if (!r.message) { resolve(); return; }
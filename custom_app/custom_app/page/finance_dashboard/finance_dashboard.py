@@ -3,6 +3,10 @@ from frappe import _
 from frappe.utils import flt, getdate, nowdate, add_months, get_first_day, get_last_day
 from datetime import date
 
+from custom_app.api.filter_options import filter_options_response
+from custom_app.api.supplier_spend import get_supplier_spend
+from custom_app.permissions.permission_scope import get_company_scope
+
 
 # ─────────────────────────────────────────────────────────────────
 # ROLE / PERMISSION HELPERS
@@ -14,23 +18,11 @@ def _is_system_manager():
 
 
 def _get_permitted_companies():
-    if _is_system_manager():
-        rows = frappe.db.sql("SELECT name FROM `tabCompany` ORDER BY name", as_dict=True)
-        return [r.name for r in rows]
-
-    from frappe.permissions import get_user_permissions
-    permitted = get_user_permissions(frappe.session.user).get("Company", [])
-    names = [p.get("doc") for p in permitted if p.get("doc")]
-
-    if not names:
-        return []
-
-    placeholders = ", ".join(["%s"] * len(names))
-    rows = frappe.db.sql(
-        f"SELECT name FROM `tabCompany` WHERE name IN ({placeholders}) ORDER BY name",
-        names, as_dict=True,
-    )
-    return [r.name for r in rows]
+    # Non-managers only see companies granted through User Permission.
+    companies, restricted = get_company_scope()
+    if restricted or _is_system_manager():
+        return companies
+    return []
 
 def _enforce_company(company_arg):
     """
@@ -107,26 +99,24 @@ def _period_dates(period="month", date_from=None, date_to=None):
 # ─────────────────────────────────────────────────────────────────
 
 @frappe.whitelist()
-def get_filter_options():
+def get_filter_options(etag=None):
     companies = _get_permitted_companies()
+    lock_company = not _is_system_manager()
 
-    cost_centers = frappe.db.sql(
-        "SELECT name FROM `tabCost Center` WHERE is_group = 0 ORDER BY name", as_dict=True
-    )
-    fiscal_years = frappe.db.sql(
-        "SELECT name FROM `tabFiscal Year` WHERE disabled = 0 ORDER BY year_start_date DESC",
-        as_dict=True,
-    )
-    suppliers = frappe.db.sql("SELECT name FROM `tabSupplier` ORDER BY name", as_dict=True)
+    def build(lists):
+        return {
+            "companies": companies,
+            "cost_centers": lists["Cost Center"],
+            "fiscal_years": lists["Fiscal Year"],
+            "suppliers": lists["Supplier"],
+            # Tell the frontend whether the company selector should be locked
+            "lock_company": lock_company,
+        }
 
-    return {
-        "companies": companies,
-        "cost_centers": [r.name for r in cost_centers],
-        "fiscal_years": [r.name for r in fiscal_years],
-        "suppliers": [r.name for r in suppliers],
-        # Tell the frontend whether the company selector should be locked
-        "lock_company": not _is_system_manager(),
-    }
+    return filter_options_response(
+        etag, ["Cost Center", "Fiscal Year", "Supplier"], build,
+        companies=companies, lock_company=lock_company,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -433,7 +423,7 @@ def get_vendor_concentration(company=None, fiscal_year=None, date_from=None, dat
     if company == "__NONE__":
         return {
             "rows": [], "total_spend": 0, "top3_pct": 0, "top_n_pct": 0,
-            "top_n": int(top_n), "supplier_count": 0, "risk_level": "Low",
+            "top_n": int(top_n), "supplier_count": 0, "risk_level": "Low", "hhi": 0, "hhi_level": "Low",
             "chart_labels": [], "chart_values": [],
             "date_from": date_from, "date_to": date_to,
         }
@@ -448,24 +438,9 @@ def get_vendor_concentration(company=None, fiscal_year=None, date_from=None, dat
         date_from = str(date(today.year, 1, 1))
         date_to = str(today)
 
-    co_where, co_args = _company_where("pi", company)
-
-    ew   = ["pi.docstatus = 1", "pi.posting_date BETWEEN %(date_from)s AND %(date_to)s"]
-    args = {**co_args, "date_from": date_from, "date_to": date_to}
-
-    where = " AND ".join(ew)
-
-    supplier_spend = frappe.db.sql(f"""
-        SELECT
-            pi.supplier,
-            pi.supplier_name,
-            SUM(pi.grand_total) AS total_spend,
-            COUNT(pi.name) AS invoice_count
-        FROM `tabPurchase Invoice` pi
-        WHERE {where} {co_where}
-        GROUP BY pi.supplier
-        ORDER BY total_spend DESC
-    """, args, as_dict=True)
+    # Whole months come from the Supplier Spend Month summary
+    co_where, co_args = _company_where("ssm", company)
+    supplier_spend = [frappe._dict(r) for r in get_supplier_spend(date_from, date_to, co_where, co_args)]
 
     total_spend = sum(flt(r.total_spend) for r in supplier_spend)
     top_n = int(top_n)
@@ -492,6 +467,10 @@ def get_vendor_concentration(company=None, fiscal_year=None, date_from=None, dat
 
     risk_level = "High" if top3_pct > 40 else ("Medium" if top3_pct > 25 else "Low")
 
+    # Herfindahl-Hirschman index over supplier shares (0 - 10,000)
+    hhi = round(sum(r["pct_of_total"] ** 2 for r in rows)) if total_spend > 0 else 0
+    hhi_level = "High" if hhi > 2500 else ("Medium" if hhi > 1500 else "Low")
+
     chart_labels, chart_values = [], []
     for r in rows[:top_n]:
         chart_labels.append(r["supplier_name"])
@@ -509,8 +488,55 @@ def get_vendor_concentration(company=None, fiscal_year=None, date_from=None, dat
         "top_n": top_n,
         "supplier_count": len(rows),
         "risk_level": risk_level,
+        "hhi": hhi,
+        "hhi_level": hhi_level,
         "chart_labels": chart_labels,
         "chart_values": chart_values,
         "date_from": date_from,
         "date_to": date_to,
-    }
\ No newline at end of file
+    }
+
+# ─────────────────────────────────────────────────────────────────
+# 5. SUPPLIER SPEND TREND (from the Supplier Spend Month summary)
+# ─────────────────────────────────────────────────────────────────
+
+@frappe.whitelist()
+def get_supplier_spend_trend(company=None, fiscal_year=None, date_from=None, date_to=None, supplier=None):
+    company = _enforce_company(company)
+    if company == "__NONE__":
+        return {"labels": [], "invoiced": [], "paid": [], "outstanding": []}
+
+    if fiscal_year and not (date_from and date_to):
+        fy_doc = frappe.get_doc("Fiscal Year", fiscal_year)
+        date_from = str(fy_doc.year_start_date)
+        date_to = str(fy_doc.year_end_date)
+
+    if not date_from:
+        today = getdate(nowdate())
+        date_from = str(date(today.year, 1, 1))
+        date_to = str(today)
+
+    co_where, args = _company_where("ssm", company)
+    args.update({"month_from": get_first_day(date_from), "month_to": getdate(date_to)})
+    if supplier:
+        co_where += " AND ssm.supplier = %(supplier)s"
+        args["supplier"] = supplier
+
+    rows = frappe.db.sql(f"""
+        SELECT
+            ssm.month,
+            SUM(ssm.invoiced)    AS invoiced,
+            SUM(ssm.paid)        AS paid,
+            SUM(ssm.outstanding) AS outstanding
+        FROM `tabSupplier Spend Month` ssm
+        WHERE ssm.month BETWEEN %(month_from)s AND %(month_to)s {co_where}
+        GROUP BY ssm.month
+        ORDER BY ssm.month
+    """, args, as_dict=True)
+
+    return {
+        "labels": [getdate(r.month).strftime("%b %Y") for r in rows],
+        "invoiced": [round(flt(r.invoiced), 2) for r in rows],
+        "paid": [round(flt(r.paid), 2) for r in rows],
+        "outstanding": [round(flt(r.outstanding), 2) for r in rows],
+    }
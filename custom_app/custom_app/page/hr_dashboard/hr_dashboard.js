@@ -440,7 +440,7 @@ class HRDashboard {
 	// ── FILTER OPTIONS ─────────────────────────────────────────────
 	async load_filter_options() {
 		return new Promise(resolve => {
-			frappe.call({
+			custom_app.filter_options.call({
 				method: "custom_app.custom_app.page.hr_dashboard.hr_dashboard.get_filter_options",
 				callback: (r) => {
 					if (!r.message) { resolve(); return; }
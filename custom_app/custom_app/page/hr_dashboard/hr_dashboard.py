@@ -1,7 +1,10 @@
 import frappe
-from frappe.utils import getdate, nowdate, add_months, get_first_day, get_last_day
+from frappe.utils import cint, getdate, nowdate, add_months, get_first_day, get_last_day
 from datetime import date
 
+from custom_app.api.filter_options import filter_options_response
+from custom_app.permissions.permission_scope import get_company_scope
+
 
 # ─────────────────────────────────────────────────────────────────
 # ROLE / PERMISSION HELPERS
@@ -12,26 +15,11 @@ def _is_system_manager():
 
 
 def _get_permitted_companies():
-    if _is_system_manager():
-        rows = frappe.db.sql(
-            "SELECT name FROM `tabCompany` ORDER BY name", as_dict=True
-        )
-        return [r.name for r in rows]
-
-    from frappe.permissions import get_user_permissions
-    permitted = get_user_permissions(frappe.session.user).get("Company", [])
-    names = [p.get("doc") for p in permitted if p.get("doc")]
-
-    if not names:
-        return []
-
-    placeholders = ", ".join(["%s"] * len(names))
-    rows = frappe.db.sql(
-        f"SELECT name FROM `tabCompany` WHERE name IN ({placeholders}) ORDER BY name",
-        names,
-        as_dict=True,
-    )
-    return [r.name for r in rows]
+	# Non-managers only see companies granted through User Permission.
+	companies, restricted = get_company_scope()
+	if restricted or _is_system_manager():
+		return companies
+	return []
 
 
 def _resolve_company(company_arg):
@@ -66,6 +54,32 @@ def _period_dates(period="month", date_from=None, date_to=None):
 		return date(today.year, 1, 1), date(today.year, 12, 31)
 
 
+def _trend_buckets(trend_months=6):
+	"""(month_start, month_end) for the rolling window ending this month, oldest first."""
+	months = min(max(cint(trend_months) or 6, 1), 36)
+	this_month = get_first_day(getdate(nowdate()))
+	buckets = []
+	for i in range(months - 1, -1, -1):
+		m_start = add_months(this_month, -i)
+		buckets.append((m_start, get_last_day(m_start)))
+	return buckets
+
+
+def _bucket_counters(column, buckets, prefix):
+	"""
+	SUM(CASE ...) columns counting rows whose *column* falls in each bucket,
+	named <prefix>0 .. <prefix>N-1, plus their query args.
+	"""
+	parts, args = [], {}
+	for i, (m_start, m_end) in enumerate(buckets):
+		parts.append(
+			f"SUM(CASE WHEN {column} BETWEEN %({prefix}{i}_s)s AND %({prefix}{i}_e)s THEN 1 ELSE 0 END) AS {prefix}{i}"
+		)
+		args[f"{prefix}{i}_s"] = m_start
+		args[f"{prefix}{i}_e"] = m_end
+	return ",\n\t\t\t".join(parts), args
+
+
 def _base_filters(company=None, department=None):
 	clauses, args = [], {}
 	if company:
@@ -81,61 +95,74 @@ def _base_filters(company=None, department=None):
 # FILTER OPTIONS
 # ─────────────────────────────────────────────────────────────────
 @frappe.whitelist()
-def get_filter_options():
-	companies   = _get_permitted_companies()
-	departments = frappe.db.sql("SELECT name FROM `tabDepartment` ORDER BY name", as_dict=True)
-	return {
-		"companies":   companies,
-		"departments": [r.name for r in departments],
-		"lock_company": not _is_system_manager(),
-	}
+def get_filter_options(etag=None):
+	companies    = _get_permitted_companies()
+	lock_company = not _is_system_manager()
+
+	def build(lists):
+		return {
+			"companies":   companies,
+			"departments": lists["Department"],
+			"lock_company": lock_company,
+		}
+
+	return filter_options_response(
+		etag, ["Department"], build, companies=companies, lock_company=lock_company
+	)
 
 
 # ─────────────────────────────────────────────────────────────────
 # 1. ATTRITION RATE
 # ─────────────────────────────────────────────────────────────────
+def _attrition_counts(start, end, buckets, company=None, department=None):
+	"""
+	Every attrition counter and monthly separation bucket from one
+	conditional-aggregation pass over the filtered Employee rows.
+	"""
+	ew, args = _base_filters(company, department)
+	ew = ew.replace("e.company", "company").replace("e.department", "department")
+	trend_sql, trend_args = _bucket_counters("relieving_date", buckets, "sep")
+
+	row = frappe.db.sql(f"""
+		SELECT
+			SUM(CASE WHEN date_of_joining <= %(start)s
+				AND (relieving_date IS NULL OR relieving_date >= %(start)s) THEN 1 ELSE 0 END) AS start_count,
+			SUM(CASE WHEN date_of_joining <= %(end)s
+				AND (relieving_date IS NULL OR relieving_date >= %(end)s) THEN 1 ELSE 0 END) AS end_count,
+			SUM(CASE WHEN relieving_date BETWEEN %(start)s AND %(end)s THEN 1 ELSE 0 END) AS separations,
+			SUM(CASE WHEN status IN ('Left', 'Inactive')
+				AND (relieving_date IS NULL OR relieving_date = '') THEN 1 ELSE 0 END) AS missing_date,
+			{trend_sql}
+		FROM `tabEmployee`
+		WHERE 1=1 {ew}
+	""", {**args, **trend_args, "start": start, "end": end}, as_dict=True)[0]
+
+	return {
+		"start_count":  cint(row.start_count),
+		"end_count":    cint(row.end_count),
+		"separations":  cint(row.separations),
+		"missing_date": cint(row.missing_date),
+		"trend":        [cint(row[f"sep{i}"]) for i in range(len(buckets))],
+	}
+
+
 @frappe.whitelist()
-def get_attrition_rate(period="month", company=None, department=None, date_from=None, date_to=None):
+def get_attrition_rate(period="month", company=None, department=None, date_from=None, date_to=None, trend_months=6):
 	start, end = _period_dates(period, date_from, date_to)
-	extra_where, args = _base_filters(_resolve_company(company), department)
-	ew = extra_where.replace("e.company", "company").replace("e.department", "department")
-
-	start_count = frappe.db.sql(f"""
-		SELECT COUNT(*) as cnt FROM `tabEmployee`
-		WHERE date_of_joining <= %(start)s
-		AND (relieving_date IS NULL OR relieving_date >= %(start)s) {ew}
-	""", {**args, "start": start}, as_dict=True)[0].cnt or 0
-
-	end_count = frappe.db.sql(f"""
-		SELECT COUNT(*) as cnt FROM `tabEmployee`
-		WHERE date_of_joining <= %(end)s
-		AND (relieving_date IS NULL OR relieving_date >= %(end)s) {ew}
-	""", {**args, "end": end}, as_dict=True)[0].cnt or 0
-
-	separations = frappe.db.sql(f"""
-		SELECT COUNT(*) as cnt FROM `tabEmployee`
-		WHERE relieving_date BETWEEN %(start)s AND %(end)s {ew}
-	""", {**args, "start": start, "end": end}, as_dict=True)[0].cnt or 0
-
-	missing_date = frappe.db.sql(f"""
-		SELECT COUNT(*) as cnt FROM `tabEmployee`
-		WHERE status IN ('Left', 'Inactive')
-		AND (relieving_date IS NULL OR relieving_date = '') {ew}
-	""", args, as_dict=True)[0].cnt or 0
+	# Monthly trend is a rolling window regardless of period
+	buckets = _trend_buckets(trend_months)
+	counts  = _attrition_counts(start, end, buckets, _resolve_company(company), department)
+
+	start_count, end_count = counts["start_count"], counts["end_count"]
+	separations = counts["separations"]
 
 	avg_headcount = (start_count + end_count) / 2 if (start_count + end_count) > 0 else 1
 	rate = round((separations / avg_headcount) * 100, 2)
 
-	# Monthly trend (last 6 months — always shows rolling 6 months regardless of period)
-	trend = []
-	for i in range(5, -1, -1):
-		m_start = get_first_day(add_months(getdate(nowdate()), -i))
-		m_end   = get_last_day(m_start)
-		s = frappe.db.sql(f"""
-			SELECT COUNT(*) as cnt FROM `tabEmployee`
-			WHERE relieving_date BETWEEN %(ms)s AND %(me)s {ew}
-		""", {**args, "ms": m_start, "me": m_end}, as_dict=True)[0].cnt or 0
-		trend.append({"label": m_start.strftime("%b %Y"), "value": s})
+	trend = [
+		{"label": m_start.strftime("%b %Y"), "value": value}
+		for (m_start, _m_end), value in zip(buckets, counts["trend"])
+	]
 
 	return {
 		"rate": rate,
@@ -143,7 +170,7 @@ def get_attrition_rate(period="month", company=None, department=None, date_from=
 		"avg_headcount": round(avg_headcount, 1),
 		"start_count": start_count,
 		"end_count": end_count,
-		"missing_relieving_date": missing_date,
+		"missing_relieving_date": counts["missing_date"],
 		"period_label": f"{start.strftime('%d %b %Y')} – {end.strftime('%d %b %Y')}",
 		"trend": trend,
 	}
@@ -154,16 +181,25 @@ def get_attrition_rate(period="month", company=None, department=None, date_from=
 #    time_to_hire = Job Offer.offer_date - Job Opening.posted_on
 # ─────────────────────────────────────────────────────────────────
 @frappe.whitelist()
-def get_time_to_hire(company=None, department=None, date_from=None, date_to=None):
-	extra = []
-	args  = {}
+def get_time_to_hire(company=None, department=None, date_from=None, date_to=None, trend_months=6):
 	resolved = _resolve_company(company)
 	if resolved == "__NONE__":
 		return {"avg_days": 0, "min_days": 0, "max_days": 0, "total_hires": 0,
 				"first_opening_date": "", "first_applicant": "—", "excluded_count": 0, "trend": []}
+
+	# Company / department scope shared by the summary, the trend and the
+	# excluded-employee count; the date range only narrows the summary.
+	scope, emp_scope, args = [], [], {}
 	if resolved:
-		extra.append("jo.company = %(company)s")
+		scope.append("jo.company = %(company)s")
+		emp_scope.append("e.company = %(company)s")
 		args["company"] = resolved
+	if department:
+		scope.append("jo.department = %(department)s")
+		emp_scope.append("e.department = %(department)s")
+		args["department"] = department
+
+	extra = list(scope)
 	if date_from:
 		extra.append("jof.offer_date >= %(date_from)s")
 		args["date_from"] = date_from
@@ -171,56 +207,74 @@ def get_time_to_hire(company=None, department=None, date_from=None, date_to=None
 		extra.append("jof.offer_date <= %(date_to)s")
 		args["date_to"] = date_to
 
-	ew = (" AND " + " AND ".join(extra)) if extra else ""
+	ew  = (" AND " + " AND ".join(extra)) if extra else ""
+	sw  = (" AND " + " AND ".join(scope)) if scope else ""
+	esw = (" AND " + " AND ".join(emp_scope)) if emp_scope else ""
 
+	# Summary, first applicant (earliest opening among the hires) and the
+	# count of current employees without a Job Applicant, in one round trip.
 	result = frappe.db.sql(f"""
+		WITH hires AS (
+			SELECT
+				DATEDIFF(jof.offer_date, jo.posted_on) AS days,
+				jo.posted_on,
+				jap.applicant_name,
+				ROW_NUMBER() OVER (ORDER BY jo.posted_on, jof.offer_date) AS rn
+			FROM `tabJob Offer` jof
+			JOIN `tabJob Applicant` jap ON jof.job_applicant = jap.name
+			JOIN `tabJob Opening`   jo  ON jap.job_title = jo.name
+			WHERE jof.docstatus = 1
+			AND jof.offer_date IS NOT NULL
+			AND jo.posted_on IS NOT NULL
+			AND DATEDIFF(jof.offer_date, jo.posted_on) >= 0
+			{ew}
+		)
+		SELECT
+			AVG(h.days)                                   AS avg_days,
+			MIN(h.days)                                   AS min_days,
+			MAX(h.days)                                   AS max_days,
+			COUNT(h.days)                                 AS total_hires,
+			MIN(h.posted_on)                              AS first_opening_date,
+			MAX(CASE WHEN h.rn = 1 THEN h.applicant_name END) AS first_applicant,
+			(SELECT COUNT(*) FROM `tabEmployee` e
+			  WHERE (e.job_applicant IS NULL OR e.job_applicant = '')
+			  AND e.date_of_joining <= CURDATE()
+			  AND (e.relieving_date IS NULL OR e.relieving_date >= CURDATE())
+			  {esw})                                      AS excluded_count
+		FROM hires h
+	""", args, as_dict=True)
+
+	# Rolling monthly trend: one grouped query for the whole window
+	months      = min(max(cint(trend_months) or 6, 1), 36)
+	trend_start = get_first_day(add_months(getdate(nowdate()), -(months - 1)))
+	trend_end   = get_last_day(getdate(nowdate()))
+	trend_rows  = frappe.db.sql(f"""
 		SELECT
-			AVG(DATEDIFF(jof.offer_date, jo.posted_on))  AS avg_days,
-			MIN(DATEDIFF(jof.offer_date, jo.posted_on))  AS min_days,
-			MAX(DATEDIFF(jof.offer_date, jo.posted_on))  AS max_days,
-			COUNT(*)                                      AS total_hires,
-			MIN(jo.posted_on)                             AS first_opening_date,
-			(SELECT ja2.applicant_name
-			   FROM `tabJob Applicant` ja2
-			   JOIN `tabJob Opening` jo2 ON ja2.job_title = jo2.name
-			   WHERE jo2.posted_on = MIN(jo.posted_on)
-			   LIMIT 1)                                   AS first_applicant
+			YEAR(jof.offer_date)                    AS yr,
+			MONTH(jof.offer_date)                   AS mon,
+			AVG(DATEDIFF(jof.offer_date, jo.posted_on)) AS avg_days,
+			COUNT(*)                                AS hires
 		FROM `tabJob Offer` jof
 		JOIN `tabJob Applicant` jap ON jof.job_applicant = jap.name
 		JOIN `tabJob Opening`   jo  ON jap.job_title = jo.name
 		WHERE jof.docstatus = 1
-		AND jof.offer_date IS NOT NULL
-		AND jo.posted_on IS NOT NULL
+		AND jof.offer_date BETWEEN %(trend_start)s AND %(trend_end)s
 		AND DATEDIFF(jof.offer_date, jo.posted_on) >= 0
-		{ew}
-	""", args, as_dict=True)
+		{sw}
+		GROUP BY YEAR(jof.offer_date), MONTH(jof.offer_date)
+	""", {**args, "trend_start": trend_start, "trend_end": trend_end}, as_dict=True)
 
-	# Monthly trend (rolling 6 months)
+	by_month = {(r.yr, r.mon): r for r in trend_rows}
 	trend = []
-	for i in range(5, -1, -1):
-		m_start = get_first_day(add_months(getdate(nowdate()), -i))
-		m_end   = get_last_day(m_start)
-		tr = frappe.db.sql("""
-			SELECT AVG(DATEDIFF(jof.offer_date, jo.posted_on)) as avg_days
-			FROM `tabJob Offer` jof
-			JOIN `tabJob Applicant` jap ON jof.job_applicant = jap.name
-			JOIN `tabJob Opening`   jo  ON jap.job_title = jo.name
-			WHERE jof.docstatus = 1
-			AND jof.offer_date BETWEEN %(ms)s AND %(me)s
-			AND DATEDIFF(jof.offer_date, jo.posted_on) >= 0
-		""", {"ms": m_start, "me": m_end}, as_dict=True)
+	for i in range(months):
+		m_start = add_months(trend_start, i)
+		r = by_month.get((m_start.year, m_start.month))
 		trend.append({
 			"label": m_start.strftime("%b %Y"),
-			"value": round(tr[0].avg_days or 0, 1) if tr else 0
+			"value": round(r.avg_days or 0, 1) if r else 0,
+			"hires": r.hires if r else 0,
 		})
 
-	excluded = frappe.db.sql("""
-		SELECT COUNT(*) as cnt FROM `tabEmployee`
-		WHERE (job_applicant IS NULL OR job_applicant = '')
-		AND date_of_joining <= CURDATE()
-		AND (relieving_date IS NULL OR relieving_date >= CURDATE())
-	""", as_dict=True)[0].cnt or 0
-
 	row = result[0] if result else {}
 	return {
 		"avg_days":           round(row.get("avg_days") or 0, 1),
@@ -229,7 +283,7 @@ def get_time_to_hire(company=None, department=None, date_from=None, date_to=None
 		"total_hires":        row.get("total_hires") or 0,
 		"first_opening_date": str(row.get("first_opening_date") or ""),
 		"first_applicant":    row.get("first_applicant") or "—",
-		"excluded_count":     excluded,
+		"excluded_count":     row.get("excluded_count") or 0,
 		"trend":              trend,
 	}
 
@@ -280,8 +334,43 @@ def get_offer_acceptance(company=None, date_from=None, date_to=None):
 # ─────────────────────────────────────────────────────────────────
 # 4. HEADCOUNT SUMMARY
 # ─────────────────────────────────────────────────────────────────
+def _headcount_by_department(start, end, buckets, company=None, department=None):
+	"""
+	Per-department headcount (active during start..end), Teaching /
+	Non-Teaching split and monthly joiners, from one grouped
+	conditional-aggregation pass over the filtered Employee rows.
+	"""
+	ew, args = _base_filters(company, department)
+	ew = ew.replace("e.company", "company").replace("e.department", "department")
+	trend_sql, trend_args = _bucket_counters("date_of_joining", buckets, "join")
+	active = "date_of_joining <= %(end)s AND (relieving_date IS NULL OR relieving_date >= %(start)s)"
+
+	rows = frappe.db.sql(f"""
+		SELECT
+			COALESCE(department, 'Unassigned') AS department,
+			SUM(CASE WHEN {active} THEN 1 ELSE 0 END)                                  AS total,
+			SUM(CASE WHEN {active} AND custom_type = 'Teaching' THEN 1 ELSE 0 END)     AS teaching,
+			SUM(CASE WHEN {active} AND custom_type = 'Non-Teaching' THEN 1 ELSE 0 END) AS non_teaching,
+			{trend_sql}
+		FROM `tabEmployee`
+		WHERE 1=1 {ew}
+		GROUP BY department
+	""", {**args, **trend_args, "start": start, "end": end}, as_dict=True)
+
+	return [
+		{
+			"department":   r.department,
+			"total":        cint(r.total),
+			"teaching":     cint(r.teaching),
+			"non_teaching": cint(r.non_teaching),
+			"joined":       [cint(r[f"join{i}"]) for i in range(len(buckets))],
+		}
+		for r in rows
+	]
+
+
 @frappe.whitelist()
-def get_headcount_summary(period="month", company=None, department=None, date_from=None, date_to=None):
+def get_headcount_summary(period="month", company=None, department=None, date_from=None, date_to=None, trend_months=6):
 	start, end = _period_dates(period, date_from, date_to)
 
 	resolved = _resolve_company(company)
@@ -289,65 +378,25 @@ def get_headcount_summary(period="month", company=None, department=None, date_fr
 		return {"total": 0, "teaching": 0, "non_teaching": 0, "unclassified": 0,
 				"teaching_pct": 0, "dept_data": [], "join_trend": [], "period_label": ""}
 
-	ew, args = [], {}
-	if resolved:
-		ew.append("company = %(company)s")
-		args["company"] = resolved
-	if department:
-		ew.append("department = %(department)s")
-		args["department"] = department
-
-	where = (" AND " + " AND ".join(ew)) if ew else ""
-
-	# Who was active during the selected period
-	period_filter = """
-		AND date_of_joining <= %(end)s
-		AND (relieving_date IS NULL OR relieving_date >= %(start)s)
-	"""
-	args["start"] = start
-	args["end"]   = end
-
-	total = frappe.db.sql(f"""
-		SELECT COUNT(*) as c FROM `tabEmployee`
-		WHERE 1=1 {where} {period_filter}
-	""", args, as_dict=True)[0].c or 0
-
-	teaching = frappe.db.sql(f"""
-		SELECT COUNT(*) as c FROM `tabEmployee`
-		WHERE custom_type='Teaching' {where} {period_filter}
-	""", args, as_dict=True)[0].c or 0
-
-	non_teaching = frappe.db.sql(f"""
-		SELECT COUNT(*) as c FROM `tabEmployee`
-		WHERE custom_type='Non-Teaching' {where} {period_filter}
-	""", args, as_dict=True)[0].c or 0
+	# Monthly joining trend — rolling window (not affected by period filter)
+	buckets = _trend_buckets(trend_months)
+	depts   = _headcount_by_department(start, end, buckets, resolved, department)
 
+	total        = sum(d["total"] for d in depts)
+	teaching     = sum(d["teaching"] for d in depts)
+	non_teaching = sum(d["non_teaching"] for d in depts)
 	unclassified = total - teaching - non_teaching
 
-	dept_data = frappe.db.sql(f"""
-		SELECT COALESCE(department,'Unassigned') as department, COUNT(*) as total
-		FROM `tabEmployee`
-		WHERE 1=1 {where} {period_filter}
-		GROUP BY department ORDER BY total DESC LIMIT 10
-	""", args, as_dict=True)
+	dept_data = [
+		frappe._dict(department=d["department"], total=d["total"])
+		for d in sorted(depts, key=lambda d: d["total"], reverse=True)
+		if d["total"]
+	][:10]
 
-	# Monthly joining trend — rolling last 6 months (not affected by period filter)
-	join_args = {}
-	if resolved:
-		join_args["company"] = resolved
-	if department:
-		join_args["department"] = department
-	join_where = (" AND " + " AND ".join(ew)) if ew else ""
-
-	join_trend = []
-	for i in range(5, -1, -1):
-		m_start = get_first_day(add_months(getdate(nowdate()), -i))
-		m_end   = get_last_day(m_start)
-		c = frappe.db.sql(f"""
-			SELECT COUNT(*) as cnt FROM `tabEmployee`
-			WHERE date_of_joining BETWEEN %(ms)s AND %(me)s {join_where}
-		""", {**join_args, "ms": m_start, "me": m_end}, as_dict=True)[0].cnt or 0
-		join_trend.append({"label": m_start.strftime("%b %Y"), "value": c})
+	join_trend = [
+		{"label": m_start.strftime("%b %Y"), "value": sum(d["joined"][i] for d in depts)}
+		for i, (m_start, _m_end) in enumerate(buckets)
+	]
 
 	return {
 		"total": total, "teaching": teaching,
@@ -403,111 +452,121 @@ def get_staffing_vs_actuals(company=None, department=None, date_from=None, date_
 
 # ─────────────────────────────────────────────────────────────────
 # 6. FULL RECRUITMENT FUNNEL
+#    All stages come from one CTE query grouped by stage, department
+#    and status; totals, the department drill-down, conversions and
+#    median stage durations are folded from those rows in Python.
 # ─────────────────────────────────────────────────────────────────
-@frappe.whitelist()
-def get_recruitment_pipeline(company=None, department=None, date_from=None, date_to=None):
-	resolved = _resolve_company(company)
-	if resolved == "__NONE__":
-		empty = {"total": 0, "pending": 0, "approved": 0, "filled": 0, "rejected": 0, "by_status": {}}
-		return {"requisitions": empty, "openings": {"total": 0, "open": 0, "closed": 0},
-				"applicants": {"total": 0, "open": 0, "replied": 0, "hold": 0, "accepted": 0, "rejected": 0},
-				"offers": {"sent": 0, "accepted": 0, "rejected": 0, "awaiting": 0}, "hired": 0}
+FUNNEL_STAGES = ("requisitions", "openings", "applicants", "offers", "hired")
 
-	# ── Requisition filters
-	req_ew, req_args = [], {}
-	if resolved:
-		req_ew.append("jreq.company = %(company)s")
-		req_args["company"] = resolved
-	if department:
-		req_ew.append("jreq.department = %(department)s")
-		req_args["department"] = department
-	if date_from:
-		req_ew.append("jreq.posting_date >= %(date_from)s")
-		req_args["date_from"] = date_from
-	if date_to:
-		req_ew.append("jreq.posting_date <= %(date_to)s")
-		req_args["date_to"] = date_to
-	req_where = (" AND " + " AND ".join(req_ew)) if req_ew else ""
 
-	# ── Job Opening filters
-	jo_ew, jo_args = [], {}
-	if resolved:
-		jo_ew.append("jo.company = %(company)s")
-		jo_args["company"] = resolved
-	if department:
-		jo_ew.append("jo.department = %(department)s")
-		jo_args["department"] = department
-	if date_from:
-		jo_ew.append("jo.posted_on >= %(date_from)s")
-		jo_args["date_from"] = date_from
-	if date_to:
-		jo_ew.append("jo.posted_on <= %(date_to)s")
-		jo_args["date_to"] = date_to
-	jo_where = (" AND " + " AND ".join(jo_ew)) if jo_ew else ""
+def _funnel_rows(company=None, department=None, date_from=None, date_to=None):
+	"""
+	One row per (stage, department, status) with its count, plus the median
+	number of days spent reaching that stage:
+
+	- applicants: Job Opening posted_on   → Job Applicant created
+	- offers:     Job Applicant created   → Job Offer offer_date
+	- hired:      Job Offer offer_date    → Employee date_of_joining
+
+	Each stage keeps its own date basis (requisition posting_date, opening
+	posted_on, offer_date, date_of_joining) as before.
+	"""
+	args = {"date_from": date_from, "date_to": date_to}
+
+	def scope(alias):
+		clauses = []
+		if company:
+			clauses.append(f"{alias}.company = %(company)s")
+			args["company"] = company
+		if department:
+			clauses.append(f"{alias}.department = %(department)s")
+			args["department"] = department
+		return "".join(f" AND {c}" for c in clauses)
+
+	def in_range(column):
+		clauses = []
+		if date_from:
+			clauses.append(f"{column} >= %(date_from)s")
+		if date_to:
+			clauses.append(f"{column} <= %(date_to)s")
+		return "".join(f" AND {c}" for c in clauses)
+
+	return frappe.db.sql(f"""
+		WITH scoped_jo AS (
+			SELECT jo.name, jo.department, jo.status, jo.posted_on,
+				(1=1 {in_range("jo.posted_on")}) AS in_range
+			FROM `tabJob Opening` jo
+			WHERE 1=1 {scope("jo")}
+		),
+		stage_rows AS (
+			SELECT 'requisitions' AS stage, jreq.department, jreq.status, NULL AS days
+			FROM `tabJob Requisition` jreq
+			WHERE 1=1 {scope("jreq")} {in_range("jreq.posting_date")}
+
+			UNION ALL
+			SELECT 'openings', jo.department, jo.status, NULL
+			FROM scoped_jo jo
+			WHERE jo.in_range
+
+			UNION ALL
+			SELECT 'applicants', jo.department, ja.status, DATEDIFF(ja.creation, jo.posted_on)
+			FROM `tabJob Applicant` ja
+			JOIN scoped_jo jo ON ja.job_title = jo.name
+			WHERE jo.in_range
+
+			UNION ALL
+			SELECT 'offers', jo.department, jof.status, DATEDIFF(jof.offer_date, ja.creation)
+			FROM `tabJob Offer` jof
+			JOIN `tabJob Applicant` ja ON jof.job_applicant = ja.name
+			JOIN scoped_jo jo          ON ja.job_title = jo.name
+			WHERE jof.docstatus = 1 {in_range("jof.offer_date")}
+
+			UNION ALL
+			SELECT 'hired', e.department, e.status, DATEDIFF(e.date_of_joining, jof.offer_date)
+			FROM `tabEmployee` e
+			LEFT JOIN (
+				SELECT job_applicant, MAX(offer_date) AS offer_date
+				FROM `tabJob Offer`
+				WHERE docstatus = 1
+				GROUP BY job_applicant
+			) jof ON jof.job_applicant = e.job_applicant
+			WHERE e.job_applicant IS NOT NULL AND e.job_applicant != ''
+			{scope("e")} {in_range("e.date_of_joining")}
+		)
+		SELECT stage, department, status, COUNT(*) AS cnt, MAX(median_days) AS median_days
+		FROM (
+			SELECT s.*,
+				MEDIAN(CASE WHEN s.days >= 0 THEN s.days END) OVER (PARTITION BY s.stage) AS median_days
+			FROM stage_rows s
+		) ranked
+		GROUP BY stage, department, status
+	""", args, as_dict=True)
 
-	# ── Offer date filters
-	jof_ew, jof_args = [], {}
-	if resolved:
-		jof_ew.append("jo.company = %(company)s")
-		jof_args["company"] = resolved
-	if department:
-		jof_ew.append("jo.department = %(department)s")
-		jof_args["department"] = department
-	if date_from:
-		jof_ew.append("jof.offer_date >= %(date_from)s")
-		jof_args["date_from"] = date_from
-	if date_to:
-		jof_ew.append("jof.offer_date <= %(date_to)s")
-		jof_args["date_to"] = date_to
-	jof_where = (" AND " + " AND ".join(jof_ew)) if jof_ew else ""
-
-	req_statuses = frappe.db.sql(f"""
-		SELECT jreq.status, COUNT(*) as cnt FROM `tabJob Requisition` jreq
-		WHERE 1=1 {req_where} GROUP BY jreq.status
-	""", req_args, as_dict=True)
-	req_map = {r.status: r.cnt for r in req_statuses}
-
-	jo_statuses = frappe.db.sql(f"""
-		SELECT jo.status, COUNT(*) as cnt FROM `tabJob Opening` jo
-		WHERE 1=1 {jo_where} GROUP BY jo.status
-	""", jo_args, as_dict=True)
-	jo_map = {r.status: r.cnt for r in jo_statuses}
-
-	ja_statuses = frappe.db.sql(f"""
-		SELECT ja.status, COUNT(*) as cnt
-		FROM `tabJob Applicant` ja
-		JOIN `tabJob Opening` jo ON ja.job_title = jo.name
-		WHERE 1=1 {jo_where}
-		GROUP BY ja.status
-	""", jo_args, as_dict=True)
-	ja_map = {r.status: r.cnt for r in ja_statuses}
-
-	jof_statuses = frappe.db.sql(f"""
-		SELECT jof.status, COUNT(*) as cnt
-		FROM `tabJob Offer` jof
-		JOIN `tabJob Applicant` ja  ON jof.job_applicant = ja.name
-		JOIN `tabJob Opening`   jo  ON ja.job_title = jo.name
-		WHERE jof.docstatus = 1 {jof_where}
-		GROUP BY jof.status
-	""", jof_args, as_dict=True)
-	jof_map = {r.status: r.cnt for r in jof_statuses}
-
-	hired_ew, hired_args = [], {}
-	if resolved:
-		hired_ew.append("e.company = %(company)s")
-		hired_args["company"] = resolved
-	if date_from:
-		hired_ew.append("e.date_of_joining >= %(date_from)s")
-		hired_args["date_from"] = date_from
-	if date_to:
-		hired_ew.append("e.date_of_joining <= %(date_to)s")
-		hired_args["date_to"] = date_to
-	hired_where = (" AND " + " AND ".join(hired_ew)) if hired_ew else ""
 
-	hired = frappe.db.sql(f"""
-		SELECT COUNT(*) as cnt FROM `tabEmployee` e
-		WHERE e.job_applicant IS NOT NULL AND e.job_applicant != '' {hired_where}
-	""", hired_args, as_dict=True)[0].cnt or 0
+def _pct(part, whole):
+	return round(part * 100.0 / whole, 1) if whole else 0
+
+
+@frappe.whitelist()
+def get_recruitment_pipeline(company=None, department=None, date_from=None, date_to=None):
+	resolved = _resolve_company(company)
+	rows = [] if resolved == "__NONE__" else _funnel_rows(resolved, department, date_from, date_to)
+
+	by_status     = {stage: {} for stage in FUNNEL_STAGES}
+	by_department = {}
+	median_days   = {}
+	for r in rows:
+		by_status[r.stage][r.status] = by_status[r.stage].get(r.status, 0) + r.cnt
+		dept = by_department.setdefault(r.department or "Unassigned", dict.fromkeys(FUNNEL_STAGES, 0))
+		dept[r.stage] += r.cnt
+		if r.median_days is not None:
+			median_days[r.stage] = round(r.median_days, 1)
+
+	req_map, jo_map, ja_map, jof_map = (
+		by_status["requisitions"], by_status["openings"], by_status["applicants"], by_status["offers"]
+	)
+	totals = {stage: sum(by_status[stage].values()) for stage in FUNNEL_STAGES}
+	hired  = totals["hired"]
 
 	req_chart = {
 		"Pending":         req_map.get("Pending", 0),
@@ -520,7 +579,7 @@ def get_recruitment_pipeline(company=None, department=None, date_from=None, date
 
 	return {
 		"requisitions": {
-			"total":    sum(req_map.values()),
+			"total":    totals["requisitions"],
 			"pending":  req_map.get("Pending", 0),
 			"approved": req_map.get("Open & Approved", 0),
 			"filled":   req_map.get("Filled", 0),
@@ -528,12 +587,12 @@ def get_recruitment_pipeline(company=None, department=None, date_from=None, date
 			"by_status": req_chart,
 		},
 		"openings": {
-			"total":  sum(jo_map.values()),
+			"total":  totals["openings"],
 			"open":   jo_map.get("Open", 0),
 			"closed": jo_map.get("Closed", 0),
 		},
 		"applicants": {
-			"total":    sum(ja_map.values()),
+			"total":    totals["applicants"],
 			"open":     ja_map.get("Open", 0),
 			"replied":  ja_map.get("Replied", 0),
 			"hold":     ja_map.get("Hold", 0),
@@ -541,12 +600,20 @@ def get_recruitment_pipeline(company=None, department=None, date_from=None, date
 			"rejected": ja_map.get("Rejected", 0),
 		},
 		"offers": {
-			"sent":     sum(jof_map.values()),
+			"sent":     totals["offers"],
 			"accepted": jof_map.get("Accepted", 0),
 			"rejected": jof_map.get("Rejected", 0),
 			"awaiting": jof_map.get("Awaiting Response", 0),
 		},
 		"hired": hired,
+		"conversion": {
+			"applicants_per_opening": round(totals["applicants"] / totals["openings"], 1) if totals["openings"] else 0,
+			"applicant_to_offer":     _pct(totals["offers"], totals["applicants"]),
+			"offer_acceptance":       _pct(jof_map.get("Accepted", 0), totals["offers"]),
+			"accepted_to_hired":      _pct(hired, jof_map.get("Accepted", 0)),
+		},
+		"median_days":   median_days,
+		"by_department": by_department,
 	}
 
 
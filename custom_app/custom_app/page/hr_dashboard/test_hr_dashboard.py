@@ -0,0 +1,169 @@
+# Copyright (c) 2026, . and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from custom_app.custom_app.page.hr_dashboard.hr_dashboard import (
+	_attrition_counts,
+	_headcount_by_department,
+	_trend_buckets,
+)
+
+
+# ─────────────────────────────────────────────────────────────────
+# Pure-Python reference: the same counters computed row by row
+# ─────────────────────────────────────────────────────────────────
+def _employees():
+	return frappe.get_all(
+		"Employee",
+		fields=["department", "status", "custom_type", "date_of_joining", "relieving_date"],
+	)
+
+
+def _between(value, start, end):
+	return value is not None and start <= getdate(value) <= end
+
+
+def _active_on(emp, day):
+	return (
+		emp.date_of_joining is not None
+		and getdate(emp.date_of_joining) <= day
+		and (emp.relieving_date is None or getdate(emp.relieving_date) >= day)
+	)
+
+
+def reference_attrition_counts(employees, start, end, buckets):
+	return {
+		"start_count":  sum(1 for e in employees if _active_on(e, start)),
+		"end_count":    sum(1 for e in employees if _active_on(e, end)),
+		"separations":  sum(1 for e in employees if _between(e.relieving_date, start, end)),
+		"missing_date": sum(
+			1 for e in employees if e.status in ("Left", "Inactive") and not e.relieving_date
+		),
+		"trend": [
+			sum(1 for e in employees if _between(e.relieving_date, m_start, m_end))
+			for m_start, m_end in buckets
+		],
+	}
+
+
+def reference_headcount(employees, start, end, buckets):
+	depts = {}
+	for e in employees:
+		d = depts.setdefault("Unassigned" if e.department is None else e.department, {
+			"total": 0, "teaching": 0, "non_teaching": 0, "joined": [0] * len(buckets),
+		})
+		active = (
+			e.date_of_joining is not None
+			and getdate(e.date_of_joining) <= end
+			and (e.relieving_date is None or getdate(e.relieving_date) >= start)
+		)
+		if active:
+			d["total"] += 1
+			d["teaching"] += e.custom_type == "Teaching"
+			d["non_teaching"] += e.custom_type == "Non-Teaching"
+		for i, (m_start, m_end) in enumerate(buckets):
+			d["joined"][i] += _between(e.date_of_joining, m_start, m_end)
+	return depts
+
+
+class TestHRDashboard(FrappeTestCase):
+	windows = [
+		(getdate("2025-01-01"), getdate("2025-12-31")),
+		(getdate("2026-04-01"), getdate("2026-06-30")),
+	]
+
+	def setUp(self):
+		self.company = frappe.db.get_value("Company", {}, "name", order_by="creation asc")
+		self.department = frappe.get_doc({
+			"doctype": "Department",
+			"department_name": "HR Dashboard Test",
+			"company": self.company,
+		}).insert(ignore_permissions=True, ignore_if_duplicate=True).name
+		self.make_fixture_employees()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def make_employee(self, date_of_joining, department=None, custom_type="Teaching", relieving_date=None, status=None):
+		doc = frappe.get_doc({
+			"doctype": "Employee",
+			"first_name": "HR Dashboard Test",
+			"gender": "Female",
+			"date_of_birth": "1980-01-01",
+			"company": self.company,
+			"department": department,
+			"custom_type": custom_type,
+			"date_of_joining": date_of_joining,
+			"relieving_date": relieving_date,
+			"status": "Left" if relieving_date else "Active",
+		}).insert(ignore_permissions=True)
+		if status:
+			# Left / Inactive without a relieving date cannot be saved through validate
+			doc.db_set("status", status)
+		return doc
+
+	def make_fixture_employees(self):
+		# Relieved exactly on each window boundary
+		for start, end in self.windows:
+			self.make_employee("2020-01-15", self.department, "Teaching", relieving_date=start)
+			self.make_employee("2020-01-15", None, "Non-Teaching", relieving_date=end)
+
+		# No department, both types, still active
+		self.make_employee("2019-06-01", None, "Teaching")
+		self.make_employee("2019-06-01", self.department, "Non-Teaching")
+
+		# Left / Inactive with no relieving date
+		self.make_employee("2018-03-01", self.department, "Teaching", status="Left")
+		self.make_employee("2018-03-01", None, "Non-Teaching", status="Inactive")
+
+		# A joiner in every trend bucket, and a separation in every other one
+		for i, (m_start, m_end) in enumerate(_trend_buckets(24)):
+			self.make_employee(
+				m_start,
+				None if i % 3 == 0 else self.department,
+				"Teaching" if i % 2 else "Non-Teaching",
+			)
+			if i % 2 == 0:
+				self.make_employee("2020-01-15", self.department, "Teaching", relieving_date=m_start)
+
+	def test_attrition_counts_match_reference(self):
+		employees = _employees()
+		for trend_months in (6, 24):
+			buckets = _trend_buckets(trend_months)
+			for start, end in self.windows:
+				counts = _attrition_counts(start, end, buckets)
+				self.assertEqual(counts, reference_attrition_counts(employees, start, end, buckets))
+
+				# The fixtures alone make every one of these non-zero
+				self.assertGreaterEqual(counts["separations"], 2)
+				self.assertGreaterEqual(counts["missing_date"], 2)
+				self.assertGreater(counts["start_count"], 0)
+				self.assertTrue(any(counts["trend"]))
+
+	def test_headcount_matches_reference(self):
+		employees = _employees()
+		for trend_months in (6, 24):
+			buckets = _trend_buckets(trend_months)
+			for start, end in self.windows:
+				rows = _headcount_by_department(start, end, buckets)
+				expected = reference_headcount(employees, start, end, buckets)
+
+				merged = {}
+				for r in rows:
+					d = merged.setdefault(r["department"], {
+						"total": 0, "teaching": 0, "non_teaching": 0, "joined": [0] * len(buckets),
+					})
+					for key in ("total", "teaching", "non_teaching"):
+						d[key] += r[key]
+					d["joined"] = [a + b for a, b in zip(d["joined"], r["joined"])]
+
+				self.assertEqual(merged, expected)
+
+				unassigned = merged["Unassigned"]
+				self.assertGreater(unassigned["teaching"], 0)
+				self.assertGreater(unassigned["non_teaching"], 0)
+				self.assertTrue(all(merged[self.department]["joined"][i] or unassigned["joined"][i]
+					for i in range(len(buckets))))
@@ -9,17 +9,26 @@ frappe.pages['payslip-uploader'].on_page_load = function (wrapper) {
 };
 
 const JOB_KEY_STORAGE_KEY = 'payslip_uploader_active_job_key';
-const POLL_INTERVAL_MS = 4000;
+const PROGRESS_EVENT = 'payslip_import_progress';
 
 class PayslipUploader {
 	constructor(page) {
 		this.page = page;
 		this.job_key = null;
-		this.poll_timer = null;
 		this.make_ui();
+		this.subscribe_progress();
 		this.restore_active_job();
 	}
 
+	// Progress is pushed by the worker over realtime -- no polling.
+	subscribe_progress() {
+		frappe.realtime.off(PROGRESS_EVENT);
+		frappe.realtime.on(PROGRESS_EVENT, (data) => {
+			if (!data || !this.job_key || data.job_key !== this.job_key) return;
+			this.handle_status(data);
+		});
+	}
+
 	make_ui() {
 		this.$body = $(`
 			<div class="payslip-uploader-wrapper" style="max-width: 800px; margin: 20px auto;">
@@ -37,8 +46,9 @@ class PayslipUploader {
 					<br><br>
 					Processing runs as a background job, since a batch can
 					contain any number of employees. While a batch is
-					running, the fields below are locked and you can check
-					progress with the Refresh button until it finishes.
+					running, the fields below are locked and progress
+					updates live; use the Refresh button if it ever looks
+					stuck.
 				</div>
 
 				<div class="form-group batch-type-field-wrapper"></div>
@@ -184,7 +194,6 @@ class PayslipUploader {
 		this.job_key = job_key;
 		localStorage.setItem(JOB_KEY_STORAGE_KEY, job_key);
 		this.freeze_fields();
-		this.start_polling();
 	}
 
 	restore_active_job() {
@@ -194,19 +203,6 @@ class PayslipUploader {
 		this.freeze_fields();
 		this.render_status(`<div class="text-muted">Checking status of the batch already in progress...</div>`);
 		this.check_status();
-		this.start_polling();
-	}
-
-	start_polling() {
-		this.stop_polling();
-		this.poll_timer = setInterval(() => this.check_status(), POLL_INTERVAL_MS);
-	}
-
-	stop_polling() {
-		if (this.poll_timer) {
-			clearInterval(this.poll_timer);
-			this.poll_timer = null;
-		}
 	}
 
 	check_status() {
@@ -237,7 +233,6 @@ class PayslipUploader {
 		}
 
 		if (status.status === 'success') {
-			this.stop_polling();
 			this.render_status('');
 			this.render_results(status.summary);
 			this.job_key = null;
@@ -247,7 +242,6 @@ class PayslipUploader {
 		}
 
 		if (status.status === 'failed') {
-			this.stop_polling();
 			this.render_status(`
 				<div class="alert alert-danger">
 					The batch failed before it could finish: ${frappe.utils.escape_html(status.error || 'Unknown error')}.
@@ -278,10 +272,15 @@ class PayslipUploader {
 		const created = summary.created || [];
 		const skipped = summary.skipped || [];
 		const errors = summary.errors || [];
+		// Background runs store a compact summary: capped lists + full counts
+		const created_count = summary.created_count != null ? summary.created_count : created.length;
+		const unchanged_count = summary.unchanged_count != null
+			? summary.unchanged_count
+			: (summary.unchanged || []).length;
 
 		let html = `
 			<div class="alert alert-success">
-				<b>${created.length}</b> record(s) created/updated successfully.
+				<b>${created_count}</b> record(s) created/updated successfully.
 			</div>
 		`;
 
@@ -293,6 +292,14 @@ class PayslipUploader {
 			`, ['File', 'Doctype', 'Record']);
 		}
 
+		if (created_count > created.length) {
+			html += `<div class="text-muted small">Showing the first ${created.length} of ${created_count} records.</div>`;
+		}
+
+		if (unchanged_count) {
+			html += `<div class="alert alert-info"><b>${unchanged_count}</b> file(s) unchanged since the last import (identical content, not re-attached).</div>`;
+		}
+
 		if (skipped.length) {
 			html += `<div class="alert alert-warning"><b>${skipped.length}</b> file(s) skipped (no matching employee, bad filename, or wrong password):</div>`;
 			html += this.build_table(skipped, (row) => `
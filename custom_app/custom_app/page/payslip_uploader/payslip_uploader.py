@@ -8,26 +8,33 @@ contain an unknown, potentially large number of employees -- we don't
 want to hold a web worker (or the browser) hostage for the whole run,
 and long zip extractions risk hitting the http request timeout.
 
-Job progress/results are tracked in frappe.cache() under a random
-job_key rather than a new doctype -- it's transient, per-run data that
-doesn't need to be queried, listed, or reported on later. Entries expire
-automatically after JOB_CACHE_EXPIRY seconds so nothing accumulates.
+Live progress is pushed to the browser with frappe.publish_realtime,
+throttled to one event every PROGRESS_EVERY_N_FILES files or
+PROGRESS_INTERVAL_MS milliseconds, so a batch of thousands of PDFs costs
+a handful of socket messages instead of a cache write per file plus
+constant polling. Only the job's lifecycle (queued / running / final
+compact summary) is written to frappe.cache() under a random job_key --
+a few writes per run -- so a reloaded page can still find out how its
+batch ended. Entries expire automatically after JOB_CACHE_EXPIRY seconds
+so nothing accumulates.
 
 Flow:
     1. JS uploads the zip via the standard FileUploader.
     2. JS calls start_import(), which validates inputs, generates a
        job_key, seeds its status as "queued", enqueues run_import_job(),
        and returns the job_key immediately.
-    3. JS freezes the form and polls get_import_status(job_key) (both on
-       a timer and via a manual Refresh button) until status is
-       "success" or "failed".
+    3. JS freezes the form and listens for PROGRESS_EVENT messages for
+       its job_key until status is "success" or "failed". The Refresh
+       button (and a page reload) reads get_import_status(job_key) once.
     4. run_import_job() does the actual extraction work via
-       process_zip_file(), updating the cached status as it goes so the
-       UI can show "X of Y processed", and always cleans up the
-       uploaded zip File doc afterwards -- whether it succeeded or not.
+       process_zip_file(), publishing throttled "X of Y processed" events
+       as it goes, stores the compact final summary once, and always
+       cleans up the uploaded zip File doc afterwards -- whether it
+       succeeded or not.
 """
 
 import json
+import time
 
 import frappe
 
@@ -47,6 +54,14 @@ JOB_CACHE_EXPIRY = 60 * 60 * 24  # 24 hours -- generous, just to avoid stale ent
 # anything bigger goes through the background worker as before.
 SYNC_PROCESSING_LIMIT = 10
 
+PROGRESS_EVENT = "payslip_import_progress"
+PROGRESS_EVERY_N_FILES = 25
+PROGRESS_INTERVAL_MS = 1000
+
+# The stored final summary lists at most this many created/unchanged
+# files; the full counts are always kept.
+SUMMARY_LIST_LIMIT = 200
+
 
 # ---------------------------------------------------------------------------
 # whitelisted endpoints
@@ -58,7 +73,7 @@ def start_import(file_url, batch_type, zip_password):
 	Called from payslip_uploader.js right after the zip has been
 	uploaded via Frappe's standard File Uploader. Validates the inputs,
 	kicks off a background job to do the actual work, and returns a
-	job_key the client polls for status.
+	job_key the client listens on for progress.
 	"""
 	frappe.only_for(ALLOWED_ROLES)
 
@@ -113,6 +128,7 @@ def start_import(file_url, batch_type, zip_password):
 		file_doc_name=file_doc.name,
 		batch_type=batch_type,
 		zip_password=zip_password,
+		notify_user=frappe.session.user,
 	)
 
 	return {"job_key": job_key}
@@ -120,7 +136,11 @@ def start_import(file_url, batch_type, zip_password):
 
 @frappe.whitelist()
 def get_import_status(job_key):
-	"""Polled by the client to check on a job started via start_import()."""
+	"""
+	Read once by the client (page load / Refresh button) to check on a
+	job started via start_import(); live progress arrives as realtime
+	PROGRESS_EVENT messages instead.
+	"""
 	frappe.only_for(ALLOWED_ROLES)
 
 	status = _get_job_status(job_key)
@@ -131,7 +151,7 @@ def get_import_status(job_key):
 		# clears its stored job_key and lets the user start a new batch.
 		frappe.log_error(
 			title="Paysquare Import: Job Expired",
-			message=f"Job {job_key} was polled but its status is no longer in cache "
+			message=f"Job {job_key} was checked but its status is no longer in cache "
 			f"(expired after {JOB_CACHE_EXPIRY}s or never existed). Marked as failed.",
 		)
 		return {
@@ -149,14 +169,17 @@ def get_import_status(job_key):
 # background job target (not whitelisted -- only reachable via frappe.enqueue)
 # ---------------------------------------------------------------------------
 
-def run_import_job(job_key, file_path, file_doc_name, batch_type, zip_password):
+def run_import_job(job_key, file_path, file_doc_name, batch_type, zip_password, notify_user=None):
 	"""
 	Runs in the "long" worker queue. Does the actual extraction/matching
-	via process_zip_file(), keeping the cached job status up to date so
-	the UI can show progress, then always deletes the uploaded zip File
-	doc regardless of outcome -- a batch, once attempted, shouldn't sit
+	via process_zip_file(), publishing throttled realtime progress to
+	notify_user (see ProgressPublisher), stores the compact final summary
+	in cache once, then always deletes the uploaded zip File doc
+	regardless of outcome -- a batch, once attempted, shouldn't sit
 	around in the File list either way.
 	"""
+	publisher = ProgressPublisher(job_key, notify_user)
+
 	_set_job_status(job_key, {
 		"status": "running",
 		"processed": 0,
@@ -167,22 +190,18 @@ def run_import_job(job_key, file_path, file_doc_name, batch_type, zip_password):
 
 	try:
 		try:
-			total = count_pdf_entries(file_path)
-			_update_job_status(job_key, total=total)
+			publisher.publish(0, count_pdf_entries(file_path), force=True)
 		except Exception:
 			# If we can't even count entries the zip is likely unreadable --
 			# let process_zip_file below surface that properly.
 			pass
 
-		def report_progress(processed, total):
-			_update_job_status(job_key, processed=processed, total=total)
-
-		summary = process_zip_file(file_path, batch_type, zip_password, progress_callback=report_progress)
-		_update_job_status(job_key, status="success", summary=summary)
+		summary = process_zip_file(file_path, batch_type, zip_password, progress_callback=publisher.publish)
+		publisher.finish("success", summary=_compact_summary(summary))
 
 	except Exception:
 		frappe.log_error(title="Paysquare Import: Job Failed", message=frappe.get_traceback())
-		_update_job_status(job_key, status="failed", error=frappe.get_traceback(with_context=False)[-500:])
+		publisher.finish("failed", error=frappe.get_traceback(with_context=False)[-500:])
 
 	finally:
 		frappe.db.commit()
@@ -193,6 +212,68 @@ def run_import_job(job_key, file_path, file_doc_name, batch_type, zip_password):
 			frappe.db.rollback()
 
 
+class ProgressPublisher:
+	"""
+	Pushes "X of Y" progress for one job over realtime, throttled to one
+	event per PROGRESS_EVERY_N_FILES files or PROGRESS_INTERVAL_MS ms
+	(whichever comes first). The last file of a batch is always published.
+	"""
+
+	def __init__(self, job_key, user):
+		self.job_key = job_key
+		self.user = user
+		self.last_processed = 0
+		self.last_sent_at = 0.0
+		self.total = None
+
+	def publish(self, processed, total, force=False):
+		self.total = total
+		now = time.monotonic()
+		due = (
+			force
+			or processed == total
+			or processed - self.last_processed >= PROGRESS_EVERY_N_FILES
+			or (now - self.last_sent_at) * 1000 >= PROGRESS_INTERVAL_MS
+		)
+		if not due:
+			return
+
+		self.last_processed = processed
+		self.last_sent_at = now
+		self._emit({"status": "running", "processed": processed, "total": total})
+
+	def finish(self, status, summary=None, error=None):
+		data = {
+			"status": status,
+			"processed": self.last_processed,
+			"total": self.total,
+			"summary": summary,
+			"error": error,
+		}
+		# Stored once so a reloaded page can still pick up the outcome
+		_set_job_status(self.job_key, data)
+		self._emit(data)
+
+	def _emit(self, data):
+		if not self.user:
+			return
+		frappe.publish_realtime(PROGRESS_EVENT, {"job_key": self.job_key, **data}, user=self.user)
+
+
+def _compact_summary(summary):
+	"""
+	Keeps skipped/error rows (the user needs each reason) but caps the
+	created/unchanged lists, adding their full counts.
+	"""
+	return {
+		"created": summary["created"][:SUMMARY_LIST_LIMIT],
+		"created_count": len(summary["created"]),
+		"unchanged_count": len(summary.get("unchanged", [])),
+		"skipped": summary["skipped"],
+		"errors": summary["errors"],
+	}
+
+
 # ---------------------------------------------------------------------------
 # cache helpers
 # ---------------------------------------------------------------------------
@@ -212,9 +293,3 @@ def _get_job_status(job_key):
 	if isinstance(raw, bytes):
 		raw = raw.decode()
 	return json.loads(raw)
-
-
-def _update_job_status(job_key, **kwargs):
-	data = _get_job_status(job_key) or {}
-	data.update(kwargs)
-	_set_job_status(job_key, data)
\ No newline at end of file
@@ -596,7 +596,7 @@ class PurchaseTimeline {
 	// LOAD FILTER OPTIONS
 	// ─────────────────────────────────────────────────────────────
 	_loadFilterOptions() {
-		frappe.call({
+		custom_app.filter_options.call({
 			method: "custom_app.custom_app.page.purchase_timeline.purchase_timeline.get_filter_options",
 			callback: (r) => {
 				if (r.message) {
@@ -1,17 +1,15 @@
 import frappe
 from frappe import _
 
+from custom_app.api.filter_options import filter_options_response
+from custom_app.api.procurement_search import search_documents
+from custom_app.permissions.permission_scope import get_company_scope
+
 
 # ─────────────────────────────────────────────────────────────────
 # PERMISSION HELPERS
 # ─────────────────────────────────────────────────────────────────
 
-def _all_companies():
-    return [r.name for r in frappe.db.sql(
-        "SELECT name FROM `tabCompany` ORDER BY name", as_dict=True
-    )]
-
-
 def _get_permitted_companies():
     """
     Returns (companies_list, lock_company).
@@ -20,27 +18,13 @@ def _get_permitted_companies():
     Institution Head → User-Permission-scoped companies, lock=True
                        BUT if no user permissions configured → all companies, lock=False
     Others           → blocked at page level (roles config); raises PermissionError
+
+    Served from the cached permission scope (see get_company_scope).
     """
     roles = frappe.get_roles(frappe.session.user)
 
-    if "System Manager" in roles:
-        return _all_companies(), False
-
-    if "Institution Head" in roles:
-        from frappe.permissions import get_user_permissions
-        permitted = get_user_permissions(frappe.session.user).get("Company", [])
-        names = [p.get("doc") for p in permitted if p.get("doc")]
-
-        if not names:
-            # No user permissions configured → grant access to all companies
-            return _all_companies(), False
-
-        placeholders = ", ".join(["%s"] * len(names))
-        companies = [r.name for r in frappe.db.sql(
-            f"SELECT name FROM `tabCompany` WHERE name IN ({placeholders}) ORDER BY name",
-            names, as_dict=True
-        )]
-        return companies, True  # locked to their permitted set
+    if "System Manager" in roles or "Institution Head" in roles:
+        return get_company_scope()
 
     # Should not be reachable given page roles config, but be safe
     frappe.throw(_("Not permitted"), frappe.PermissionError)
@@ -51,29 +35,29 @@ def _get_permitted_companies():
 # ─────────────────────────────────────────────────────────────────
 
 @frappe.whitelist()
-def get_filter_options():
+def get_filter_options(etag=None):
     companies, lock_company = _get_permitted_companies()
-
-    cost_centers = frappe.db.sql(
-        "SELECT name FROM `tabCost Center` WHERE is_group=0 ORDER BY name", as_dict=True
-    )
-    suppliers = frappe.db.sql(
-        "SELECT name FROM `tabSupplier` ORDER BY name", as_dict=True
-    )
+    approval_statuses = _get_approval_statuses()
 
     # MR statuses from workflow
     mr_statuses = ["Draft", "Verified", "Approved by Manager", "Rejected", "Cancelled"]
     po_statuses = ["Draft", "Approved", "Rejected", "Cancelled"]
 
-    return {
-        "companies": companies,
-        "cost_centers": [r.name for r in cost_centers],
-        "suppliers": [r.name for r in suppliers],
-        "mr_statuses": mr_statuses,
-        "po_statuses": po_statuses,
-        "approval_statuses": _get_approval_statuses(),
-        "lock_company": lock_company,
-    }
+    def build(lists):
+        return {
+            "companies": companies,
+            "cost_centers": lists["Cost Center"],
+            "suppliers": lists["Supplier"],
+            "mr_statuses": mr_statuses,
+            "po_statuses": po_statuses,
+            "approval_statuses": approval_statuses,
+            "lock_company": lock_company,
+        }
+
+    return filter_options_response(
+        etag, ["Cost Center", "Supplier"], build,
+        companies=companies, lock_company=lock_company, approval_statuses=approval_statuses,
+    )
 
 
 # "Search by" type key -> doctype, for the doctypes that actually carry a
@@ -87,15 +71,19 @@ _WORKFLOW_TYPE_DOCTYPE_MAP = {
 }
 
 
+# Workflow states per type key, rebuilt on Workflow changes.
+APPROVAL_STATUSES_CACHE_KEY = "custom_app:purchase_timeline_approval_statuses"
+
+
 def _get_approval_statuses():
     """
-    Distinct workflow_state (approval status) values actually in use,
-    grouped BY "Search by" type key (mr / po / pi).
+    Workflow states (approval statuses) grouped BY "Search by" type key
+    (mr / po / pi), taken from each doctype's active Workflow.
 
-    Only doctypes with a workflow attached are included, and only the
-    states that are actually in use for that specific doctype are
-    returned -- this powers a per-type "Approval Status" filter on the
-    frontend instead of one flat, type-agnostic list.
+    Only doctypes with a workflow attached are included -- this powers a
+    per-type "Approval Status" filter on the frontend instead of one flat,
+    type-agnostic list. Cached until a Workflow is saved or deleted, so
+    opening the page never scans the transaction tables.
 
     Returns e.g.:
         {
@@ -103,149 +91,99 @@ def _get_approval_statuses():
             "po": ["Approved", "Draft", "Rejected"],
             "pi": ["Draft", "Submitted"],
         }
-    A type key is omitted entirely if that doctype has no workflow_state
-    column, or has the column but no non-empty values in use.
+    A type key is omitted entirely if that doctype has no active workflow.
     """
-    result = {}
-    for type_key, doctype in _WORKFLOW_TYPE_DOCTYPE_MAP.items():
-        # workflow_state is a standard field on workflow-enabled doctypes;
-        # guard in case a given doctype has no workflow attached here.
-        if not frappe.db.has_column(doctype, "workflow_state"):
-            continue
-        rows = frappe.db.sql(
-            f"""
-            SELECT DISTINCT workflow_state
-            FROM `tab{doctype}`
-            WHERE workflow_state IS NOT NULL AND workflow_state != ''
-            """,
-            as_dict=True,
-        )
-        states = sorted({r.workflow_state for r in rows})
-        if states:
-            result[type_key] = states
-    return result
+    return frappe.cache().get_value(
+        APPROVAL_STATUSES_CACHE_KEY, generator=_build_approval_statuses
+    )
+
+
+def _build_approval_statuses():
+    doctype_type_keys = {doctype: key for key, doctype in _WORKFLOW_TYPE_DOCTYPE_MAP.items()}
+    rows = frappe.db.sql(
+        """
+        SELECT w.document_type, s.state
+        FROM `tabWorkflow` w
+        JOIN `tabWorkflow Document State` s
+            ON s.parent = w.name AND s.parenttype = 'Workflow'
+        WHERE w.is_active = 1 AND w.document_type IN %(doctypes)s
+        """,
+        {"doctypes": list(doctype_type_keys)},
+        as_dict=True,
+    )
+
+    states = {}
+    for r in rows:
+        if r.state:
+            states.setdefault(doctype_type_keys[r.document_type], set()).add(r.state)
+    return {key: sorted(values) for key, values in states.items()}
+
+
+def clear_approval_statuses_cache(doc=None, method=None):
+    """Workflow on_update / on_trash hook."""
+    frappe.cache().delete_value(APPROVAL_STATUSES_CACHE_KEY)
 
 
 # ─────────────────────────────────────────────────────────────────
 # SEARCH HELPERS - list docs for filter dropdowns
+#
+# Served by the Procurement Search Term index (see
+# custom_app.api.procurement_search): a typed fragment matches anywhere
+# in document names, suppliers and employees.
 # ─────────────────────────────────────────────────────────────────
 
 @frappe.whitelist()
 def search_material_requests(txt="", company=None, cost_center=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if cost_center:
-        filters["custom_cost_center"] = cost_center
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Material Request",
-        filters=filters,
+    return search_documents(
+        "Material Request", txt,
         fields=["name", "transaction_date", "workflow_state", "custom_employee"],
-        order_by="transaction_date desc",
-        limit=limit,
+        company=company, cost_center=cost_center, limit=limit,
     )
-    return docs
 
 
 @frappe.whitelist()
 def search_purchase_orders(txt="", company=None, supplier=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if supplier:
-        filters["supplier"] = supplier
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Purchase Order",
-        filters=filters,
+    return search_documents(
+        "Purchase Order", txt,
         fields=["name", "transaction_date", "workflow_state", "supplier"],
-        order_by="transaction_date desc",
-        limit=limit,
+        company=company, supplier=supplier, limit=limit,
     )
-    return docs
 
 
 @frappe.whitelist()
 def search_purchase_invoices(txt="", company=None, supplier=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if supplier:
-        filters["supplier"] = supplier
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Purchase Invoice",
-        filters=filters,
+    return search_documents(
+        "Purchase Invoice", txt,
         fields=["name", "posting_date", "workflow_state", "supplier"],
-        order_by="posting_date desc",
-        limit=limit,
+        company=company, supplier=supplier, limit=limit,
     )
-    return docs
 
 
 @frappe.whitelist()
 def search_purchase_receipts(txt="", company=None, supplier=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if supplier:
-        filters["supplier"] = supplier
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Purchase Receipt",
-        filters=filters,
+    return search_documents(
+        "Purchase Receipt", txt,
         fields=["name", "posting_date", "supplier"],
-        order_by="posting_date desc",
-        limit=limit,
+        company=company, supplier=supplier, limit=limit,
     )
-    return docs
 
 
 @frappe.whitelist()
 def search_supplier_quotations(txt="", company=None, supplier=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if supplier:
-        filters["supplier"] = supplier
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Supplier Quotation",
-        filters=filters,
+    return search_documents(
+        "Supplier Quotation", txt,
         fields=["name", "transaction_date", "supplier"],
-        order_by="transaction_date desc",
-        limit=limit,
+        company=company, supplier=supplier, limit=limit,
     )
-    return docs
 
 
 @frappe.whitelist()
 def search_rfqs(txt="", company=None, limit=20):
-    filters = {"docstatus": ["!=", 2]}
-    if company:
-        filters["company"] = company
-    if txt:
-        filters["name"] = ["like", f"%{txt}%"]
-
-    docs = frappe.get_all(
-        "Request for Quotation",
-        filters=filters,
+    return search_documents(
+        "Request for Quotation", txt,
         fields=["name", "transaction_date"],
-        order_by="transaction_date desc",
-        limit=limit,
+        company=company, limit=limit,
     )
-    return docs
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -44,7 +44,7 @@ frappe.query_reports["Budget Version History Report"] = {
             "label": __("Account"),
             "fieldtype": "Link",
             "options": "Account",
-            "reqd": 1,
+            "depends_on": "eval:!doc.all_accounts",
 			get_query: function () {
 				let company = frappe.query_report.get_filter_value("company");
 
@@ -58,6 +58,12 @@ frappe.query_reports["Budget Version History Report"] = {
 					}
 				};
 			}
+        },
+        {
+            "fieldname": "all_accounts",
+            "label": __("All Accounts"),
+            "fieldtype": "Check",
+            "default": 0
         }
 	]
 };
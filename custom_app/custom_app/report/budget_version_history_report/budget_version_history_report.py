@@ -4,28 +4,59 @@
 import frappe
 from frappe import _
 
+REALLOCATION_FIELDS = [
+	"name",
+	"account",
+	"month",
+	"current_budget",
+	"new_budget",
+	"total_annual_budget",
+	"new_total_annual_budget",
+	"reason",
+	"old_budget_link",
+	"new_budget_link",
+	"approver",
+	"approval_date",
+]
+
 
 def execute(filters=None):
 	filters = filters or {}
 
 	validate_filters(filters)
 
-	budget, base_annual_budget = get_budget(filters)
+	budget_accounts = get_budget_accounts(filters)
+
+	# One query for every submitted reallocation of this cost center / year;
+	# chains are then walked in memory instead of one query per hop.
+	walker = ReallocationChainWalker(filters)
+
 	rows = []
+	for budget_account in budget_accounts:
+		history = get_history_rows(
+			walker, budget_account.budget, budget_account.account, budget_account.budget_amount
+		)
+		if filters.get("all_accounts"):
+			for row in history:
+				row["account"] = budget_account.account
+		rows.extend(history)
 
-	# Initial new budget link = selected budget
-	current_new_budget_link = budget.name
+	return get_columns(filters), rows
 
-	reallocation = get_reallocation_by_new_link(current_new_budget_link)
+
+def get_history_rows(walker, budget_name, account, base_annual_budget):
+	"""
+	Version history of *account* on *budget_name*, newest reallocation
+	first, ending with a terminal row for the original budget.
+	"""
+	chain = walker.walk(budget_name, account)
 
 	# CASE: No Budget Reallocation
-	if not reallocation:
-		rows.append(make_empty_row(base_annual_budget, current_new_budget_link))
-		return get_columns(), rows
+	if not chain:
+		return [make_empty_row(base_annual_budget, budget_name)]
 
-	last_new_annual_budget = None
-    
-	while reallocation:
+	rows = []
+	for reallocation in chain:
 		rows.append({
 			"month": reallocation.month or "-",
 			"old_budget": reallocation.current_budget or "-",
@@ -34,91 +65,131 @@ def execute(filters=None):
 			"new_annual_budget": reallocation.new_total_annual_budget or "-",
 			"reason": reallocation.reason or "-",
 			"old_budget_link": reallocation.old_budget_link or "-",
-			"new_budget_link": current_new_budget_link,
-            "approver": reallocation.approver or "-",
-            "approval_date": reallocation.approval_date or "-",
+			"new_budget_link": reallocation.new_budget_link,
+			"approver": reallocation.approver or "-",
+			"approval_date": reallocation.approval_date or "-",
 		})
 
-		last_new_annual_budget = reallocation.total_annual_budget
+	# Terminal row, from this account's earliest reallocation
+	rows.append(make_empty_row(chain[-1].total_annual_budget, chain[-1].old_budget_link))
+
+	return rows
+
+
+class ReallocationChainWalker:
+	"""
+	Walks Budget Reallocation chains (new_budget_link → old_budget_link)
+	for one company / cost center / fiscal year. All submitted
+	reallocations are fetched once and indexed by new_budget_link, so any
+	number of chains of any length cost a single query.
+
+	Every reallocation amends the whole Budget, whichever account it
+	changed, so the chain is followed at budget level and only then
+	narrowed to the hops of one account.
+	"""
+
+	def __init__(self, filters, reallocations=None):
+		if reallocations is None:
+			reallocations = frappe.get_all(
+				"Budget Reallocation",
+				filters={
+					"company": filters.get("company"),
+					"cost_center": filters.get("cost_center"),
+					"fiscal_year": filters.get("fiscal_year"),
+					"docstatus": 1,
+				},
+				fields=REALLOCATION_FIELDS,
+				order_by="creation desc",
+			)
+
+		self.by_new_link = {}
+		for reallocation in reallocations:
+			if reallocation.new_budget_link:
+				# Latest reallocation wins if several point at the same budget
+				self.by_new_link.setdefault(reallocation.new_budget_link, reallocation)
 
-		# Move backward
-		current_new_budget_link = reallocation.old_budget_link
-		reallocation = get_reallocation_by_new_link(current_new_budget_link)
+	def walk(self, budget_name, account=None):
+		"""
+		Return the chain ending at *budget_name*, newest first. With
+		*account*, only the reallocations of that account are returned.
+		"""
+		chain = []
+		seen = set()
 
-	# Terminal row
-	rows.append(make_empty_row(last_new_annual_budget, current_new_budget_link))
+		reallocation = self.by_new_link.get(budget_name)
+		while reallocation and reallocation.name not in seen:
+			seen.add(reallocation.name)
+			chain.append(reallocation)
 
-	return get_columns(), rows
+			# Move backward
+			reallocation = self.by_new_link.get(reallocation.old_budget_link)
+
+		if account:
+			chain = [r for r in chain if r.account == account]
+
+		return chain
 
 # ========================================================
 # Helper Functions
 # ========================================================
 
 def validate_filters(filters):
-    required_filters = ["company", "cost_center", "fiscal_year", "account"]
+    required_filters = ["company", "cost_center", "fiscal_year"]
+    if not filters.get("all_accounts"):
+        required_filters.append("account")
 
     for field in required_filters:
         if not filters.get(field):
             frappe.throw(_("Missing required filter: {0}").format(field))
 
 
-def get_budget(filters):
+def get_budget_accounts(filters):
 	"""
-	Validate budget existence and return it
+	Return (budget, account, budget_amount) for the selected account -- or
+	for every account in multi-account mode -- from one join over Budget /
+	Budget Account. Throws if nothing matches.
 	"""
-	budgets = frappe.get_all(
-		"Budget",
-		{
-			"company": filters.get("company"),
-			"cost_center": filters.get("cost_center"),
-			"fiscal_year": filters.get("fiscal_year"),
-			"docstatus": 1
-		},
-		["name"],
+	conditions = ""
+	values = {
+		"company": filters.get("company"),
+		"cost_center": filters.get("cost_center"),
+		"fiscal_year": filters.get("fiscal_year"),
+	}
+	if not filters.get("all_accounts"):
+		conditions = "AND ba.account = %(account)s"
+		values["account"] = filters.get("account")
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT b.name AS budget, ba.account, ba.budget_amount
+		FROM `tabBudget` b
+		JOIN `tabBudget Account` ba ON ba.parent = b.name AND ba.parenttype = 'Budget'
+		WHERE b.company = %(company)s
+			AND b.cost_center = %(cost_center)s
+			AND b.fiscal_year = %(fiscal_year)s
+			AND b.docstatus = 1
+			AND IFNULL(ba.budget_amount, 0) != 0
+			{conditions}
+		ORDER BY ba.account, b.modified DESC
+		""",
+		values,
+		as_dict=True,
 	)
-	print(budgets)
-	for budget in budgets:
-		budget_amount = frappe.db.get_value("Budget Account",
-			{
-				"parent": budget.name,
-				"account": filters.get("account")
-			},
-			["budget_amount"]
-		)
-		if budget_amount:
-			budget_doc = frappe.get_doc("Budget", budget)
-			return budget_doc, budget_amount
-	frappe.throw(
-				_("No Budget exists for selected Company, Cost Center, Fiscal Year and Account")
-			)
 
-def get_reallocation_by_new_link(budget_name):
-    """
-    Fetch Budget Reallocation using new_budget_link
-    """
-    if not budget_name:
-        return None
+	# First matching budget per account
+	budget_accounts = []
+	seen_accounts = set()
+	for row in rows:
+		if row.account not in seen_accounts:
+			seen_accounts.add(row.account)
+			budget_accounts.append(row)
 
-    return frappe.db.get_value(
-        "Budget Reallocation",
-        {
-            "new_budget_link": budget_name,
-            "docstatus": 1
-        },
-        [
-            "name",
-            "month",
-            "current_budget",
-            "new_budget",
-            "total_annual_budget",
-            "new_total_annual_budget",
-            "reason",
-            "old_budget_link",
-            "approver",
-            "approval_date"
-        ],
-        as_dict=True
-    )
+	if not budget_accounts:
+		frappe.throw(
+			_("No Budget exists for selected Company, Cost Center, Fiscal Year and Account")
+		)
+
+	return budget_accounts
 
 
 def make_empty_row(annual_budget, new_budget_link):
@@ -139,8 +210,8 @@ def make_empty_row(annual_budget, new_budget_link):
     }
 
 
-def get_columns():
-    return [
+def get_columns(filters=None):
+    columns = [
         {
             "label": _("Month"),
             "fieldname": "month",
@@ -204,4 +275,15 @@ def get_columns():
               "fieldtype": "Datetime",
               "width": 150
         }
-    ]
\ No newline at end of file
+    ]
+
+    if filters and filters.get("all_accounts"):
+        columns.insert(0, {
+            "label": _("Account"),
+            "fieldname": "account",
+            "fieldtype": "Link",
+            "options": "Account",
+            "width": 200
+        })
+
+    return columns
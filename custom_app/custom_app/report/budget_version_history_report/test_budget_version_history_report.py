@@ -0,0 +1,81 @@
+# Copyright (c) 2026, . and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from custom_app.custom_app.report.budget_version_history_report.budget_version_history_report import (
+	ReallocationChainWalker,
+	get_history_rows,
+)
+
+
+def _reallocation(name, account, old_budget_link, new_budget_link, new_total):
+	return frappe._dict({
+		"name": name,
+		"account": account,
+		"month": "April",
+		"current_budget": 100,
+		"new_budget": 150,
+		"total_annual_budget": new_total - 50,
+		"new_total_annual_budget": new_total,
+		"reason": f"Top up {account}",
+		"old_budget_link": old_budget_link,
+		"new_budget_link": new_budget_link,
+		"approver": "Administrator",
+		"approval_date": None,
+	})
+
+
+class TestBudgetVersionHistoryReport(FrappeTestCase):
+	def setUp(self):
+		# Each reallocation amends the whole budget, so accounts share one
+		# chain: BUD-1 -(Rent)-> BUD-2 -(Travel)-> BUD-3 -(Rent)-> BUD-4.
+		# Newest first, as the report fetches them.
+		self.walker = ReallocationChainWalker({}, reallocations=[
+			_reallocation("BR-3", "Rent", "BUD-3", "BUD-4", 1200),
+			_reallocation("BR-2", "Travel", "BUD-2", "BUD-3", 900),
+			_reallocation("BR-1", "Rent", "BUD-1", "BUD-2", 1150),
+		])
+
+	def test_chain_is_per_account(self):
+		self.assertEqual([r.name for r in self.walker.walk("BUD-4")], ["BR-3", "BR-2", "BR-1"])
+		self.assertEqual([r.name for r in self.walker.walk("BUD-4", "Rent")], ["BR-3", "BR-1"])
+		self.assertEqual([r.name for r in self.walker.walk("BUD-4", "Travel")], ["BR-2"])
+		self.assertEqual(self.walker.walk("BUD-4", "Printing"), [])
+
+	def test_chain_crosses_other_account_reallocation(self):
+		# The Travel reallocation amended BUD-2 into BUD-3; Rent's earlier
+		# reallocation must still be found from the latest budget.
+		walker = ReallocationChainWalker({}, reallocations=[
+			_reallocation("BR-2", "Travel", "BUD-2", "BUD-3", 900),
+			_reallocation("BR-1", "Rent", "BUD-1", "BUD-2", 1150),
+		])
+		self.assertEqual([r.name for r in walker.walk("BUD-3", "Rent")], ["BR-1"])
+
+		rent = get_history_rows(walker, "BUD-3", "Rent", 1150)
+		self.assertEqual(len(rent), 2)
+		self.assertEqual(rent[0]["new_budget_link"], "BUD-2")
+		self.assertEqual(rent[-1]["new_budget_link"], "BUD-1")
+		self.assertEqual(rent[-1]["new_annual_budget"], 1100)
+
+	def test_history_rows_belong_to_their_account(self):
+		rent = get_history_rows(self.walker, "BUD-4", "Rent", 1200)
+		travel = get_history_rows(self.walker, "BUD-4", "Travel", 900)
+		printing = get_history_rows(self.walker, "BUD-4", "Printing", 500)
+
+		# Each account's reallocations plus the terminal row for its
+		# original budget, taken from the account's earliest reallocation
+		self.assertEqual(len(rent), 3)
+		self.assertEqual(len(travel), 2)
+		self.assertEqual([r["reason"] for r in rent[:2]], ["Top up Rent", "Top up Rent"])
+		self.assertEqual(travel[0]["reason"], "Top up Travel")
+		self.assertEqual(rent[-1]["new_budget_link"], "BUD-1")
+		self.assertEqual(rent[-1]["new_annual_budget"], 1100)
+		self.assertEqual(travel[-1]["new_budget_link"], "BUD-2")
+		self.assertEqual(travel[-1]["new_annual_budget"], 850)
+
+		# Never reallocated: a single row with the current amount
+		self.assertEqual(len(printing), 1)
+		self.assertEqual(printing[0]["new_budget_link"], "BUD-4")
+		self.assertEqual(printing[0]["new_annual_budget"], 500)
@@ -24,15 +24,55 @@ override_whitelisted_methods = {
 	    "custom_app.overrides.rfq.make_supplier_quotation_from_rfq",
 }
 
+after_migrate = [
+    "custom_app.api.notification_utils.prewarm_approver_directory"
+]
+
 doc_events = {
     "Communication": {
         "before_insert": "custom_app.api.email.set_company_email_account"
     },
+    "Email Account": {
+        "on_update": "custom_app.api.email.clear_company_email_account_cache",
+        "on_trash": "custom_app.api.email.clear_company_email_account_cache"
+    },
     "Employee Checkin": {
         "before_insert": "custom_app.api.employee_checkin.before_insert_checkin"
     },
+    "Employee": {
+        "on_update": [
+            "custom_app.api.employee_checkin.clear_mobile_checkin_policy_cache",
+            "custom_app.permissions.permission_scope.clear_permission_scope_for_employee",
+            "custom_app.api.notification_utils.clear_approver_directory"
+        ],
+        "on_trash": [
+            "custom_app.api.employee_checkin.clear_mobile_checkin_policy_cache",
+            "custom_app.permissions.permission_scope.clear_permission_scope_for_employee",
+            "custom_app.api.notification_utils.clear_approver_directory"
+        ]
+    },
     "User": {
-        "on_update": "custom_app.api.user_permission.manage_user_permissions"
+        "on_update": [
+            "custom_app.api.user_permission.manage_user_permissions",
+            "custom_app.permissions.permission_scope.clear_permission_scope_for_user",
+            "custom_app.api.notification_utils.clear_approver_directory"
+        ],
+        "on_trash": [
+            "custom_app.permissions.permission_scope.clear_permission_scope_for_user",
+            "custom_app.api.notification_utils.clear_approver_directory"
+        ]
+    },
+    "Holiday List": {
+        "on_update": "custom_app.utils.working_calendar.clear_working_calendar",
+        "on_trash": "custom_app.utils.working_calendar.clear_working_calendar"
+    },
+    "Cost Center": {
+        "on_update": "custom_app.api.notification_utils.clear_approver_directory",
+        "on_trash": "custom_app.api.notification_utils.clear_approver_directory"
+    },
+    "User Permission": {
+        "on_update": "custom_app.permissions.permission_scope.clear_permission_scope_for_user_permission",
+        "on_trash": "custom_app.permissions.permission_scope.clear_permission_scope_for_user_permission"
     },
     "Material Request": {
         "before_save": [
@@ -47,11 +87,15 @@ doc_events = {
             "custom_app.api.material_request"
             ".notify_employee_on_status_change"
         ),
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index",
     },
     "Supplier Quotation": {
         "before_insert": "custom_app.api.supplier_quotation.set_default_order_status",
         "before_save": "custom_app.api.supplier_quotation.update_item_cost_center",
         "validate": "custom_app.api.material_request.validate_quotation_against_material_request",
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index",
     },
     "Purchase Order": {
         "before_save": [
@@ -59,10 +103,18 @@ doc_events = {
             "custom_app.api.letter_head.set_letter_head"
         ],
         "on_submit": "custom_app.api.supplier_quotation.update_ordered_qty_on_po_submit",
-        "on_cancel": "custom_app.api.supplier_quotation.update_ordered_qty_on_po_cancel"
+        "on_cancel": "custom_app.api.supplier_quotation.update_ordered_qty_on_po_cancel",
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index"
     },
     "Purchase Receipt": {
         "before_save": "custom_app.api.letter_head.set_letter_head",
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index",
+    },
+    "Request for Quotation": {
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index"
     },
     "Expense Claim": {
         "before_save": "custom_app.api.expense_claim.update_item_cost_center",
@@ -77,13 +129,29 @@ doc_events = {
     "Payment Entry": {
         "validate": "custom_app.api.payment_entry.validate",
         "before_save": "custom_app.api.payment_entry.before_save",
-        "before_submit": "custom_app.api.payment_entry.before_submit"
+        "before_submit": "custom_app.api.payment_entry.before_submit",
+        "on_submit": "custom_app.api.supplier_spend.update_spend_on_payment_entry",
+        "on_cancel": "custom_app.api.supplier_spend.update_spend_on_payment_entry",
+        "on_update_after_submit": "custom_app.api.supplier_spend.update_spend_on_payment_entry"
+    },
+    "Journal Entry": {
+        "on_submit": "custom_app.api.supplier_spend.update_spend_on_journal_entry",
+        "on_cancel": "custom_app.api.supplier_spend.update_spend_on_journal_entry",
+        "on_update_after_submit": "custom_app.api.supplier_spend.update_spend_on_journal_entry"
     },
     "Supplier": {
         "before_insert": "custom_app.api.supplier.set_vendor_code"
     },
     "Purchase Invoice": {
-        "validate": "custom_app.api.purchase_invoice.validate_pi_items"
+        "validate": "custom_app.api.purchase_invoice.validate_pi_items",
+        "on_submit": "custom_app.api.supplier_spend.update_spend_on_purchase_invoice",
+        "on_cancel": "custom_app.api.supplier_spend.update_spend_on_purchase_invoice",
+        "on_change": "custom_app.api.procurement_search.update_search_index",
+        "on_trash": "custom_app.api.procurement_search.update_search_index"
+    },
+    "Workflow": {
+        "on_update": "custom_app.custom_app.page.purchase_timeline.purchase_timeline.clear_approval_statuses_cache",
+        "on_trash": "custom_app.custom_app.page.purchase_timeline.purchase_timeline.clear_approval_statuses_cache"
     }
 }
 
@@ -100,15 +168,20 @@ doctype_js = {
 }
 
 scheduler_events = {
+    "all": [
+        "custom_app.api.notification_utils.process_notification_outbox",
+        "custom_app.api.notification_utils.prewarm_approver_directory"
+    ],
     "daily": [
-        "custom_app.tasks.end_probation.allocate_earned_leaves_on_probation_end"
+        "custom_app.tasks.end_probation.allocate_earned_leaves_on_probation_end",
+        "custom_app.api.supplier_spend.rebuild_supplier_spend"
+    ],
+    "weekly": [
+        "custom_app.api.supplier_quotation.reconcile_ordered_qty"
     ],
     "cron": {
         "0 3 1 * *": [
-            "custom_app.tasks.probation_reminder.send_probation_end_alerts"
-        ],
-        "0 4 1 * *": [
-            "custom_app.tasks.employee_contract_expiry_alert.send_contract_expiry_alerts"
+            "custom_app.tasks.hr_alerts.send_hr_alerts"
         ]
     }
 }
@@ -147,8 +220,13 @@ fixtures = [
         ]
     }
 ]
+default_log_clearing_doctypes = {
+    "Notification Outbox": 30
+}
+
 app_include_js = [
-    "https://cdn.jsdelivr.net/npm/chart.js"
+    "https://cdn.jsdelivr.net/npm/chart.js",
+    "/assets/custom_app/js/filter_options.js"
 ]
 
 
@@ -343,13 +421,13 @@ app_include_js = [
 
 # Request Events
 # ----------------
-# before_request = ["custom_app.utils.before_request"]
-# after_request = ["custom_app.utils.after_request"]
+before_request = ["custom_app.utils.perf.before_request"]
+after_request = ["custom_app.utils.perf.after_request"]
 
 # Job Events
 # ----------
-# before_job = ["custom_app.utils.before_job"]
-# after_job = ["custom_app.utils.after_job"]
+before_job = ["custom_app.utils.perf.before_job"]
+after_job = ["custom_app.utils.perf.after_job"]
 
 # User Data Protection
 # --------------------
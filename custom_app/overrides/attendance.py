@@ -1,22 +1,11 @@
 import frappe
 from frappe.model.document import Document
-from custom_app.utils.saturday_utils import is_first_third_fifth_saturday
+from custom_app.utils.working_calendar import applies_saturday_rule
 
 class CustomAttendance(Document):
     def validate(self):
-        # Apply only on 1st / 3rd / 5th Saturdays
-        if is_first_third_fifth_saturday(self.attendance_date):
-
-            # Companies that should NOT be touched
-            allowed_companies = [
-                "Centre for Developmental Education",
-                "Vijaybhoomi University"
-            ]
-
-            # If company is allowed → do nothing (skip)
-            if self.company in allowed_companies:
-                return
-
-            # If company is NOT allowed → mark Absent
+        # Apply only on 1st / 3rd / 5th Saturdays, except for the companies
+        # listed in working_calendar.SATURDAY_RULE_EXEMPT_COMPANIES
+        if applies_saturday_rule(self.company, self.attendance_date):
             self.status = "Absent"
-            self.custom_weekly_off_marker = "Weekly Off (Auto)"
\ No newline at end of file
+            self.custom_weekly_off_marker = "Weekly Off (Auto)"
@@ -0,0 +1,21 @@
+import frappe
+
+# (doctype, columns) -- each permission-query condition column, paired with
+# `modified` so the default list-view sort is served from the same index.
+PERMISSION_QUERY_INDEXES = [
+    ("Material Request", ["custom_employee", "modified"]),
+    ("Material Request", ["custom_request_approver", "modified"]),
+    ("Material Request", ["custom_request_verifier", "modified"]),
+    ("Material Request", ["workflow_state", "modified"]),
+    ("Expense Claim", ["employee", "modified"]),
+    ("Expense Claim", ["expense_approver", "modified"]),
+    ("Expense Claim", ["workflow_state", "modified"]),
+]
+
+
+def execute():
+    for doctype, columns in PERMISSION_QUERY_INDEXES:
+        if not all(frappe.db.has_column(doctype, column) for column in columns):
+            continue
+
+        frappe.db.add_index(doctype, columns, index_name=f"{columns[0]}_modified_index")
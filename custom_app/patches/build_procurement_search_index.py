@@ -0,0 +1,5 @@
+from custom_app.api.procurement_search import rebuild_search_index
+
+
+def execute():
+    rebuild_search_index()
@@ -0,0 +1,5 @@
+from custom_app.api.supplier_spend import rebuild_supplier_spend
+
+
+def execute():
+    rebuild_supplier_spend()
@@ -0,0 +1,44 @@
+import frappe
+
+# The two alerts that used to be hard-coded scheduler tasks
+DEFAULT_RULES = [
+    {
+        "alert_name": "Probation End",
+        "date_field": "custom_probation_end_date",
+        "date_label": "Probation End Date",
+        "manager_subject": "Employee Probation Ending Alert",
+        "manager_intro": "The following employees under your supervision have probation periods ending soon:",
+        "summary_subject": "Employee Probation Ending Summary",
+        "summary_intro": "The following employees have probation periods ending this or next month:",
+    },
+    {
+        "alert_name": "Contract Expiry",
+        "date_field": "custom_contract_expiry_date",
+        "date_label": "Contract Expiry Date",
+        "manager_subject": "Employee Contract Expiry Alert",
+        "manager_intro": "The following employees under your supervision have contracts expiring soon:",
+        "summary_subject": "Employee Contract Expiry Summary",
+        "summary_intro": "The following employees have contracts expiring this or next month:",
+    },
+]
+DEFAULT_COMPANIES = "Vijaybhoomi University\nCentre for Developmental Education"
+
+
+def execute():
+    settings = frappe.get_single("HR Alert Settings")
+    existing = {row.alert_name for row in settings.alert_rules}
+
+    for rule in DEFAULT_RULES:
+        if rule["alert_name"] in existing:
+            continue
+
+        settings.append("alert_rules", {
+            **rule,
+            "enabled": 1,
+            "months_ahead": 1,
+            "companies": DEFAULT_COMPANIES,
+            "summary_designation": "Head-HR",
+        })
+
+    settings.flags.ignore_mandatory = True
+    settings.save(ignore_permissions=True)
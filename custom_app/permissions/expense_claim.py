@@ -1,51 +1,54 @@
 import frappe
+from custom_app.permissions.permission_scope import get_permission_scope
+
 
 def expense_claim_permission_query(user):
-    roles = frappe.get_roles(user)
+    scope = get_permission_scope(user)
+    roles = scope.roles
 
     # System Manager → everything
     if "System Manager" in roles or "Auditor" in roles:
         return ""
 
+    # Each condition is an equality / IN on a single indexed column
+    # (see patches/add_permission_query_indexes).
     conditions = []
 
+    # Workflow-state visibility of the finance roles, merged into one IN list
+    visible_states = []
+
     # Finance Approver-> approved, finance approved, cancelled(in workflow state)
     if "Finance Approver" in roles:
-        conditions.append(
-            "`tabExpense Claim`.`workflow_state` IN ('Approved', 'Finance Approved', 'Cancelled')"
-        )
+        visible_states.extend(["Approved", "Finance Approved", "Cancelled"])
 
     # AP User and AP Manager →  finance approved(in workflow state)
     if "AP User" in roles or "AP Manager" in roles:
+        visible_states.append("Finance Approved")
+
+    if visible_states:
         conditions.append(
-            "`tabExpense Claim`.`workflow_state` IN ('Finance Approved')"
+            "`tabExpense Claim`.`workflow_state` IN ({})".format(
+                ", ".join(frappe.db.escape(s) for s in dict.fromkeys(visible_states))
+            )
         )
 
     # Expense Approver → only assigned to him (User ID stored)
-    if "Expense Approver" in roles:
+    if scope.is_approver:
         conditions.append(
             "`tabExpense Claim`.`expense_approver` = {}".format(
                 frappe.db.escape(user)
             )
         )
 
-    # Employee → only own requests (Employee linked to User)
-    if "Employee" in roles:
-        employee = frappe.db.get_value(
-            "Employee",
-            {"user_id": user},
-            "name"
-        )
-
-        if employee:
-            conditions.append(
-                "`tabExpense Claim`.`employee` = {}".format(
-                    frappe.db.escape(employee)
-                )
+    # Employee → only own requests (Employee linked to User).
+    # A user with the Employee role but no Employee record gets nothing
+    # from this branch.
+    if "Employee" in roles and scope.employee:
+        conditions.append(
+            "`tabExpense Claim`.`employee` = {}".format(
+                frappe.db.escape(scope.employee)
             )
-        else:
-            # User has Employee role but no Employee record
-            conditions.append("1=0")
+        )
 
     # If no applicable role → no access
     if not conditions:
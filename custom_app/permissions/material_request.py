@@ -1,12 +1,18 @@
 import frappe
+from custom_app.permissions.permission_scope import get_permission_scope
+
 
 def material_request_permission_query(user):
-    roles = frappe.get_roles(user)
+    scope = get_permission_scope(user)
+    roles = scope.roles
 
     # System Manager → everything
     if "System Manager" in roles or "Auditor" in roles:
         return ""
 
+    # Each condition is an equality on a single indexed column
+    # (see patches/add_permission_query_indexes), so MariaDB can
+    # index-merge the OR instead of scanning the table.
     conditions = []
 
     # Procurement User → all Approved
@@ -16,7 +22,7 @@ def material_request_permission_query(user):
         )
 
     # Expense Approver → requests where he is the approver OR the verifier
-    if "Expense Approver" in roles:
+    if scope.is_approver:
         conditions.append(
             "`tabMaterial Request`.`custom_request_approver` = {}".format(
                 frappe.db.escape(user)
@@ -28,23 +34,15 @@ def material_request_permission_query(user):
             )
         )
 
-    # Employee → only own requests (Employee linked to User)
-    if "Employee" in roles:
-        employee = frappe.db.get_value(
-            "Employee",
-            {"user_id": user},
-            "name"
-        )
-
-        if employee:
-            conditions.append(
-                "`tabMaterial Request`.`custom_employee` = {}".format(
-                    frappe.db.escape(employee)
-                )
+    # Employee → only own requests (Employee linked to User).
+    # A user with the Employee role but no Employee record gets nothing
+    # from this branch.
+    if "Employee" in roles and scope.employee:
+        conditions.append(
+            "`tabMaterial Request`.`custom_employee` = {}".format(
+                frappe.db.escape(scope.employee)
             )
-        else:
-            # User has Employee role but no Employee record
-            conditions.append("1=0")
+        )
 
     # If no applicable role → no access
     if not conditions:
@@ -0,0 +1,95 @@
+import frappe
+
+from custom_app.api.filter_options import get_master_list
+
+# Redis hash: user -> materialized permission scope
+PERMISSION_SCOPE_CACHE_KEY = "custom_app:permission_scope"
+
+
+def get_permission_scope(user=None):
+    """
+    Return the cached permission scope of *user*:
+
+    * ``roles``        – the user's roles
+    * ``employee``     – Employee linked through ``user_id`` (or None)
+    * ``is_approver``  – holds Expense Approver, i.e. may appear as
+                         approver / verifier on requests
+    * ``companies``    – Companies the user is restricted to via
+                         User Permission (empty = unrestricted)
+
+    Built once per user and cleared on User, Employee and User Permission
+    changes, so list / report permission queries need no lookups.
+    """
+    user = user or frappe.session.user
+    scope = frappe.cache().hget(
+        PERMISSION_SCOPE_CACHE_KEY,
+        user,
+        generator=lambda: _build_permission_scope(user),
+    )
+    return frappe._dict(scope)
+
+
+def _build_permission_scope(user):
+    from frappe.core.doctype.user_permission.user_permission import get_user_permissions
+
+    roles = frappe.get_roles(user)
+    employee = frappe.db.get_value("Employee", {"user_id": user}, "name")
+    user_permissions = get_user_permissions(user)
+    companies = [
+        perm.get("doc")
+        for perm in user_permissions.get("Company", [])
+        if perm.get("doc")
+    ]
+
+    return {
+        "user": user,
+        "roles": roles,
+        "employee": employee,
+        "is_approver": "Expense Approver" in roles,
+        "companies": companies,
+    }
+
+
+def get_company_scope(user=None):
+    """
+    Return ``(companies, restricted)`` for *user*.
+
+    System Managers and users without Company User Permissions get every
+    company with ``restricted=False``; everyone else gets their permitted
+    companies (in name order, existing ones only) with ``restricted=True``.
+    Pages decide what an unrestricted non-manager may see.
+    """
+    scope = get_permission_scope(user)
+    all_companies = get_master_list("Company")
+    if "System Manager" in scope.roles or not scope.companies:
+        return all_companies, False
+
+    permitted = set(scope.companies)
+    return [c for c in all_companies if c in permitted], True
+
+
+def clear_permission_scope(user=None):
+    """Drop the cached scope of *user*, or of everyone when no user is given."""
+    if user:
+        frappe.cache().hdel(PERMISSION_SCOPE_CACHE_KEY, user)
+    else:
+        frappe.cache().delete_value(PERMISSION_SCOPE_CACHE_KEY)
+
+
+def clear_permission_scope_for_user(doc, method=None):
+    """doc_event: User on_update / on_trash."""
+    clear_permission_scope(doc.name)
+
+
+def clear_permission_scope_for_employee(doc, method=None):
+    """doc_event: Employee on_update / on_trash -- old and new linked user."""
+    before = doc.get_doc_before_save()
+    for user in {doc.get("user_id"), before.get("user_id") if before else None}:
+        if user:
+            clear_permission_scope(user)
+
+
+def clear_permission_scope_for_user_permission(doc, method=None):
+    """doc_event: User Permission on_update / on_trash."""
+    if doc.user:
+        clear_permission_scope(doc.user)
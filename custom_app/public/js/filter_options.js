@@ -0,0 +1,32 @@
+// Filter options for the dashboard / timeline pages, cached in localStorage.
+// The last payload's etag is sent back; the server replies { unchanged: true }
+// when nothing changed, so repeat page loads skip the option lists.
+frappe.provide("custom_app.filter_options");
+
+custom_app.filter_options.call = function ({ method, args, callback }) {
+	const key = `custom_app:filter_options:${frappe.session.user}:${method}`;
+	let cached = null;
+	try {
+		cached = JSON.parse(localStorage.getItem(key));
+	} catch (e) {
+		cached = null;
+	}
+
+	return frappe.call({
+		method,
+		args: Object.assign({}, args, { etag: cached ? cached.etag : null }),
+		callback: (r) => {
+			let options = r.message;
+			if (options && options.unchanged && cached) {
+				options = cached.options;
+			} else if (options && options.etag) {
+				try {
+					localStorage.setItem(key, JSON.stringify({ etag: options.etag, options }));
+				} catch (e) {
+					// storage full or disabled -- just skip caching
+				}
+			}
+			callback && callback({ message: options });
+		},
+	});
+};
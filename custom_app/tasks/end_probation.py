@@ -1,61 +1,159 @@
 import frappe
-from frappe.utils import nowdate, getdate
+from frappe.utils import nowdate, getdate, add_days
 from datetime import date
 
+LEAVE_TYPE_NAME = "Earned Leave CDE/VU"
+EARNED_PER_YEAR = 18
+ELIGIBLE_COMPANIES = ["Vijaybhoomi University", "Centre for Developmental Education"]
+RUN_LOG_DOCTYPE = "Probation Leave Run Log"
+
+# Window used when there is no successful run to catch up from
+DEFAULT_CATCH_UP_DAYS = 31
+ALLOCATION_CHUNK_SIZE = 50
+
+
 def allocate_earned_leaves_on_probation_end():
-    today = getdate(nowdate())
+    """
+    Daily job: allocate pro-rata earned leave to every employee whose
+    probation ended since the last successful run (catch-up mode), so a
+    missed scheduler day no longer skips anyone.
+
+    Allocations are submitted chunk by chunk, each in its own savepoint, and
+    recorded in a Probation Leave Run Log. An employee whose allocation
+    fails is rolled back alone and listed on the log; the run is then
+    logged as Partial and the window still advances, so one bad record
+    cannot block everyone after it. Only an error outside the
+    per-employee loop fails (and retries) the whole window.
+    """
+    to_date = getdate(nowdate())
+    from_date = get_catch_up_start(to_date)
+
+    try:
+        employees, created, failed = allocate_for_window(from_date, to_date)
+    except Exception:
+        frappe.db.rollback()
+        _log_run(from_date, to_date, "Failed", error=frappe.get_traceback())
+        frappe.db.commit()
+        raise
+
+    _log_run(
+        from_date,
+        to_date,
+        "Partial" if failed else "Success",
+        employees_found=len(employees),
+        allocations_created=created,
+        failed=failed,
+    )
+    frappe.db.commit()
+
+
+def get_catch_up_start(to_date: date) -> date:
+    last_to_date = frappe.db.get_value(
+        RUN_LOG_DOCTYPE,
+        {"status": ["in", ["Success", "Partial"]]},
+        "to_date",
+        order_by="to_date desc",
+    )
+    if last_to_date:
+        return min(getdate(add_days(last_to_date, 1)), to_date)
+
+    return getdate(add_days(to_date, -DEFAULT_CATCH_UP_DAYS))
+
 
-    # Find employees whose probation ends today
+def allocate_for_window(from_date: date, to_date: date):
+    """
+    Submit allocations for employees whose probation ended between
+    *from_date* and *to_date*. Returns ``(employees, allocations_created,
+    failed)``, where *failed* lists ``(employee, error)`` pairs.
+    """
+    # Find employees whose probation ended in the window
     employees = frappe.get_all(
         "Employee",
         filters={
-            "custom_probation_end_date": today,
-            "company": ["in", ["Vijaybhoomi University", "Centre for Developmental Education"]]
+            "custom_probation_end_date": ["between", [from_date, to_date]],
+            "company": ["in", ELIGIBLE_COMPANIES]
         },
         fields=["name", "employee_name", "custom_probation_end_date", "company"]
     )
 
     if not employees:
-        return
+        return employees, 0, []
 
+    if not frappe.db.exists("Leave Type", LEAVE_TYPE_NAME):
+        frappe.throw(f"Leave Type '{LEAVE_TYPE_NAME}' not found. Please create it first.")
+
+    # Prefetch existing allocations in one query
+    existing = {
+        (a.employee, getdate(a.from_date), getdate(a.to_date))
+        for a in frappe.get_all(
+            "Leave Allocation",
+            filters={
+                "employee": ["in", [emp.name for emp in employees]],
+                "leave_type": LEAVE_TYPE_NAME,
+                "docstatus": 1,
+            },
+            fields=["employee", "from_date", "to_date"],
+        )
+    }
+
+    pending = []
     for emp in employees:
         probation_end = getdate(emp.custom_probation_end_date)
 
         # Determine financial year start & end
         fy_start, fy_end = get_financial_year_for_probation(probation_end)
 
+        if (emp.name, probation_end, fy_end) in existing:
+            continue
+
         # Calculate pro rata leaves
         total_days = (fy_end - probation_end).days + 1
-        earned_per_year = 18
-        prorata_leaves = round((total_days / 365) * earned_per_year, 2)
-        leave_type_name = "Earned Leave CDE/VU"
-        if not frappe.db.exists("Leave Type", leave_type_name):
-            frappe.throw(f"Leave Type '{leave_type_name}' not found. Please create it first.")
-        
-        # Check if Leave Allocation already exists
-        allocation_name = frappe.db.get_value(
-            "Leave Allocation",
-            {
-                "employee": emp.name,
-                "from_date": probation_end,
-                "to_date": fy_end,
-                "leave_type": leave_type_name,
-                "docstatus": 1
-            },
-            "name"
+        prorata_leaves = round((total_days / 365) * EARNED_PER_YEAR, 2)
+        pending.append((emp.name, probation_end, fy_end, prorata_leaves))
+
+    created = 0
+    failed = []
+    for start in range(0, len(pending), ALLOCATION_CHUNK_SIZE):
+        chunk = pending[start:start + ALLOCATION_CHUNK_SIZE]
+        for idx, (employee, probation_end, fy_end, prorata_leaves) in enumerate(chunk, start):
+            # Each allocation in its own savepoint so one bad employee does not
+            # roll back the run.
+            savepoint = f"probation_leave_{idx}"
+            frappe.db.savepoint(savepoint)
+            try:
+                allocation_doc = frappe.new_doc("Leave Allocation")
+                allocation_doc.employee = employee
+                allocation_doc.from_date = probation_end
+                allocation_doc.to_date = fy_end
+                allocation_doc.leave_type = LEAVE_TYPE_NAME
+                allocation_doc.new_leaves_allocated = prorata_leaves
+                allocation_doc.submit()
+                created += 1
+            except Exception as e:
+                frappe.db.rollback(save_point=savepoint)
+                failed.append((employee, str(e)))
+
+        frappe.logger().info(
+            f"[probation leave] Processed {min(start + ALLOCATION_CHUNK_SIZE, len(pending))}"
+            f"/{len(pending)} allocation(s), {len(failed)} failed"
         )
 
-        if not allocation_name:
-            # Create a new allocation
-            allocation_doc = frappe.new_doc("Leave Allocation")
-            allocation_doc.employee = emp.name
-            allocation_doc.from_date = probation_end
-            allocation_doc.to_date = fy_end
-            allocation_doc.leave_type = leave_type_name  # Change if needed
-            allocation_doc.new_leaves_allocated = prorata_leaves
-            allocation_doc.submit()
+    return employees, created, failed
 
-        frappe.db.commit()
+
+def _log_run(from_date, to_date, status, employees_found=0, allocations_created=0, failed=None, error=None):
+    failed = failed or []
+    frappe.get_doc({
+        "doctype": RUN_LOG_DOCTYPE,
+        "from_date": from_date,
+        "to_date": to_date,
+        "status": status,
+        "employees_found": employees_found,
+        "allocations_created": allocations_created,
+        "allocations_failed": len(failed),
+        "failed_employees": "\n".join(f"{employee}: {message}" for employee, message in failed),
+        "error": error,
+    }).insert(ignore_permissions=True)
 
 
 def get_financial_year_for_probation(probation_end: date):
@@ -0,0 +1,175 @@
+import frappe
+from frappe.utils import get_first_day, get_last_day, add_months, today, formatdate
+
+SETTINGS_DOCTYPE = "HR Alert Settings"
+DIGEST_TEMPLATE = "custom_app/templates/emails/hr_alert_digest.html"
+MAIL_CHUNK_SIZE = 50
+
+
+def send_hr_alerts(alert_names=None):
+    """
+    Monthly job: run every enabled rule in HR Alert Settings (or only
+    *alert_names*) and send
+
+    1. one digest per reporting manager listing their employees, and
+    2. one consolidated digest per summary recipient (e.g. Head-HR).
+
+    Manager contacts, summary recipients and company sender accounts are
+    prefetched once for all rules; the rendered mails are handed to
+    background jobs in chunks.
+    """
+    settings = frappe.get_cached_doc(SETTINGS_DOCTYPE)
+    rules = [
+        r for r in settings.alert_rules
+        if r.enabled and (not alert_names or r.alert_name in alert_names)
+    ]
+    if not rules:
+        return
+
+    employees_by_rule = {rule.name: _get_alert_employees(rule) for rule in rules}
+    if not any(employees_by_rule.values()):
+        return
+
+    manager_ids = {
+        e.reports_to for employees in employees_by_rule.values() for e in employees if e.reports_to
+    }
+    managers = _get_contacts({"name": ["in", list(manager_ids)]}) if manager_ids else {}
+
+    designations = {r.summary_designation for r in rules if r.summary_designation}
+    summary_recipients = (
+        list(_get_contacts({"designation": ["in", list(designations)], "status": "Active"}).values())
+        if designations else []
+    )
+
+    senders = _get_sender_map()
+
+    mails = []
+    for rule in rules:
+        employees = employees_by_rule[rule.name]
+        if employees:
+            mails.extend(_build_rule_mails(rule, employees, managers, summary_recipients, senders))
+
+    for start in range(0, len(mails), MAIL_CHUNK_SIZE):
+        frappe.enqueue(
+            "custom_app.tasks.hr_alerts.send_alert_mail_chunk",
+            queue="short",
+            mails=mails[start:start + MAIL_CHUNK_SIZE],
+        )
+
+    frappe.logger().info(f"[hr alerts] Queued {len(mails)} digest(s) for {len(rules)} rule(s)")
+
+
+def send_alert_mail_chunk(mails):
+    """Background job: send one chunk of rendered digests."""
+    for mail in mails:
+        try:
+            frappe.sendmail(**mail)
+        except Exception:
+            frappe.log_error(
+                frappe.get_traceback(),
+                f"[hr alerts] Failed sending '{mail.get('subject')}' to {mail.get('recipients')}",
+            )
+
+
+def _get_alert_employees(rule):
+    # Date range: this month + the configured months ahead
+    start_date = get_first_day(today())
+    end_date = get_last_day(add_months(today(), rule.months_ahead or 0))
+
+    filters = {
+        rule.date_field: ["between", [start_date, end_date]],
+        "status": "Active",
+    }
+    companies = [c.strip() for c in (rule.companies or "").splitlines() if c.strip()]
+    if companies:
+        filters["company"] = ["in", companies]
+
+    employees = frappe.get_all(
+        "Employee",
+        filters=filters,
+        fields=["name", "employee_name", "reports_to", "company", f"{rule.date_field} as alert_date"],
+        order_by=f"{rule.date_field} asc",
+    )
+    for emp in employees:
+        emp.formatted_date = formatdate(emp.alert_date)
+    return employees
+
+
+def _get_contacts(filters):
+    return {
+        e.name: e
+        for e in frappe.get_all(
+            "Employee",
+            filters=filters,
+            fields=["name", "employee_name", "prefered_email", "company_email", "company", "designation"],
+        )
+    }
+
+
+def _get_sender_map():
+    """company -> outgoing email id, from one Email Account query."""
+    senders = {}
+    for account in frappe.get_all(
+        "Email Account",
+        filters={"enable_outgoing": 1, "custom_company": ["is", "set"]},
+        fields=["custom_company", "email_id"],
+        order_by="creation asc",
+    ):
+        senders.setdefault(account.custom_company, account.email_id)
+    return senders
+
+
+def _build_rule_mails(rule, employees, managers, summary_recipients, senders):
+    mails = []
+
+    # Group employees by reporting manager
+    manager_dict = {}
+    for emp in employees:
+        if emp.reports_to:
+            manager_dict.setdefault(emp.reports_to, []).append(emp)
+
+    # 1️⃣ One digest per manager
+    for manager_id, emp_list in manager_dict.items():
+        manager = managers.get(manager_id)
+        manager_email = manager and (manager.prefered_email or manager.company_email)
+        if not manager_email:
+            continue
+
+        mails.append({
+            "recipients": [manager_email],
+            # Sender based on the employees' company
+            "sender": senders.get(emp_list[0].company),
+            "subject": rule.manager_subject or f"Employee {rule.alert_name} Alert",
+            "message": _render_digest(rule, manager.employee_name or "Manager", rule.manager_intro, emp_list),
+        })
+
+    # 2️⃣ Consolidated digest per summary recipient
+    for hr in summary_recipients:
+        if hr.designation != rule.summary_designation:
+            continue
+
+        hr_email = hr.prefered_email or hr.company_email
+        if not hr_email:
+            continue
+
+        mails.append({
+            "recipients": [hr_email],
+            # Sender based on the recipient's company
+            "sender": senders.get(hr.company),
+            "subject": rule.summary_subject or f"Employee {rule.alert_name} Summary",
+            "message": _render_digest(rule, hr.employee_name, rule.summary_intro, employees),
+        })
+
+    return mails
+
+
+def _render_digest(rule, recipient_name, intro, employees):
+    return frappe.render_template(
+        DIGEST_TEMPLATE,
+        {
+            "recipient_name": recipient_name,
+            "intro": intro or f"The following employees have an upcoming {rule.date_label}:",
+            "date_label": rule.date_label,
+            "employees": employees,
+        },
+    )
@@ -0,0 +1,256 @@
+import functools
+import json
+import time
+import tracemalloc
+
+import frappe
+
+# Redis list of the most recent samples (newest first), read by the
+# "Custom App Performance" page.
+PERF_SAMPLES_KEY = "custom_app:perf_samples"
+PERF_BUFFER_SIZE = 1000
+MAX_QUERIES_PER_SAMPLE = 30
+MAX_QUERY_LENGTH = 500
+
+REPORT_RUN_METHOD = "frappe.desk.query_report.run"
+# The performance page's own calls are not recorded
+PERF_PAGE_MODULE = "custom_app.custom_app.page.custom_app_performance."
+
+
+# ─────────────────────────────────────────────────────────────────
+# RECORDER
+#
+# Wraps `frappe.db.sql` for the duration of one call to count statements
+# and their time. Only the outermost recorder is active, so instrumented
+# helpers called from an instrumented endpoint do not double count.
+# Query text is stored without its values.
+#
+# site_config:
+#   custom_app_perf_disabled      -- turn instrumentation off
+#   custom_app_perf_trace_memory  -- also record peak Python memory
+#                                    (tracemalloc; noticeably slower)
+# ─────────────────────────────────────────────────────────────────
+
+class PerfRecorder:
+    def __init__(self, method, trace_memory=None):
+        self.method = method
+        self.trace_memory = frappe.conf.get("custom_app_perf_trace_memory") if trace_memory is None else trace_memory
+        self.queries = []
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.active = False
+
+    def start(self):
+        if getattr(frappe.local, "custom_app_perf_recorder", None) or not getattr(frappe.local, "db", None):
+            return self
+
+        self.active = True
+        frappe.local.custom_app_perf_recorder = self
+
+        db = frappe.db
+        self._previous_sql = db.__dict__.get("sql")
+        original_sql = db.sql
+
+        def recording_sql(query, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original_sql(query, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                self.sql_count += 1
+                self.sql_time += elapsed
+                self.queries.append((str(query)[:MAX_QUERY_LENGTH], elapsed))
+
+        db.sql = recording_sql
+
+        self._started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        self.started = time.perf_counter()
+        return self
+
+    def stop(self, result=None, error=False):
+        """Stop recording and return the sample (None if this recorder was inactive)."""
+        if not self.active:
+            return None
+
+        wall_time = time.perf_counter() - self.started
+        self.active = False
+        frappe.local.custom_app_perf_recorder = None
+
+        if self._previous_sql is None:
+            frappe.db.__dict__.pop("sql", None)
+        else:
+            frappe.db.sql = self._previous_sql
+
+        peak_kb = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak_kb = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        slowest = sorted(self.queries, key=lambda q: q[1], reverse=True)[:MAX_QUERIES_PER_SAMPLE]
+        return {
+            "method": self.method,
+            "timestamp": frappe.utils.now(),
+            "user": frappe.session.user if getattr(frappe.local, "session", None) else None,
+            "wall_ms": round(wall_time * 1000, 2),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_time * 1000, 2),
+            "rows": count_rows(result),
+            "peak_kb": peak_kb,
+            "error": bool(error),
+            "queries": [{"query": q, "ms": round(t * 1000, 2)} for q, t in slowest],
+        }
+
+
+def count_rows(result):
+    """Best-effort row count of an endpoint / report result."""
+    if isinstance(result, (list, tuple)):
+        # Report execute(): (columns, data, ...)
+        if len(result) >= 2 and isinstance(result[0], list) and isinstance(result[1], list):
+            return len(result[1])
+        return len(result)
+    if isinstance(result, dict):
+        for key in ("result", "data", "rows"):
+            if isinstance(result.get(key), list):
+                return len(result[key])
+    return None
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def store_sample(sample):
+    if not sample:
+        return
+    try:
+        cache = frappe.cache()
+        cache.lpush(PERF_SAMPLES_KEY, json.dumps(sample, default=str))
+        cache.ltrim(PERF_SAMPLES_KEY, 0, PERF_BUFFER_SIZE - 1)
+    except Exception:
+        # Instrumentation must never break the call it measures
+        frappe.logger().warning("[perf] could not store sample", exc_info=True)
+
+
+def get_samples():
+    return [json.loads(s) for s in frappe.cache().lrange(PERF_SAMPLES_KEY, 0, -1) or []]
+
+
+def clear_samples():
+    frappe.cache().delete_value(PERF_SAMPLES_KEY)
+
+
+def instrumented(method=None):
+    """Decorator for non-request entry points (background jobs, scripts)."""
+
+    def decorator(fn):
+        label = method or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if frappe.conf.get("custom_app_perf_disabled"):
+                return fn(*args, **kwargs)
+
+            recorder = PerfRecorder(label).start()
+            result, error = None, False
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            except Exception:
+                error = True
+                raise
+            finally:
+                store_sample(recorder.stop(result, error))
+
+        return wrapper
+
+    return decorator
+
+
+# ─────────────────────────────────────────────────────────────────
+# REQUEST HOOKS: every custom_app whitelisted method and every
+# Custom App query report run is recorded without decorating them.
+# ─────────────────────────────────────────────────────────────────
+
+def _request_label():
+    cmd = (getattr(frappe.local, "form_dict", None) or {}).get("cmd") or ""
+    if not cmd:
+        # /api/method/<cmd> -- form_dict.cmd is only filled in later
+        path = getattr(getattr(frappe.local, "request", None), "path", "") or ""
+        for prefix in ("/api/method/", "/api/v1/method/", "/api/v2/method/"):
+            if path.startswith(prefix):
+                cmd = path[len(prefix):]
+                break
+    if cmd.startswith("custom_app.") and not cmd.startswith(PERF_PAGE_MODULE):
+        return cmd
+
+    if cmd == REPORT_RUN_METHOD:
+        report_name = frappe.form_dict.get("report_name")
+        if report_name and frappe.get_cached_value("Report", report_name, "module") == "Custom App":
+            return f"report:{report_name}"
+
+    return None
+
+
+def before_request():
+    if frappe.conf.get("custom_app_perf_disabled"):
+        return
+
+    label = _request_label()
+    if label:
+        PerfRecorder(label).start()
+
+
+def after_request(response=None, request=None):
+    recorder = getattr(frappe.local, "custom_app_perf_recorder", None)
+    if not recorder:
+        return
+
+    status = getattr(response, "status_code", 200) or 200
+    result = frappe.local.response.get("message") if getattr(frappe.local, "response", None) else None
+    store_sample(recorder.stop(result, error=status >= 400))
+
+
+# ─────────────────────────────────────────────────────────────────
+# JOB HOOKS: prepared (background) runs of Custom App reports.
+# custom_app's own jobs are measured by @instrumented.
+# ─────────────────────────────────────────────────────────────────
+
+PREPARED_REPORT_JOB = "generate_report"
+
+
+def _job_label(method, kwargs):
+    # Prepared reports are enqueued as a callable, so only its __name__ is passed
+    prepared_report = (kwargs or {}).get("prepared_report")
+    if not prepared_report or (method or "").rsplit(".", 1)[-1] != PREPARED_REPORT_JOB:
+        return None
+
+    report_name = frappe.db.get_value("Prepared Report", prepared_report, "report_name")
+    if report_name and frappe.get_cached_value("Report", report_name, "module") == "Custom App":
+        return f"report:{report_name} (prepared)"
+    return None
+
+
+def before_job(method=None, kwargs=None, transaction_type=None):
+    if frappe.conf.get("custom_app_perf_disabled"):
+        return
+
+    label = _job_label(method, kwargs)
+    if label:
+        PerfRecorder(label).start()
+
+
+def after_job(method=None, kwargs=None, result=None):
+    recorder = getattr(frappe.local, "custom_app_perf_recorder", None)
+    if recorder:
+        store_sample(recorder.stop(result))
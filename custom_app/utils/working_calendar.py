@@ -0,0 +1,102 @@
+import frappe
+from frappe.utils import getdate
+
+# Companies that keep 1st / 3rd / 5th Saturdays as regular working days.
+SATURDAY_RULE_EXEMPT_COMPANIES = (
+    "Centre for Developmental Education",
+    "Vijaybhoomi University",
+)
+
+# Redis hash: holiday list -> {year: (week_off_mask, public_holiday_mask)}
+WORKING_CALENDAR_CACHE_KEY = "custom_app:working_calendar"
+
+WEEK_OFF = "WO"
+PUBLIC_HOLIDAY = "PH"
+
+
+# ─────────────────────────────────────────────────────────────────
+# ALTERNATE SATURDAYS
+# ─────────────────────────────────────────────────────────────────
+
+def is_first_third_fifth_saturday(date):
+    """True when *date* is the 1st, 3rd or 5th Saturday of its month."""
+    date = getdate(date)
+    # Days 1-7 hold the 1st Saturday, 15-21 the 3rd and 29-31 the 5th.
+    return date.weekday() == 5 and (date.day - 1) // 7 in (0, 2, 4)
+
+
+def applies_saturday_rule(company, date):
+    """True when *company* treats *date* as an auto weekly off Saturday."""
+    return company not in SATURDAY_RULE_EXEMPT_COMPANIES and is_first_third_fifth_saturday(date)
+
+
+# ─────────────────────────────────────────────────────────────────
+# HOLIDAY LIST BITMAPS
+#
+# Every holiday list is compiled once into two bitmasks per year (bit n
+# = day-of-year n + 1): week offs and public holidays. Week offs are the
+# Saturday / Sunday entries, matching the WO / PH codes used in the
+# attendance export. Cached in Redis and dropped when the list changes.
+# ─────────────────────────────────────────────────────────────────
+
+def get_holiday_list_calendar(holiday_list):
+    """Return ``{year: (week_off_mask, public_holiday_mask)}`` for *holiday_list*."""
+    if not holiday_list:
+        return {}
+    return frappe.cache().hget(
+        WORKING_CALENDAR_CACHE_KEY,
+        holiday_list,
+        generator=lambda: _compile_holiday_list(holiday_list),
+    )
+
+
+def _compile_holiday_list(holiday_list):
+    holidays = frappe.get_all(
+        "Holiday",
+        filters={"parent": holiday_list, "parenttype": "Holiday List"},
+        fields=["holiday_date", "description"],
+    )
+
+    calendar = {}
+    for h in holidays:
+        day = getdate(h.holiday_date)
+        week_off, public_holiday = calendar.get(day.year, (0, 0))
+        bit = 1 << (day.timetuple().tm_yday - 1)
+        desc = (h.description or "").lower()
+        if "saturday" in desc or "sunday" in desc:
+            week_off |= bit
+        else:
+            public_holiday |= bit
+        calendar[day.year] = (week_off, public_holiday)
+    return calendar
+
+
+def get_day_type(holiday_list, date, calendar=None):
+    """
+    ``"WO"`` (week off), ``"PH"`` (public holiday) or None for *date* in
+    *holiday_list*. Pass a preloaded *calendar* to skip the cache lookup in
+    tight loops.
+    """
+    if calendar is None:
+        calendar = get_holiday_list_calendar(holiday_list)
+
+    date = getdate(date)
+    masks = calendar.get(date.year)
+    if not masks:
+        return None
+
+    bit = 1 << (date.timetuple().tm_yday - 1)
+    if masks[0] & bit:
+        return WEEK_OFF
+    if masks[1] & bit:
+        return PUBLIC_HOLIDAY
+    return None
+
+
+def get_company_holiday_list(company):
+    return frappe.get_cached_value("Company", company, "default_holiday_list") if company else None
+
+
+def clear_working_calendar(doc, method=None):
+    """doc_event: Holiday List on_update / on_trash."""
+    frappe.cache().hdel(WORKING_CALENDAR_CACHE_KEY, doc.name)